@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Board, BoardGroup
+from .models import Board, BoardGroup, TicketsJob
 
 
 @admin.register(Board)
@@ -17,3 +17,21 @@ class BoardGroupAdmin(admin.ModelAdmin):
     list_display = (
         'name',
     )
+
+
+@admin.register(TicketsJob)
+class TicketsJobAdmin(admin.ModelAdmin):
+    list_display = (
+        'board',
+        'action',
+        'status',
+        'total',
+        'done',
+        'failed',
+        'created',
+        'finished',
+    )
+    list_filter = (
+        'action',
+        'status',
+    )
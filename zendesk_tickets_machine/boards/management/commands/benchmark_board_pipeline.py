@@ -0,0 +1,223 @@
+import json
+import math
+import time
+from collections import deque
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import override_settings
+
+from boards.services import TicketsJobServices
+from requesters.models import Requester
+from requesters.services import organization_cache, requester_cache
+from tickets.models import Ticket
+from tickets.services import ZendeskTicketServices
+from zendesk.benchmark import (
+    create_benchmark_board,
+    create_unlimited_rate_limiter,
+)
+from zendesk.fake import FakeZendeskServer
+
+
+# (metric, higher is better, noisy). Timings vary between runs, so only
+# they get the tolerance; query and API call counts must not go up.
+METRICS = (
+    ('tickets_per_second', True, True),
+    ('p95', False, True),
+    ('queries_per_ticket', False, False),
+    ('api_calls_per_ticket', False, False),
+)
+
+
+class QueryCounter(object):
+    # Counts the queries on the default connection. Unlike
+    # CaptureQueriesContext it is not capped at the 9000 queries Django
+    # keeps in connection.queries.
+    def __enter__(self):
+        self.force_debug_cursor = connection.force_debug_cursor
+        self.queries_log = connection.queries_log
+        connection.force_debug_cursor = True
+        connection.queries_log = deque()
+        return self
+
+    def __exit__(self, *args):
+        self.count = len(connection.queries_log)
+        connection.force_debug_cursor = self.force_debug_cursor
+        connection.queries_log = self.queries_log
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    if not values:
+        return 0
+
+    return values[max(math.ceil(len(values) * percent / 100) - 1, 0)]
+
+
+class Command(BaseCommand):
+    help = 'Measure the board ticket creation pipeline, from queuing the ' \
+        'job to the last private comment, against a local fake Zendesk'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default='10,100,1000,10000',
+            help='Comma separated number of tickets of each board'
+        )
+        parser.add_argument(
+            '--requesters',
+            type=float,
+            default=1,
+            help='Distinct requesters per ticket, lower means more reuse'
+        )
+        parser.add_argument(
+            '--latency',
+            type=float,
+            default=0.05,
+            help='Seconds the fake server waits before each response'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=None,
+            help='Zendesk requests in flight'
+        )
+        parser.add_argument(
+            '--baseline',
+            default=None,
+            help='JSON file of earlier results to check for regressions'
+        )
+        parser.add_argument(
+            '--save-baseline',
+            default=None,
+            help='JSON file to write these results to'
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=0.2,
+            help='Allowed slowdown against the baseline, 0.2 is 20%%'
+        )
+
+    def handle(self, *args, **options):
+        sizes = [int(each) for each in options['sizes'].split(',')]
+
+        results = {}
+        server = FakeZendeskServer(latency=options['latency']).start()
+        try:
+            with override_settings(ZENDESK_API_URL=server.url):
+                for size in sizes:
+                    result = self.measure(server, size, options)
+                    results[str(size)] = result
+                    self.stdout.write(self.format_result(result))
+        finally:
+            server.stop()
+
+        if options['save_baseline']:
+            with open(options['save_baseline'], 'w') as f:
+                json.dump(results, f, indent=2, sort_keys=True)
+
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                baseline = json.load(f)
+
+            regressions = self.compare(results, baseline, options['tolerance'])
+            for each in regressions:
+                self.stdout.write(f'Regression: {each}')
+            if regressions:
+                raise CommandError(
+                    f'{len(regressions)} regressions against the baseline'
+                )
+
+    def measure(self, server, size, options):
+        requesters = max(1, round(size * options['requesters']))
+        with transaction.atomic():
+            board = create_benchmark_board(
+                f'Benchmark Pipeline {size}',
+                size,
+                requesters
+            )
+            Requester.objects.filter(
+                email__in=Ticket.objects.filter(
+                    board=board
+                ).values('requester')
+            ).delete()
+            requester_cache.clear()
+            organization_cache.clear()
+            server.reset()
+
+            jobServices = TicketsJobServices(
+                ZendeskTicketServices(
+                    concurrency=options['concurrency'],
+                    rate_limiter=create_unlimited_rate_limiter()
+                )
+            )
+
+            # A ticket's latency is the time from queuing the job until its
+            # batch has been created and commented on.
+            latencies = []
+
+            def progress(total, done, failed, errors):
+                finished = done + failed
+                latencies.extend(
+                    [time.perf_counter() - started] *
+                    (finished - len(latencies))
+                )
+
+            started = time.perf_counter()
+            with QueryCounter() as queries:
+                job = jobServices.enqueue(board)
+                jobServices.run(job, progress=progress)
+            elapsed = time.perf_counter() - started
+
+            created = Ticket.objects.filter(
+                board=board,
+                zendesk_ticket_id__isnull=False
+            ).count()
+            transaction.set_rollback(True)
+
+        return {
+            'tickets': size,
+            'created': created,
+            'seconds': elapsed,
+            'tickets_per_second': created / elapsed,
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95),
+            'queries_per_ticket': queries.count / size,
+            'api_calls_per_ticket': server.requests / size,
+        }
+
+    def format_result(self, result):
+        return f'{result["tickets"]} tickets: ' \
+            f'{result["created"]} created in {result["seconds"]:.3f}s, ' \
+            f'{result["tickets_per_second"]:.1f} tickets/s, ' \
+            f'p50 {result["p50"]:.3f}s, p95 {result["p95"]:.3f}s, ' \
+            f'{result["queries_per_ticket"]:.2f} queries/ticket, ' \
+            f'{result["api_calls_per_ticket"]:.2f} API calls/ticket'
+
+    def compare(self, results, baseline, tolerance):
+        regressions = []
+        for size, result in results.items():
+            if size not in baseline:
+                continue
+
+            for metric, higher_is_better, noisy in METRICS:
+                allowed = baseline[size][metric]
+                if noisy:
+                    if higher_is_better:
+                        allowed *= 1 - tolerance
+                    else:
+                        allowed *= 1 + tolerance
+
+                if higher_is_better:
+                    regressed = result[metric] < allowed
+                else:
+                    regressed = result[metric] > allowed + 1e-9
+
+                if regressed:
+                    regressions.append(
+                        f'{size} tickets {metric} {result[metric]:.3f}, '
+                        f'baseline {baseline[size][metric]:.3f}'
+                    )
+
+        return regressions
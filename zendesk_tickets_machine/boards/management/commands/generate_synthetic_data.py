@@ -0,0 +1,258 @@
+import csv
+import io
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.template.defaultfilters import slugify
+from django.utils import timezone
+
+from agents.models import Agent
+from agent_groups.models import AgentGroup
+from boards.models import Board, BoardGroup
+from requesters.models import Requester
+from tickets.models import Ticket
+
+
+TICKET_FIELDS = (
+    'subject',
+    'comment',
+    'organization',
+    'requester',
+    'assignee',
+    'group',
+    'ticket_type',
+    'priority',
+    'tags',
+    'private_comment',
+    'zendesk_ticket_id',
+    'board',
+    'is_active',
+)
+REQUESTER_FIELDS = ('email', 'zendesk_user_id', 'organization_id', 'updated')
+COPY_NULL = '\\N'
+LONG_COMMENT_PARAGRAPH = 'Please check the attached logs and let us know ' \
+    'whether the issue still happens after the latest release. '
+
+
+class Command(BaseCommand):
+    help = 'Fill the database with synthetic board groups, boards, ' \
+        'tickets, agents, agent groups and requesters for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--board-groups', type=int, default=100)
+        parser.add_argument('--boards', type=int, default=2000)
+        parser.add_argument('--tickets', type=int, default=200000)
+        parser.add_argument('--agents', type=int, default=300)
+        parser.add_argument('--agent-groups', type=int, default=300)
+        parser.add_argument('--requesters', type=int, default=100000)
+        parser.add_argument(
+            '--active',
+            type=float,
+            default=0.9,
+            help='Share of tickets that are active'
+        )
+        parser.add_argument(
+            '--created',
+            type=float,
+            default=0.5,
+            help='Share of tickets already created on Zendesk'
+        )
+        parser.add_argument(
+            '--long-comments',
+            type=float,
+            default=0.1,
+            help='Share of tickets with a comment of a few thousand chars'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Rows per INSERT or COPY'
+        )
+
+    def handle(self, *args, **options):
+        if options['tickets'] and not (
+            options['boards'] and options['agent_groups']
+        ):
+            raise CommandError(
+                'Tickets need at least one board and one agent group'
+            )
+
+        self.random = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.prefix = f'Synthetic {options["seed"]}'
+        if Board.objects.filter(
+            slug__startswith=slugify(self.prefix) + '-'
+        ).exists():
+            raise CommandError(
+                f'Data for seed {options["seed"]} already exists, '
+                'use another seed'
+            )
+
+        with transaction.atomic():
+            board_groups = self.create(
+                BoardGroup,
+                (
+                    BoardGroup(name=f'{self.prefix} Board Group {number}')
+                    for number in range(options['board_groups'])
+                ),
+                options['board_groups']
+            )
+            boards = self.create(
+                Board,
+                (
+                    self.build_board(number, board_groups)
+                    for number in range(options['boards'])
+                ),
+                options['boards']
+            )
+            agents = self.create(
+                Agent,
+                (
+                    Agent(
+                        name=f'{self.prefix} Agent {number}',
+                        zendesk_user_id=str(10 ** 9 + number)
+                    )
+                    for number in range(options['agents'])
+                ),
+                options['agents']
+            )
+            agent_groups = self.create(
+                AgentGroup,
+                (
+                    AgentGroup(
+                        name=f'{self.prefix} Agent Group {number}',
+                        zendesk_group_id=str(10 ** 9 + number)
+                    )
+                    for number in range(options['agent_groups'])
+                ),
+                options['agent_groups']
+            )
+            now = timezone.now()
+            self.copy(
+                Requester,
+                REQUESTER_FIELDS,
+                (
+                    (
+                        self.get_requester_email(number),
+                        str(2 * 10 ** 9 + number),
+                        str(number % 1000 + 1),
+                        now,
+                    )
+                    for number in range(options['requesters'])
+                ),
+                options['requesters']
+            )
+            self.copy(
+                Ticket,
+                TICKET_FIELDS,
+                (
+                    self.build_ticket(
+                        number,
+                        boards,
+                        agents,
+                        agent_groups,
+                        options
+                    )
+                    for number in range(options['tickets'])
+                ),
+                options['tickets']
+            )
+
+    def create(self, model, objects, total):
+        # Postgres returns the ids of bulk inserted rows, so the created
+        # objects can be used as foreign keys right away.
+        started = time.perf_counter()
+        created = model.objects.bulk_create(
+            list(objects),
+            batch_size=self.batch_size
+        )
+        self.report(model, total, started)
+        return created
+
+    def copy(self, model, fields, rows, total):
+        # The large tables are loaded with COPY, which is several times
+        # faster than bulk_create, in batches so hundreds of thousands of
+        # rows are never all in memory.
+        started = time.perf_counter()
+        columns = ', '.join(
+            model._meta.get_field(each).column for each in fields
+        )
+        sql = f'COPY {model._meta.db_table} ({columns}) ' \
+            f"FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')"
+
+        with connection.cursor() as cursor:
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) == self.batch_size:
+                    self.copy_batch(cursor, sql, batch)
+                    batch = []
+            if batch:
+                self.copy_batch(cursor, sql, batch)
+
+        self.report(model, total, started)
+
+    def copy_batch(self, cursor, sql, batch):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(
+            [COPY_NULL if value is None else value for value in row]
+            for row in batch
+        )
+        buffer.seek(0)
+        cursor.copy_expert(sql, buffer)
+
+    def report(self, model, total, started):
+        self.stdout.write(
+            f'{total} {model._meta.verbose_name_plural} in '
+            f'{time.perf_counter() - started:.3f}s'
+        )
+
+    def build_board(self, number, board_groups):
+        # bulk_create skips Board.save(), which sets the slug.
+        name = f'{self.prefix} Board {number}'
+        return Board(
+            name=name,
+            slug=slugify(name),
+            board_group_id=self.choice(board_groups)
+        )
+
+    def build_ticket(self, number, boards, agents, agent_groups, options):
+        rng = self.random
+        requesters = max(options['requesters'], 1)
+
+        comment = f'Comment {number}'
+        if rng.random() < options['long_comments']:
+            comment = LONG_COMMENT_PARAGRAPH * rng.randint(20, 60)
+
+        zendesk_ticket_id = None
+        if rng.random() < options['created']:
+            zendesk_ticket_id = str(3 * 10 ** 9 + number)
+
+        # In the order of TICKET_FIELDS.
+        return (
+            f'{self.prefix} Ticket {number}',
+            comment,
+            rng.choice([None, f'Organization {number % 50}']),
+            self.get_requester_email(rng.randrange(requesters)),
+            self.choice(agents),
+            self.choice(agent_groups),
+            rng.choice(
+                [None] + [each for each, _ in Ticket.TICKET_TYPE_CHOICES]
+            ),
+            rng.choice([each for each, _ in Ticket.PRIORITY_TYPE_CHOICES]),
+            rng.choice([None, 'synthetic', 'synthetic vip']),
+            rng.choice([None, f'Private comment {number}']),
+            zendesk_ticket_id,
+            self.choice(boards),
+            rng.random() < options['active'],
+        )
+
+    def choice(self, objects):
+        return self.random.choice(objects).id if objects else None
+
+    def get_requester_email(self, number):
+        return f'requester{number}@synthetic.example.com'
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from boards.models import Board
+from tickets.services import TicketServices
+
+
+class Command(BaseCommand):
+    help = 'Reset the Zendesk ticket ids, or the requesters, of a board ' \
+        'in chunks, reporting the progress'
+
+    def add_arguments(self, parser):
+        parser.add_argument('slug')
+        parser.add_argument(
+            '--requesters',
+            action='store_true',
+            help='Reset the requesters and organizations instead'
+        )
+
+    def handle(self, *args, **options):
+        slug = options['slug']
+        if not Board.objects.filter(slug=slug).exists():
+            raise CommandError(f'Board {slug} does not exist')
+
+        def progress(total, done):
+            self.stdout.write(f'{done}/{total} tickets reset')
+
+        ticketServices = TicketServices()
+        if options['requesters']:
+            ticketServices.reset_requesters(slug, progress=progress)
+        else:
+            ticketServices.reset_zendesk_ticket_ids(slug, progress=progress)
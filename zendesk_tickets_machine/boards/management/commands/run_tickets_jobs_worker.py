@@ -0,0 +1,47 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+
+from boards.services import TicketsJobServices
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Run queued jobs creating or updating the Zendesk tickets of ' \
+        'boards'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once there are no pending jobs left'
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=2,
+            help='Seconds to wait before checking for new jobs again'
+        )
+
+    def handle(self, *args, **options):
+        jobServices = TicketsJobServices()
+
+        while True:
+            job = jobServices.claim()
+            if job is None:
+                if options['once']:
+                    return
+
+                time.sleep(options['sleep'])
+                continue
+
+            self.stdout.write(
+                f'{job.get_action_display()} tickets for {job.board}'
+            )
+            try:
+                jobServices.run(job)
+            except Exception:
+                logger.exception('Job %s failed', job.id)
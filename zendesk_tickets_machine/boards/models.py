@@ -1,5 +1,11 @@
+import datetime
+import json
+
+from django.conf import settings
 from django.db import models
+from django.db.models import Q
 from django.template.defaultfilters import slugify
+from django.utils import timezone
 
 
 class BoardGroup(models.Model):
@@ -26,3 +32,90 @@ class Board(models.Model):
     def save(self, *args, **kwargs):
         self.slug = slugify(self.name)
         super(Board, self).save(*args, **kwargs)
+
+
+class TicketsJob(models.Model):
+    CREATE = 'create'
+    UPDATE = 'update'
+
+    ACTION_CHOICES = (
+        (CREATE, 'Create'),
+        (UPDATE, 'Update'),
+    )
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    STATUS_CHOICES = (
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    )
+
+    board = models.ForeignKey(Board)
+    action = models.CharField(
+        max_length=20,
+        choices=ACTION_CHOICES,
+        default=CREATE
+    )
+    ticket_ids = models.TextField(blank=True, default='')
+    # Tickets left out when the whole board is selected.
+    excluded_ids = models.TextField(blank=True, default='')
+    # JSON of the Zendesk ticket fields an update job sets.
+    changes = models.TextField(blank=True, default='')
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=PENDING
+    )
+    total = models.IntegerField(default=0)
+    done = models.IntegerField(default=0)
+    failed = models.IntegerField(default=0)
+    errors = models.TextField(blank=True, default='')
+    created = models.DateTimeField(auto_now_add=True)
+    started = models.DateTimeField(null=True, blank=True)
+    # Moved forward by the worker while the job runs, a running job whose
+    # heartbeat stopped lost its worker.
+    heartbeat = models.DateTimeField(null=True, blank=True)
+    attempts = models.IntegerField(default=0)
+    finished = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f'{self.board} ({self.status})'
+
+    @classmethod
+    def get_stale_before(cls):
+        return timezone.now() - datetime.timedelta(
+            seconds=settings.TICKETS_JOB_STALE_AFTER
+        )
+
+    @classmethod
+    def get_stale_filter(cls, stale_before=None):
+        stale_before = stale_before or cls.get_stale_before()
+        return Q(status=cls.RUNNING) & ~Q(heartbeat__gte=stale_before)
+
+    @property
+    def is_stale(self):
+        return self.status == self.RUNNING and (
+            self.heartbeat is None or
+            self.heartbeat < self.get_stale_before()
+        )
+
+    @property
+    def remaining(self):
+        return max(self.total - self.done - self.failed, 0)
+
+    def get_ticket_ids(self):
+        return [each for each in self.ticket_ids.split(',') if each]
+
+    def get_excluded_ids(self):
+        return [each for each in self.excluded_ids.split(',') if each]
+
+    def get_changes(self):
+        return json.loads(self.changes) if self.changes else {}
+
+    def get_errors(self):
+        return [each for each in self.errors.split('\n') if each]
@@ -0,0 +1,182 @@
+import json
+import threading
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Board, TicketsJob
+from tickets.services import ZendeskTicketServices
+
+
+class TicketsJobServices():
+    def __init__(self, zendeskTicketServices=None):
+        self.zendeskTicketServices = zendeskTicketServices
+
+    def enqueue(self, board, ticket_ids=None, excluded_ids=None):
+        with transaction.atomic():
+            ticket_ids = ','.join(ticket_ids or [])
+            excluded_ids = ','.join(excluded_ids or [])
+            # A running job that lost its worker is not reused, it may
+            # never finish.
+            job = TicketsJob.objects.select_for_update().filter(
+                board=board,
+                action=TicketsJob.CREATE,
+                ticket_ids=ticket_ids,
+                excluded_ids=excluded_ids,
+                status__in=[
+                    TicketsJob.PENDING,
+                    TicketsJob.RUNNING,
+                ]
+            ).exclude(TicketsJob.get_stale_filter()).first()
+            if job:
+                return job
+
+            return TicketsJob.objects.create(
+                board=board,
+                ticket_ids=ticket_ids,
+                excluded_ids=excluded_ids
+            )
+
+    def enqueue_update(self, board, ticket_ids, changes):
+        # Edits are queued one job each, so a later edit is never merged
+        # into an earlier one still waiting.
+        return TicketsJob.objects.create(
+            board=board,
+            action=TicketsJob.UPDATE,
+            ticket_ids=','.join(str(each) for each in ticket_ids),
+            changes=json.dumps(changes)
+        )
+
+    def claim(self):
+        # Jobs of a worker that died, restarted or was killed mid-run are
+        # taken back like pending ones. Creating again is safe since the
+        # tickets already on Zendesk are found by their external_id.
+        stale_before = TicketsJob.get_stale_before()
+        self.fail_stale_jobs(stale_before)
+
+        with transaction.atomic():
+            skipped = []
+            while True:
+                job = TicketsJob.objects.select_for_update(
+                    skip_locked=True
+                ).filter(
+                    Q(status=TicketsJob.PENDING) |
+                    TicketsJob.get_stale_filter(stale_before)
+                ).exclude(id__in=skipped).order_by('id').first()
+                if job is None:
+                    return None
+
+                if not self.is_board_busy(job, stale_before):
+                    break
+                skipped.append(job.id)
+
+            job.status = TicketsJob.RUNNING
+            job.started = timezone.now()
+            job.heartbeat = job.started
+            job.attempts += 1
+            job.save()
+
+            return job
+
+    def is_board_busy(self, job, stale_before):
+        # Create jobs of a board run one at a time, even when their tickets
+        # overlap only in part, or both would create the same pending
+        # tickets on Zendesk. Locking the board makes a worker claiming a
+        # job of the same board wait for this claim, then see it running.
+        if job.action != TicketsJob.CREATE:
+            return False
+
+        Board.objects.select_for_update().filter(id=job.board_id).first()
+        return TicketsJob.objects.filter(
+            board_id=job.board_id,
+            action=TicketsJob.CREATE,
+            status=TicketsJob.RUNNING,
+            heartbeat__gte=stale_before
+        ).exclude(id=job.id).exists()
+
+    def fail_stale_jobs(self, stale_before):
+        # A job that lost its worker every time it ran is not run again,
+        # it may be what kills the worker.
+        with transaction.atomic():
+            jobs = TicketsJob.objects.select_for_update(
+                skip_locked=True
+            ).filter(
+                TicketsJob.get_stale_filter(stale_before),
+                attempts__gte=settings.TICKETS_JOB_MAX_ATTEMPTS
+            )
+            for job in jobs:
+                TicketsJob.objects.filter(id=job.id).update(
+                    status=TicketsJob.FAILED,
+                    errors='\n'.join(
+                        job.get_errors() +
+                        ['Error: The worker stopped responding']
+                    ),
+                    finished=timezone.now()
+                )
+
+    def run(self, job, progress=None):
+        def save_progress(total, done, failed, errors):
+            TicketsJob.objects.filter(id=job.id).update(
+                total=total,
+                done=done,
+                failed=failed,
+                errors='\n'.join(errors),
+                heartbeat=timezone.now()
+            )
+            if progress:
+                progress(total, done, failed, errors)
+
+        # Progress is saved only when a batch is done, which takes long
+        # when the rate limit is low, so the heartbeat has its own thread.
+        stopped = threading.Event()
+        heartbeat = threading.Thread(
+            target=self.beat,
+            args=(job, stopped),
+            daemon=True
+        )
+        heartbeat.start()
+        try:
+            zendeskTicketServices = self.zendeskTicketServices or \
+                ZendeskTicketServices()
+            if job.action == TicketsJob.UPDATE:
+                zendeskTicketServices.update_tickets(
+                    job.get_ticket_ids(),
+                    job.get_changes(),
+                    progress=save_progress
+                )
+            else:
+                zendeskTicketServices.create_tickets(
+                    job.board.slug,
+                    job.get_ticket_ids(),
+                    progress=save_progress,
+                    excluded_ids=job.get_excluded_ids()
+                )
+        except Exception as e:
+            job.refresh_from_db()
+            TicketsJob.objects.filter(id=job.id).update(
+                status=TicketsJob.FAILED,
+                errors='\n'.join(job.get_errors() + [f'Error: {e}']),
+                finished=timezone.now()
+            )
+            raise
+        finally:
+            stopped.set()
+            heartbeat.join()
+
+        TicketsJob.objects.filter(id=job.id).update(
+            status=TicketsJob.DONE,
+            finished=timezone.now()
+        )
+
+    def beat(self, job, stopped):
+        try:
+            while not stopped.wait(settings.TICKETS_JOB_HEARTBEAT_INTERVAL):
+                TicketsJob.objects.filter(
+                    id=job.id,
+                    status=TicketsJob.RUNNING
+                ).update(heartbeat=timezone.now())
+        finally:
+            # The thread has its own database connection.
+            connection.close()
@@ -1,7 +1,7 @@
 from django.contrib.auth.models import User
 from django.test import TestCase
 
-from ..models import Board, BoardGroup
+from ..models import Board, BoardGroup, TicketsJob
 
 
 class BoardAdminTest(TestCase):
@@ -41,3 +41,28 @@ class BoardGroupAdminTest(TestCase):
 
         expected = '<div class="text"><a href="?o=1">Name</a></div>'
         self.assertContains(response, expected, count=1, status_code=200)
+
+
+class TicketsJobAdminTest(TestCase):
+    def setUp(self):
+        User.objects.create_superuser('admin', 'admin@pronto.com', 'admin')
+        self.client.login(username='admin', password='admin')
+
+        self.url = '/admin/boards/ticketsjob/'
+
+    def test_access_tickets_create_job_admin_should_have_columns(self):
+        board = Board.objects.create(name='Pre-Production')
+        TicketsJob.objects.create(board=board)
+        response = self.client.get(self.url)
+
+        expected = '<div class="text"><a href="?o=1">Board</a></div>'
+        self.assertContains(response, expected, count=1, status_code=200)
+
+        expected = '<div class="text"><a href="?o=2">Action</a></div>'
+        self.assertContains(response, expected, count=1, status_code=200)
+
+        expected = '<div class="text"><a href="?o=3">Status</a></div>'
+        self.assertContains(response, expected, count=1, status_code=200)
+
+        expected = '<div class="text"><a href="?o=4">Total</a></div>'
+        self.assertContains(response, expected, count=1, status_code=200)
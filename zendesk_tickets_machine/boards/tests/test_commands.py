@@ -0,0 +1,203 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from agents.models import Agent
+from agent_groups.models import AgentGroup
+from requesters.models import Requester
+from tickets.models import Ticket
+from ..models import Board, BoardGroup
+
+
+class BenchmarkBoardPipelineCommandTest(TestCase):
+    def setUp(self):
+        handle, self.baseline = tempfile.mkstemp(suffix='.json')
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.baseline)
+
+    def test_benchmark_should_report_each_board_size(self):
+        out = StringIO()
+
+        call_command(
+            'benchmark_board_pipeline',
+            sizes='2,5',
+            latency=0,
+            stdout=out
+        )
+
+        output = out.getvalue()
+        self.assertIn('2 tickets: 2 created', output)
+        self.assertIn('5 tickets: 5 created', output)
+        self.assertIn('2.00 API calls/ticket', output)
+        self.assertIn('queries/ticket', output)
+        self.assertEqual(Ticket.objects.count(), 0)
+
+    def test_benchmark_should_save_baseline(self):
+        call_command(
+            'benchmark_board_pipeline',
+            sizes='5',
+            latency=0,
+            save_baseline=self.baseline,
+            stdout=StringIO()
+        )
+
+        with open(self.baseline) as f:
+            baseline = json.load(f)
+        self.assertEqual(baseline['5']['created'], 5)
+        self.assertEqual(baseline['5']['api_calls_per_ticket'], 2)
+
+    def test_benchmark_should_fail_on_regression_against_baseline(self):
+        with open(self.baseline, 'w') as f:
+            json.dump({
+                '5': {
+                    'tickets_per_second': 10 ** 6,
+                    'p95': 10 ** 6,
+                    'queries_per_ticket': 10 ** 6,
+                    'api_calls_per_ticket': 1,
+                },
+            }, f)
+        out = StringIO()
+
+        with self.assertRaises(CommandError):
+            call_command(
+                'benchmark_board_pipeline',
+                sizes='5',
+                latency=0,
+                baseline=self.baseline,
+                stdout=out
+            )
+
+        output = out.getvalue()
+        self.assertIn('Regression: 5 tickets tickets_per_second', output)
+        self.assertIn('Regression: 5 tickets api_calls_per_ticket', output)
+        self.assertNotIn('Regression: 5 tickets p95', output)
+
+
+class GenerateSyntheticDataCommandTest(TestCase):
+    def generate(self, **options):
+        values = {
+            'seed': 1,
+            'board_groups': 2,
+            'boards': 3,
+            'tickets': 50,
+            'agents': 2,
+            'agent_groups': 2,
+            'requesters': 10,
+            'batch_size': 20,
+            'stdout': StringIO(),
+        }
+        values.update(options)
+        call_command('generate_synthetic_data', **values)
+
+    def test_command_should_create_requested_rows(self):
+        self.generate()
+
+        self.assertEqual(BoardGroup.objects.count(), 2)
+        self.assertEqual(Board.objects.count(), 3)
+        self.assertEqual(Agent.objects.count(), 2)
+        self.assertEqual(AgentGroup.objects.count(), 2)
+        self.assertEqual(Requester.objects.count(), 10)
+        self.assertEqual(Ticket.objects.count(), 50)
+        self.assertEqual(
+            sorted(Board.objects.values_list('slug', flat=True)),
+            ['synthetic-1-board-0', 'synthetic-1-board-1',
+             'synthetic-1-board-2']
+        )
+
+    def test_command_should_apply_shares_of_tickets(self):
+        self.generate(active=0, created=1, long_comments=1)
+
+        self.assertFalse(Ticket.objects.filter(is_active=True).exists())
+        self.assertFalse(
+            Ticket.objects.filter(zendesk_ticket_id__isnull=True).exists()
+        )
+        self.assertTrue(
+            all(
+                len(each) > 1000
+                for each in Ticket.objects.values_list('comment', flat=True)
+            )
+        )
+
+    def test_command_should_store_missing_values_as_null(self):
+        self.generate(created=0)
+
+        self.assertEqual(
+            Ticket.objects.filter(zendesk_ticket_id__isnull=True).count(),
+            50
+        )
+        self.assertFalse(Ticket.objects.filter(zendesk_ticket_id='').exists())
+
+    def test_command_should_generate_same_tickets_for_same_seed(self):
+        fields = ('subject', 'requester', 'priority', 'board__name')
+
+        self.generate()
+        first = list(Ticket.objects.order_by('id').values_list(*fields))
+        Ticket.objects.all().delete()
+        Board.objects.all().delete()
+        self.generate()
+        second = list(Ticket.objects.order_by('id').values_list(*fields))
+
+        self.assertEqual(first, second)
+
+    def test_command_should_refuse_to_generate_same_seed_twice(self):
+        self.generate()
+
+        with self.assertRaises(CommandError):
+            self.generate()
+
+
+class ResetBoardCommandTest(TestCase):
+    def setUp(self):
+        self.board = Board.objects.create(name='Pre-Production')
+        agent_group = AgentGroup.objects.create(name='Development')
+        for number in range(3):
+            Ticket.objects.create(
+                subject=f'Ticket {number}',
+                comment='Comment',
+                requester='client@hisotech.com',
+                organization='Hiso Tech',
+                group=agent_group,
+                zendesk_ticket_id=str(number) if number else None,
+                board=self.board
+            )
+
+    def test_command_should_reset_tickets_and_report_progress(self):
+        out = StringIO()
+
+        call_command('reset_board', self.board.slug, stdout=out)
+
+        self.assertFalse(
+            Ticket.objects.filter(zendesk_ticket_id__isnull=False).exists()
+        )
+        self.assertEqual(
+            out.getvalue(),
+            '0/2 tickets reset\n2/2 tickets reset\n'
+        )
+
+    def test_command_should_reset_requesters(self):
+        call_command(
+            'reset_board',
+            self.board.slug,
+            requesters=True,
+            stdout=StringIO()
+        )
+
+        self.assertEqual(
+            set(Ticket.objects.values_list('requester', 'organization')),
+            {('', '')}
+        )
+        self.assertEqual(
+            Ticket.objects.filter(zendesk_ticket_id__isnull=False).count(),
+            2
+        )
+
+    def test_command_should_refuse_unknown_board(self):
+        with self.assertRaises(CommandError):
+            call_command('reset_board', 'unknown', stdout=StringIO())
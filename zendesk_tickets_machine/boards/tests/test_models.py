@@ -1,6 +1,6 @@
 from django.test import TestCase
 
-from ..models import Board, BoardGroup
+from ..models import Board, BoardGroup, TicketsJob
 
 
 class BoardTest(TestCase):
@@ -54,3 +54,60 @@ class BoardGroupTest(TestCase):
             name='CP Production'
         )
         self.assertEquals(board_group.__str__(), 'CP Production')
+
+
+class TicketsJobTest(TestCase):
+    def test_save_tickets_create_job(self):
+        board = Board.objects.create(name='Pre-Production')
+
+        job = TicketsJob()
+        job.board = board
+        job.ticket_ids = '1,3'
+        job.save()
+
+        job = TicketsJob.objects.last()
+
+        self.assertEqual(job.board.name, 'Pre-Production')
+        self.assertEqual(job.status, 'pending')
+        self.assertEqual(job.total, 0)
+        self.assertEqual(job.done, 0)
+        self.assertEqual(job.failed, 0)
+        self.assertEqual(job.errors, '')
+        self.assertTrue(job.created)
+        self.assertIsNone(job.started)
+        self.assertIsNone(job.finished)
+
+    def test_tickets_create_job_should_represent_board_and_status(self):
+        board = Board.objects.create(name='Pre-Production')
+        job = TicketsJob.objects.create(board=board)
+
+        self.assertEqual(job.__str__(), 'Pre-Production (pending)')
+
+    def test_remaining_should_count_tickets_not_done_or_failed(self):
+        board = Board.objects.create(name='Pre-Production')
+        job = TicketsJob.objects.create(
+            board=board,
+            total=10,
+            done=6,
+            failed=1
+        )
+
+        self.assertEqual(job.remaining, 3)
+
+    def test_get_ticket_ids_should_return_list_of_ticket_ids(self):
+        board = Board.objects.create(name='Pre-Production')
+
+        job = TicketsJob.objects.create(board=board, ticket_ids='1,3')
+        self.assertEqual(job.get_ticket_ids(), ['1', '3'])
+
+        job = TicketsJob.objects.create(board=board)
+        self.assertEqual(job.get_ticket_ids(), [])
+
+    def test_get_errors_should_return_list_of_errors(self):
+        board = Board.objects.create(name='Pre-Production')
+        job = TicketsJob.objects.create(
+            board=board,
+            errors='First error\nSecond error'
+        )
+
+        self.assertEqual(job.get_errors(), ['First error', 'Second error'])
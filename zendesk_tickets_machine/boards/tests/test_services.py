@@ -0,0 +1,385 @@
+import datetime
+import time
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from ..models import Board, TicketsJob
+from ..services import TicketsJobServices
+
+
+class TicketsJobServicesTest(TestCase):
+    def setUp(self):
+        self.board = Board.objects.create(name='Pre-Production')
+
+    def test_enqueue_should_create_pending_job(self):
+        job = TicketsJobServices().enqueue(self.board, ['1', '2'])
+
+        self.assertEqual(job.board, self.board)
+        self.assertEqual(job.status, TicketsJob.PENDING)
+        self.assertEqual(job.get_ticket_ids(), ['1', '2'])
+
+    def test_enqueue_should_reuse_unfinished_job_with_same_tickets(self):
+        job = TicketsJobServices().enqueue(self.board)
+        TicketsJob.objects.filter(id=job.id).update(
+            status=TicketsJob.RUNNING,
+            heartbeat=timezone.now()
+        )
+
+        self.assertEqual(TicketsJobServices().enqueue(self.board), job)
+        self.assertEqual(TicketsJob.objects.count(), 1)
+
+    def test_enqueue_should_create_new_job_when_previous_one_is_done(self):
+        job = TicketsJobServices().enqueue(self.board)
+        TicketsJob.objects.filter(id=job.id).update(
+            status=TicketsJob.DONE
+        )
+
+        another_job = TicketsJobServices().enqueue(self.board)
+
+        self.assertNotEqual(another_job, job)
+        self.assertEqual(TicketsJob.objects.count(), 2)
+
+    def test_enqueue_should_keep_selections_less_excluded_apart(self):
+        job = TicketsJobServices().enqueue(self.board)
+
+        excluding = TicketsJobServices().enqueue(
+            self.board,
+            excluded_ids=['2']
+        )
+
+        self.assertNotEqual(excluding, job)
+        self.assertEqual(excluding.get_excluded_ids(), ['2'])
+        self.assertEqual(
+            TicketsJobServices().enqueue(
+                self.board,
+                excluded_ids=['2']
+            ),
+            excluding
+        )
+
+    def test_enqueue_should_not_reuse_unfinished_update_job(self):
+        update = TicketsJobServices().enqueue_update(
+            self.board,
+            [1],
+            {'subject': 'New Subject'}
+        )
+
+        job = TicketsJobServices().enqueue(self.board, ['1'])
+
+        self.assertNotEqual(job, update)
+        self.assertEqual(job.action, TicketsJob.CREATE)
+
+    def test_enqueue_update_should_create_pending_update_job(self):
+        first = TicketsJobServices().enqueue_update(
+            self.board,
+            [1, 2],
+            {'subject': 'New Subject'}
+        )
+        second = TicketsJobServices().enqueue_update(
+            self.board,
+            [1, 2],
+            {'subject': 'Another Subject'}
+        )
+
+        self.assertNotEqual(first, second)
+        self.assertEqual(first.action, TicketsJob.UPDATE)
+        self.assertEqual(first.status, TicketsJob.PENDING)
+        self.assertEqual(first.get_ticket_ids(), ['1', '2'])
+        self.assertEqual(first.get_changes(), {'subject': 'New Subject'})
+
+    def test_claim_should_mark_oldest_pending_job_as_running(self):
+        first = TicketsJob.objects.create(board=self.board)
+        TicketsJob.objects.create(board=self.board, ticket_ids='1')
+
+        job = TicketsJobServices().claim()
+
+        self.assertEqual(job, first)
+        self.assertEqual(job.status, TicketsJob.RUNNING)
+        self.assertIsNotNone(job.started)
+
+    def test_claim_should_return_none_when_no_pending_job(self):
+        TicketsJob.objects.create(
+            board=self.board,
+            status=TicketsJob.RUNNING,
+            heartbeat=timezone.now()
+        )
+
+        self.assertIsNone(TicketsJobServices().claim())
+
+    def test_claim_should_skip_create_job_of_board_already_creating(self):
+        TicketsJobServices().enqueue(self.board)
+        TicketsJobServices().claim()
+        selection = TicketsJobServices().enqueue(self.board, ['1'])
+        update = TicketsJobServices().enqueue_update(
+            self.board,
+            [1],
+            {'subject': 'New Subject'}
+        )
+        board = Board.objects.create(name='Production')
+        other = TicketsJobServices().enqueue(board)
+
+        self.assertEqual(TicketsJobServices().claim(), update)
+        self.assertEqual(TicketsJobServices().claim(), other)
+        self.assertIsNone(TicketsJobServices().claim())
+        selection.refresh_from_db()
+        self.assertEqual(selection.status, TicketsJob.PENDING)
+
+    def test_claim_should_run_create_job_once_board_is_done(self):
+        job = TicketsJobServices().enqueue(self.board)
+        TicketsJobServices().claim()
+        selection = TicketsJobServices().enqueue(self.board, ['1'])
+        TicketsJob.objects.filter(id=job.id).update(
+            status=TicketsJob.DONE
+        )
+
+        self.assertEqual(TicketsJobServices().claim(), selection)
+
+    def stop_heartbeat(self, job, hours=1):
+        TicketsJob.objects.filter(id=job.id).update(
+            heartbeat=timezone.now() - datetime.timedelta(hours=hours)
+        )
+
+    def test_claim_should_take_back_job_of_crashed_worker(self):
+        job = TicketsJobServices().enqueue(self.board)
+        claimed = TicketsJobServices().claim()
+        # The worker dies before finishing, its heartbeat stops.
+        self.stop_heartbeat(claimed)
+
+        taken_back = TicketsJobServices().claim()
+
+        self.assertEqual(taken_back, job)
+        self.assertEqual(taken_back.status, TicketsJob.RUNNING)
+        self.assertEqual(taken_back.attempts, 2)
+        self.assertFalse(taken_back.is_stale)
+
+    def test_claim_should_not_take_back_job_with_recent_heartbeat(self):
+        TicketsJobServices().enqueue(self.board)
+        TicketsJobServices().claim()
+
+        self.assertIsNone(TicketsJobServices().claim())
+
+    @override_settings(TICKETS_JOB_MAX_ATTEMPTS=2)
+    def test_claim_should_fail_stale_job_out_of_attempts(self):
+        job = TicketsJob.objects.create(
+            board=self.board,
+            status=TicketsJob.RUNNING,
+            attempts=2,
+            errors='Error'
+        )
+        self.stop_heartbeat(job)
+
+        self.assertIsNone(TicketsJobServices().claim())
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, TicketsJob.FAILED)
+        self.assertEqual(
+            job.get_errors(),
+            ['Error', 'Error: The worker stopped responding']
+        )
+        self.assertIsNotNone(job.finished)
+
+    def test_enqueue_should_not_reuse_job_of_crashed_worker(self):
+        job = TicketsJobServices().enqueue(self.board)
+        TicketsJobServices().claim()
+        self.stop_heartbeat(job)
+
+        another_job = TicketsJobServices().enqueue(self.board)
+
+        self.assertNotEqual(another_job, job)
+        self.assertEqual(another_job.status, TicketsJob.PENDING)
+
+    def test_run_should_move_heartbeat_on_progress(self):
+        def create_tickets(board_slug, ticket_ids, progress, excluded_ids):
+            progress(1, 1, 0, [])
+
+        zendeskTicketServices = MagicMock()
+        zendeskTicketServices.create_tickets.side_effect = create_tickets
+        job = TicketsJobServices().enqueue(self.board)
+        job = TicketsJobServices().claim()
+        self.stop_heartbeat(job)
+
+        TicketsJobServices(zendeskTicketServices).run(job)
+
+        job.refresh_from_db()
+        self.assertGreater(
+            job.heartbeat,
+            timezone.now() - datetime.timedelta(minutes=1)
+        )
+
+    @patch('boards.services.ZendeskTicketServices')
+    def test_run_should_save_progress_and_mark_job_done(
+        self,
+        mock_services
+    ):
+        def create_tickets(board_slug, ticket_ids, progress, excluded_ids):
+            progress(3, 2, 1, ['Error'])
+
+        mock_services.return_value.create_tickets.side_effect = \
+            create_tickets
+        job = TicketsJob.objects.create(
+            board=self.board,
+            ticket_ids='1,2,3'
+        )
+
+        TicketsJobServices().run(job)
+
+        mock_services.return_value.create_tickets.assert_called_once()
+        args, kwargs = mock_services.return_value.create_tickets.call_args
+        self.assertEqual(args, ('pre-production', ['1', '2', '3']))
+        self.assertEqual(kwargs['excluded_ids'], [])
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, TicketsJob.DONE)
+        self.assertEqual(job.total, 3)
+        self.assertEqual(job.done, 2)
+        self.assertEqual(job.failed, 1)
+        self.assertEqual(job.get_errors(), ['Error'])
+        self.assertIsNotNone(job.finished)
+
+    @patch('boards.services.ZendeskTicketServices')
+    def test_run_should_update_tickets_of_update_job(self, mock_services):
+        def update_tickets(ticket_ids, changes, progress):
+            progress(2, 2, 0, [])
+
+        mock_services.return_value.update_tickets.side_effect = \
+            update_tickets
+        job = TicketsJobServices().enqueue_update(
+            self.board,
+            [1, 2],
+            {'subject': 'New Subject'}
+        )
+
+        TicketsJobServices().run(job)
+
+        self.assertEqual(
+            mock_services.return_value.create_tickets.call_count,
+            0
+        )
+        args, _ = mock_services.return_value.update_tickets.call_args
+        self.assertEqual(args, (['1', '2'], {'subject': 'New Subject'}))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, TicketsJob.DONE)
+        self.assertEqual(job.done, 2)
+
+    def test_run_should_use_given_services_and_report_progress(self):
+        def create_tickets(board_slug, ticket_ids, progress, excluded_ids):
+            progress(3, 3, 0, [])
+
+        zendeskTicketServices = MagicMock()
+        zendeskTicketServices.create_tickets.side_effect = create_tickets
+        progress = MagicMock()
+        job = TicketsJob.objects.create(board=self.board)
+
+        TicketsJobServices(zendeskTicketServices).run(
+            job,
+            progress=progress
+        )
+
+        progress.assert_called_once_with(3, 3, 0, [])
+        job.refresh_from_db()
+        self.assertEqual(job.done, 3)
+
+    @patch('boards.services.ZendeskTicketServices')
+    def test_run_should_mark_job_failed_when_creating_tickets_raises(
+        self,
+        mock_services
+    ):
+        mock_services.return_value.create_tickets.side_effect = \
+            ValueError('Boom')
+        job = TicketsJob.objects.create(board=self.board)
+
+        with self.assertRaises(ValueError):
+            TicketsJobServices().run(job)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, TicketsJob.FAILED)
+        self.assertEqual(job.get_errors(), ['Error: Boom'])
+        self.assertIsNotNone(job.finished)
+
+
+class TicketsJobServicesHeartbeatTest(TransactionTestCase):
+    # The heartbeat thread has its own connection, so it only sees the
+    # committed job.
+    @override_settings(TICKETS_JOB_HEARTBEAT_INTERVAL=0.05)
+    def test_run_should_move_heartbeat_while_no_batch_is_done(self):
+        def create_tickets(board_slug, ticket_ids, progress, excluded_ids):
+            time.sleep(0.5)
+
+        zendeskTicketServices = MagicMock()
+        zendeskTicketServices.create_tickets.side_effect = create_tickets
+        board = Board.objects.create(name='Pre-Production')
+        TicketsJobServices().enqueue(board)
+        job = TicketsJobServices().claim()
+        TicketsJob.objects.filter(id=job.id).update(
+            heartbeat=timezone.now() - datetime.timedelta(hours=1)
+        )
+
+        TicketsJobServices(zendeskTicketServices).run(job)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, TicketsJob.DONE)
+        self.assertFalse(job.is_stale)
+        self.assertGreater(
+            job.heartbeat,
+            timezone.now() - datetime.timedelta(minutes=1)
+        )
+
+
+class RunTicketsJobsWorkerCommandTest(TestCase):
+    @patch('boards.services.ZendeskTicketServices')
+    def test_worker_should_run_pending_jobs_once(self, mock_services):
+        board = Board.objects.create(name='Pre-Production')
+        TicketsJob.objects.create(board=board)
+        TicketsJob.objects.create(board=board, ticket_ids='1')
+
+        call_command(
+            'run_tickets_jobs_worker',
+            once=True,
+            stdout=StringIO()
+        )
+
+        self.assertEqual(
+            mock_services.return_value.create_tickets.call_count,
+            2
+        )
+        self.assertEqual(
+            TicketsJob.objects.filter(
+                status=TicketsJob.DONE
+            ).count(),
+            2
+        )
+
+    @patch('boards.services.ZendeskTicketServices')
+    @patch('boards.management.commands.run_tickets_jobs_worker.logger')
+    def test_worker_should_keep_going_when_job_fails(
+        self,
+        mock_logger,
+        mock_services
+    ):
+        mock_services.return_value.create_tickets.side_effect = [
+            ValueError('Boom'),
+            None,
+        ]
+        board = Board.objects.create(name='Pre-Production')
+        TicketsJob.objects.create(board=board)
+        TicketsJob.objects.create(board=board, ticket_ids='1')
+
+        call_command(
+            'run_tickets_jobs_worker',
+            once=True,
+            stdout=StringIO()
+        )
+
+        statuses = TicketsJob.objects.order_by('id').values_list(
+            'status',
+            flat=True
+        )
+        self.assertEqual(
+            list(statuses),
+            [TicketsJob.FAILED, TicketsJob.DONE]
+        )
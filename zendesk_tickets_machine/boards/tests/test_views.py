@@ -1,17 +1,19 @@
 # -*- coding: utf-8 -*-
-from unittest.mock import call, patch
+import datetime
+from unittest.mock import patch
 
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.contrib.messages import constants as MSG
 from django.core.urlresolvers import reverse
-from django.test import TestCase, TransactionTestCase
-from django.test.utils import override_settings
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
 
-from ..models import Board, BoardGroup
+from ..models import Board, BoardGroup, TicketsJob
 from agents.models import Agent
 from agent_groups.models import AgentGroup
-from requesters.models import Requester
 from tickets.models import Ticket
 
 
@@ -599,8 +601,16 @@ class BoardSingleViewTest(TestCase):
             'const ticket_ids = checked.map(function() {\n        ' \
             'if (this.value !== \'on\') {\n          ' \
             'return this.value\n        }\n      }).get()\n\n      ' \
+            '// Selecting all creates the tickets of the whole board, ' \
+            'not only\n      // the ones on this page, less the ones ' \
+            'left out.\n      const select_all = ' \
+            '$(\':checkbox[name=select_all]\').is(\':checked\')\n      ' \
             'const original_href = \'/pre-production/tickets/\'\n      ' \
-            'if (ticket_ids.length > 0) {\n        ' \
+            'if (select_all && excluded_ids().length > 0) {\n        ' \
+            '$(\'#create-zendesk-tickets\').attr(\'href\', ' \
+            'original_href + \'?excluded=\' + ' \
+            'excluded_ids().join(\',\'))\n      ' \
+            '} else if (ticket_ids.length > 0 && !select_all) {\n        ' \
             '$(\'#create-zendesk-tickets\').attr(\'href\', ' \
             'original_href + \'?tickets=\' + ' \
             'ticket_ids.join(\',\'))\n      } else {\n        ' \
@@ -912,6 +922,143 @@ class BoardSingleViewTest(TestCase):
             )
         self.assertNotContains(response, expected, status_code=200)
 
+    def create_tickets(self, count):
+        # Every ticket has its own agents and group, so resolving them per
+        # row would show up as extra queries.
+        for number in range(count):
+            agent = Agent.objects.create(
+                name=f'Agent {number}',
+                zendesk_user_id=str(number)
+            )
+            Ticket.objects.create(
+                subject=f'Ticket {number}',
+                comment=f'Comment {number}',
+                requester='client@hisotech.com',
+                created_by=agent,
+                assignee=agent,
+                group=AgentGroup.objects.create(
+                    name=f'Group {number}',
+                    zendesk_group_id=str(number)
+                ),
+                priority='normal',
+                board=self.board
+            )
+
+    def test_board_single_view_should_list_deactivated_tickets_apart(self):
+        self.login()
+        self.create_tickets(3)
+        Ticket.objects.filter(subject__in=['Ticket 0', 'Ticket 2']).update(
+            is_active=False
+        )
+        url = reverse('board_single', kwargs={'slug': self.board.slug})
+
+        response = self.client.get(url, {'inactive': '1'})
+
+        self.assertEqual(
+            [row.record.subject for row in response.context['tickets'].rows],
+            ['Ticket (Deleted)', 'Ticket 0', 'Ticket 2']
+        )
+        expected = '<button id="button_reactivate_tickets" type="submit" ' \
+            'data-url="/pre-production/tickets/reactivate/" ' \
+            'data-count="3" class="button is-success is-outlined">' \
+            'Restore rows</button>'
+        self.assertContains(response, expected, status_code=200)
+        self.assertNotContains(response, 'id="button_edit_once_form"')
+        self.assertNotContains(response, 'id="create-zendesk-tickets"')
+
+    def test_board_single_view_should_link_to_deactivated_tickets(self):
+        self.login()
+        url = reverse('board_single', kwargs={'slug': self.board.slug})
+
+        response = self.client.get(url)
+
+        expected = '<a href="/pre-production/?inactive=1" ' \
+            'class="button is-outlined">Deactivated Tickets</a>'
+        self.assertContains(response, expected, status_code=200)
+        self.assertNotContains(response, 'id="button_reactivate_tickets"')
+
+    def test_board_single_view_should_not_query_per_ticket(self):
+        self.login()
+        url = reverse('board_single', kwargs={'slug': self.board.slug})
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as one_ticket:
+            self.client.get(url)
+        self.create_tickets(20)
+        with CaptureQueriesContext(connection) as many_tickets:
+            response = self.client.get(url)
+
+        self.assertContains(response, 'Agent 19')
+        self.assertEqual(len(many_tickets), len(one_ticket))
+
+    def test_board_single_view_should_render_in_fixed_number_of_queries(
+        self
+    ):
+        self.login()
+        self.create_tickets(20)
+        url = reverse('board_single', kwargs={'slug': self.board.slug})
+
+        with self.assertNumQueries(8):
+            self.client.get(url)
+
+    def test_board_single_view_should_page_tickets_by_id(self):
+        self.login()
+        self.create_tickets(3)
+        url = reverse('board_single', kwargs={'slug': self.board.slug})
+
+        response = self.client.get(url, {'per_page': 2})
+
+        self.assertContains(response, 'Ticket 1')
+        self.assertContains(response, 'Ticket 0')
+        self.assertNotContains(response, 'Ticket 2')
+        self.assertNotContains(response, 'pagination-previous')
+        next_page_url = response.context['next_page_url']
+        self.assertIn('per_page=2', next_page_url)
+
+        response = self.client.get(url + next_page_url)
+
+        self.assertContains(response, 'Ticket 1')
+        self.assertContains(response, 'Ticket 2')
+        self.assertNotContains(response, 'Comment 0')
+        self.assertContains(response, 'pagination-previous')
+        self.assertIsNone(response.context['next_page_url'])
+
+    def test_board_single_view_should_keep_ordering_by_requester(self):
+        self.login()
+        self.first_ticket.requester = 'z@hisotech.com'
+        self.first_ticket.save()
+        self.create_tickets(2)
+        url = reverse('board_single', kwargs={'slug': self.board.slug})
+
+        response = self.client.get(
+            url,
+            {'sort': '-requester', 'per_page': 1}
+        )
+
+        self.assertContains(response, 'z@hisotech.com')
+        self.assertContains(
+            response,
+            '<th class="desc orderable requester">'
+        )
+        next_page_url = response.context['next_page_url']
+        self.assertIn('sort=-requester', next_page_url)
+
+        response = self.client.get(url + next_page_url)
+
+        self.assertContains(response, 'Comment 1')
+        self.assertNotContains(response, 'z@hisotech.com')
+
+    def test_board_single_view_should_limit_page_size(self):
+        self.login()
+        url = reverse('board_single', kwargs={'slug': self.board.slug})
+
+        with self.settings(BOARD_TICKETS_MAX_PER_PAGE=1):
+            self.create_tickets(1)
+            response = self.client.get(url, {'per_page': 1000})
+
+        self.assertEqual(len(response.context['tickets'].rows), 1)
+        self.assertIsNotNone(response.context['next_page_url'])
+
     def test_board_single_should_have_logout(self):
         self.login()
         response = self.client.get(
@@ -930,6 +1077,330 @@ class BoardSingleViewTest(TestCase):
             self.assertRedirects(response, '/login/?next=/pre-production/')
 
 
+class BoardEditOnceViewTest(TestCase):
+    def setUp(self):
+        agent_group = AgentGroup.objects.create(name='Development')
+        self.board = Board.objects.create(name='Pre-Production')
+        self.tickets = [
+            Ticket.objects.create(
+                subject=f'Ticket {number}',
+                comment='Comment',
+                requester='client@hisotech.com',
+                group=agent_group,
+                board=self.board
+            )
+            for number in range(3)
+        ]
+        self.other_ticket = Ticket.objects.create(
+            subject='Ticket',
+            comment='Comment',
+            requester='client@hisotech.com',
+            group=agent_group,
+            board=Board.objects.create(name='Production')
+        )
+        User.objects.create_superuser('natty', 'natty@test', 'pass')
+        self.client.login(username='natty', password='pass')
+
+    def test_edit_once_should_edit_listed_tickets(self):
+        response = self.client.post(
+            reverse('edit_once'),
+            {
+                'id_list[]': [self.tickets[0].id],
+                'select_all': 'false',
+                'board': self.board.slug,
+                'edit_tags': 'edited',
+            }
+        )
+
+        self.assertEqual(response.json(), {'updated': 1, 'propagated': 0})
+        self.assertEqual(
+            list(Ticket.objects.order_by('id').values_list('tags', flat=True)),
+            ['edited', None, None, None]
+        )
+
+    def test_edit_once_with_select_all_should_edit_whole_board(self):
+        self.client.post(
+            reverse('edit_once'),
+            {
+                'id_list[]': [self.tickets[0].id],
+                'select_all': 'true',
+                'board': self.board.slug,
+                'edit_tags': 'edited',
+            }
+        )
+
+        self.assertEqual(
+            Ticket.objects.filter(tags='edited').count(),
+            3
+        )
+        self.other_ticket.refresh_from_db()
+        self.assertIsNone(self.other_ticket.tags)
+
+    def test_edit_once_with_select_all_should_leave_out_excluded_ids(self):
+        response = self.client.post(
+            reverse('edit_once'),
+            {
+                'select_all': 'true',
+                'board': self.board.slug,
+                'excluded_ids[]': [self.tickets[1].id],
+                'edit_tags': 'edited',
+            }
+        )
+
+        self.assertEqual(response.json(), {'updated': 2, 'propagated': 0})
+        self.assertEqual(
+            list(
+                Ticket.objects.filter(tags='edited').order_by(
+                    'id'
+                ).values_list('id', flat=True)
+            ),
+            [self.tickets[0].id, self.tickets[2].id]
+        )
+
+    def test_edit_once_with_select_all_should_skip_inactive_tickets(self):
+        self.tickets[0].is_active = False
+        self.tickets[0].save()
+
+        response = self.client.post(
+            reverse('edit_once'),
+            {
+                'select_all': 'true',
+                'board': self.board.slug,
+                'edit_tags': 'edited',
+            }
+        )
+
+        self.assertEqual(response.json(), {'updated': 2, 'propagated': 0})
+        self.tickets[0].refresh_from_db()
+        self.assertIsNone(self.tickets[0].tags)
+
+    def test_edit_once_with_propagate_should_queue_update_of_created(self):
+        self.tickets[1].zendesk_ticket_id = '11'
+        self.tickets[1].save()
+
+        response = self.client.post(
+            reverse('edit_once'),
+            {
+                'select_all': 'true',
+                'board': self.board.slug,
+                'propagate': 'true',
+                'edit_tags': 'edited, urgent',
+                'edit_requester': 'another@hisotech.com',
+            }
+        )
+
+        self.assertEqual(response.json(), {'updated': 3, 'propagated': 1})
+        job = TicketsJob.objects.get()
+        self.assertEqual(job.board, self.board)
+        self.assertEqual(job.action, TicketsJob.UPDATE)
+        self.assertEqual(job.get_ticket_ids(), [str(self.tickets[1].id)])
+        self.assertEqual(job.get_changes(), {'tags': ['edited', 'urgent']})
+
+    def test_edit_once_with_propagate_should_not_queue_requester_only(self):
+        self.tickets[1].zendesk_ticket_id = '11'
+        self.tickets[1].save()
+
+        response = self.client.post(
+            reverse('edit_once'),
+            {
+                'select_all': 'true',
+                'board': self.board.slug,
+                'propagate': 'true',
+                'edit_requester': 'another@hisotech.com',
+            }
+        )
+
+        self.assertEqual(response.json(), {'updated': 3, 'propagated': 0})
+        self.assertFalse(TicketsJob.objects.exists())
+
+    def test_edit_once_should_report_counts_on_the_board(self):
+        self.tickets[1].zendesk_ticket_id = '11'
+        self.tickets[1].save()
+
+        self.client.post(
+            reverse('edit_once'),
+            {
+                'select_all': 'true',
+                'board': self.board.slug,
+                'propagate': 'true',
+                'edit_tags': 'edited',
+            }
+        )
+        response = self.client.get(
+            reverse('board_single', kwargs={'slug': self.board.slug})
+        )
+
+        messages = list(response.context['messages'])
+        self.assertEqual(len(messages), 1)
+        self.assertEqual(messages[0].level, MSG.SUCCESS)
+        self.assertEqual(
+            messages[0].message,
+            '3 tickets updated. 1 tickets queued to be updated on Zendesk.'
+        )
+
+    def test_edit_once_should_not_edit_listed_tickets_of_other_boards(self):
+        response = self.client.post(
+            reverse('edit_once'),
+            {
+                'id_list[]': [self.tickets[0].id, self.other_ticket.id],
+                'select_all': 'false',
+                'board': self.board.slug,
+                'edit_tags': 'edited',
+            }
+        )
+
+        self.assertEqual(response.json(), {'updated': 1, 'propagated': 0})
+        self.other_ticket.refresh_from_db()
+        self.assertIsNone(self.other_ticket.tags)
+
+    def test_edit_once_should_require_login(self):
+        self.tickets[1].zendesk_ticket_id = '11'
+        self.tickets[1].save()
+        self.client.logout()
+
+        with self.settings(LOGIN_URL=reverse('login')):
+            response = self.client.post(
+                reverse('edit_once'),
+                {
+                    'select_all': 'true',
+                    'board': self.board.slug,
+                    'propagate': 'true',
+                    'edit_tags': 'edited',
+                }
+            )
+
+        self.assertRedirects(response, '/login/?next=/edit_once/')
+        self.assertFalse(Ticket.objects.filter(tags='edited').exists())
+        self.assertFalse(TicketsJob.objects.exists())
+
+
+class BoardTicketsDeactivateViewTest(TestCase):
+    def setUp(self):
+        agent_group = AgentGroup.objects.create(name='Development')
+        self.board = Board.objects.create(name='Pre-Production')
+        self.tickets = [
+            Ticket.objects.create(
+                subject=f'Ticket {number}',
+                comment='Comment',
+                requester='client@hisotech.com',
+                group=agent_group,
+                board=self.board
+            )
+            for number in range(3)
+        ]
+        self.other_ticket = Ticket.objects.create(
+            subject='Ticket',
+            comment='Comment',
+            requester='client@hisotech.com',
+            group=agent_group,
+            board=Board.objects.create(name='Production')
+        )
+        User.objects.create_superuser('natty', 'natty@test', 'pass')
+        self.client.login(username='natty', password='pass')
+
+    def get_active_ids(self):
+        return list(
+            Ticket.objects.filter(is_active=True).order_by(
+                'id'
+            ).values_list('id', flat=True)
+        )
+
+    def test_deactivate_view_should_deactivate_checked_tickets(self):
+        url = reverse(
+            'board_tickets_deactivate',
+            kwargs={'slug': self.board.slug}
+        )
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                url,
+                {
+                    'id_list[]': [
+                        self.tickets[0].id,
+                        self.other_ticket.id,
+                    ],
+                }
+            )
+
+        self.assertEqual(response.json(), {'deactivated': 1})
+        self.assertEqual(
+            len([
+                each for each in queries
+                if each['sql'].startswith('UPDATE "tickets_ticket"')
+            ]),
+            1
+        )
+        self.assertEqual(
+            self.get_active_ids(),
+            [self.tickets[1].id, self.tickets[2].id, self.other_ticket.id]
+        )
+
+    def test_deactivate_view_with_select_all_should_leave_out_excluded(
+        self
+    ):
+        response = self.client.post(
+            reverse(
+                'board_tickets_deactivate',
+                kwargs={'slug': self.board.slug}
+            ),
+            {
+                'select_all': 'true',
+                'excluded_ids[]': [self.tickets[1].id],
+            }
+        )
+
+        self.assertEqual(response.json(), {'deactivated': 2})
+        self.assertEqual(
+            self.get_active_ids(),
+            [self.tickets[1].id, self.other_ticket.id]
+        )
+
+    def test_reactivate_view_with_select_all_should_restore_board(self):
+        Ticket.objects.update(is_active=False)
+
+        response = self.client.post(
+            reverse(
+                'board_tickets_reactivate',
+                kwargs={'slug': self.board.slug}
+            ),
+            {'select_all': 'true'}
+        )
+
+        self.assertEqual(response.json(), {'reactivated': 3})
+        self.assertEqual(
+            self.get_active_ids(),
+            [each.id for each in self.tickets]
+        )
+
+    def test_reactivate_view_should_reactivate_checked_tickets(self):
+        Ticket.objects.update(is_active=False)
+
+        response = self.client.post(
+            reverse(
+                'board_tickets_reactivate',
+                kwargs={'slug': self.board.slug}
+            ),
+            {'id_list[]': [self.tickets[2].id]}
+        )
+
+        self.assertEqual(response.json(), {'reactivated': 1})
+        self.assertEqual(self.get_active_ids(), [self.tickets[2].id])
+
+    def test_deactivate_view_should_require_login(self):
+        self.client.logout()
+        url = reverse(
+            'board_tickets_deactivate',
+            kwargs={'slug': self.board.slug}
+        )
+        with self.settings(LOGIN_URL=reverse('login')):
+            response = self.client.post(url, {'select_all': 'true'})
+
+        self.assertRedirects(
+            response,
+            '/login/?next=/pre-production/tickets/deactivate/'
+        )
+        self.assertEqual(len(self.get_active_ids()), 4)
+
+
 class BoardRequestersResetViewTest(TestCase):
     def setUp(self):
         agent = Agent.objects.create(name='Kan', zendesk_user_id='123')
@@ -1017,6 +1488,21 @@ class BoardRequestersResetViewTest(TestCase):
         second_ticket = Ticket.objects.get(id=self.second_ticket.id)
         self.assertEqual(second_ticket.organization, 'Hiso Tech 2')
 
+    def test_requesters_reset_view_should_report_tickets_reset(self):
+        self.login()
+        response = self.client.get(
+            reverse(
+                'board_requesters_reset',
+                kwargs={'slug': self.board.slug}
+            ),
+            follow=True
+        )
+
+        messages = list(response.context['messages'])
+        self.assertEqual(len(messages), 1)
+        self.assertEqual(messages[0].level, MSG.SUCCESS)
+        self.assertEqual(messages[0].message, 'Requesters of 1 tickets reset.')
+
     def test_requesters_reset_view_should_redirect_to_board(self):
         self.login()
         response = self.client.get(
@@ -1087,6 +1573,18 @@ class BoardResetViewTest(TestCase):
         second_ticket = Ticket.objects.get(id=self.second_ticket.id)
         self.assertEqual(second_ticket.zendesk_ticket_id, '56578')
 
+    def test_reset_view_should_report_tickets_reset(self):
+        self.login()
+        response = self.client.get(
+            reverse('board_reset', kwargs={'slug': self.board.slug}),
+            follow=True
+        )
+
+        messages = list(response.context['messages'])
+        self.assertEqual(len(messages), 1)
+        self.assertEqual(messages[0].level, MSG.SUCCESS)
+        self.assertEqual(messages[0].message, '1 tickets reset.')
+
     def test_reset_view_should_redirect_to_board(self):
         self.login()
         response = self.client.get(
@@ -1110,41 +1608,9 @@ class BoardResetViewTest(TestCase):
             )
 
 
-class BoardZendeskTicketsCreateViewTest(TransactionTestCase):
+class BoardZendeskTicketsCreateViewTest(TestCase):
     def setUp(self):
-        self.agent = Agent.objects.create(name='Kan', zendesk_user_id='123')
-        self.agent_group = AgentGroup.objects.create(
-            name='Development',
-            zendesk_group_id='123'
-        )
         self.board = Board.objects.create(name='Production')
-        self.ticket = Ticket.objects.create(
-            subject='Ticket 1',
-            comment='Comment 1',
-            requester='client@hisotech.com',
-            created_by=self.agent,
-            assignee=self.agent,
-            group=self.agent_group,
-            ticket_type='question',
-            priority='urgent',
-            tags='welcome',
-            private_comment='Private comment',
-            board=self.board
-        )
-        self.deleted_ticket = Ticket.objects.create(
-            subject='Ticket (Deleted)',
-            comment='Comment',
-            requester='client@hisotech.com',
-            created_by=self.agent,
-            assignee=self.agent,
-            group=self.agent_group,
-            ticket_type='question',
-            priority='urgent',
-            tags='welcome',
-            private_comment='Private comment',
-            board=self.board,
-            is_active=False
-        )
 
     def login(self):
         User.objects.create_superuser('natty', 'natty@test', 'pass')
@@ -1163,539 +1629,61 @@ class BoardZendeskTicketsCreateViewTest(TransactionTestCase):
                 '/login/?next=/production/tickets/'
             )
 
-    @override_settings(DEBUG=True)
-    @patch('boards.views.ZendeskOrganization')
-    @patch('boards.views.ZendeskTicket')
-    @patch('boards.views.ZendeskRequester')
-    def test_ticket_create_view_should_send_data_to_create_zendesk_ticket(
+    @patch('tickets.services.ZendeskTicketServices')
+    def test_create_view_should_queue_job_and_not_create_tickets(
         self,
-        mock_requester,
-        mock_ticket,
-        mock_organization,
+        mock
     ):
         self.login()
-        ticket = Ticket.objects.get(id=self.ticket.id)
-        ticket.tags = 'welcome, pronto_marketing'
-        ticket.save()
-
-        mock_ticket.return_value.create.return_value = {
-            'ticket': {
-                'id': 1
-            }
-        }
-        mock_requester.return_value.search.return_value = {
-            'users': [{
-                'id': '2',
-                'organization_id': 69969,
-            }]
-        }
-        mock_organization.return_value.show.return_value = {
-            'organization': {
-                'id': 69969,
-                'name': 'Pronto Tools',
-            }
-        }
 
         self.client.get(
             reverse('board_tickets_create', kwargs={'slug': self.board.slug})
         )
 
-        data = {
-            'ticket': {
-                'subject': 'Ticket 1',
-                'comment': {
-                    'body': 'Comment 1',
-                    'author_id': '123'
-                },
-                'requester_id': '2',
-                'assignee_id': '123',
-                'group_id': '123',
-                'type': 'question',
-                'due_at': '',
-                'priority': 'urgent',
-                'tags': ['welcome', 'pronto_marketing']
-            }
-        }
-        mock_ticket.return_value.create.assert_called_once_with(data)
-
-        comment = {
-            'ticket': {
-                'comment': {
-                    'author_id': '123',
-                    'body': 'Private comment',
-                    'public': False
-                }
-            }
-        }
-        mock_ticket.return_value.create_comment.assert_called_once_with(
-            comment,
-            1
-        )
-        mock_requester.return_value.search.assert_called_once_with(
-            'client@hisotech.com'
-        )
-        mock_organization.return_value.show.assert_called_once_with(69969)
+        job = TicketsJob.objects.get()
+        self.assertEqual(job.board, self.board)
+        self.assertEqual(job.ticket_ids, '')
+        self.assertEqual(job.status, 'pending')
+        self.assertEqual(mock.call_count, 0)
 
-    @override_settings(DEBUG=True)
-    @patch.dict('os.environ', {'DEFAULT_ZENDESK_USER_ID': '9909'})
-    @patch('boards.views.ZendeskOrganization')
-    @patch('boards.views.ZendeskTicket')
-    @patch('boards.views.ZendeskRequester')
-    def test_create_ticket_with_no_assignee_should_use_default_assignee(
-        self,
-        mock_requester,
-        mock_ticket,
-        mock_organization,
-    ):
+    def test_create_view_should_queue_job_for_selected_tickets(self):
         self.login()
-        self.ticket.assignee = None
-        self.ticket.save()
-
-        mock_ticket.return_value.create.return_value = {
-            'ticket': {
-                'id': 1
-            }
-        }
-        mock_requester.return_value.search.return_value = {
-            'users': [{
-                'id': '2',
-                'organization_id': 69969,
-            }]
-        }
-        mock_organization.return_value.show.return_value = {
-            'organization': {
-                'id': 69969,
-                'name': 'Pronto Tools',
-            }
-        }
 
         self.client.get(
             reverse(
                 'board_tickets_create',
                 kwargs={'slug': self.board.slug}
-            )
+            ) + '?tickets=1,3'
         )
 
-        data = {
-            'ticket': {
-                'subject': 'Ticket 1',
-                'comment': {
-                    'body': 'Comment 1',
-                    'author_id': '123'
-                },
-                'requester_id': '2',
-                'assignee_id': '9909',
-                'group_id': '123',
-                'type': 'question',
-                'due_at': '',
-                'priority': 'urgent',
-                'tags': ['welcome']
-            }
-        }
-        mock_ticket.return_value.create.assert_called_once_with(data)
-
-        comment = {
-            'ticket': {
-                'comment': {
-                    'author_id': '9909',
-                    'body': 'Private comment',
-                    'public': False
-                }
-            }
-        }
-        mock_ticket.return_value.create_comment.assert_called_once_with(
-            comment,
-            1
-        )
-        mock_requester.return_value.search.assert_called_once_with(
-            'client@hisotech.com'
-        )
-        mock_organization.return_value.show.assert_called_once_with(69969)
+        job = TicketsJob.objects.get()
+        self.assertEqual(job.get_ticket_ids(), ['1', '3'])
 
-    @override_settings(DEBUG=True)
-    @patch('boards.views.ZendeskOrganization')
-    @patch('boards.views.ZendeskTicket')
-    @patch('boards.views.ZendeskRequester')
-    def test_ticket_create_view_should_create_two_tickets_if_there_are_two(
-        self,
-        mock_requester,
-        mock_ticket,
-        mock_organization,
-    ):
+    def test_create_view_should_queue_job_for_board_less_excluded(self):
         self.login()
-        mock_ticket.return_value.create.return_value = {
-            'ticket': {
-                'id': 1
-            }
-        }
-        mock_requester.return_value.search.return_value = {
-            'users': [{
-                'id': '2',
-                'organization_id': 69969,
-            }]
-        }
-        mock_organization.return_value.show.return_value = {
-            'organization': {
-                'id': 69969,
-                'name': 'Pronto Tools',
-            }
-        }
-        mock_ticket.return_value.create_comment.return_value = {
-            'audit': {
-                'events': [{
-                    'public': False,
-                    'body': 'Private Comment',
-                    'author_id': '2'
-                }]
-            }
-        }
-
-        Ticket.objects.create(
-            subject='Ticket 2',
-            comment='Comment 2',
-            requester='client@hisotech.com',
-            created_by=self.agent,
-            assignee=self.agent,
-            group=self.agent_group,
-            ticket_type='question',
-            priority='low',
-            tags='welcome',
-            private_comment='Private comment',
-            board=self.board
-        )
-
-        self.client.get(
-            reverse('board_tickets_create', kwargs={'slug': self.board.slug})
-        )
-
-        ticket_calls = [
-            call({
-                'ticket': {
-                    'subject': 'Ticket 2',
-                    'comment': {
-                        'body': 'Comment 2',
-                        'author_id': '123'
-                    },
-                    'requester_id': '2',
-                    'assignee_id': '123',
-                    'group_id': '123',
-                    'type': 'question',
-                    'due_at': '',
-                    'priority': 'low',
-                    'tags': ['welcome']
-                }
-            }),
-            call({
-                'ticket': {
-                    'subject': 'Ticket 1',
-                    'comment': {
-                        'body': 'Comment 1',
-                        'author_id': '123'
-                    },
-                    'requester_id': '2',
-                    'assignee_id': '123',
-                    'group_id': '123',
-                    'type': 'question',
-                    'due_at': '',
-                    'priority': 'urgent',
-                    'tags': ['welcome']
-                }
-            }),
-        ]
-        mock_ticket.return_value.create.assert_has_calls(ticket_calls)
-        self.assertEqual(mock_ticket.return_value.create.call_count, 2)
-
-        comment_calls = [
-            call({
-                'ticket': {
-                    'comment': {
-                        'author_id': '123',
-                        'body': 'Private comment',
-                        'public': False
-                    }
-                }
-            }, 1),
-            call({
-                'ticket': {
-                    'comment': {
-                        'author_id': '123',
-                        'body': 'Private comment',
-                        'public': False
-                    }
-                }
-            }, 1)
-        ]
-        mock_ticket.return_value.create_comment.assert_has_calls(comment_calls)
-        self.assertEqual(mock_ticket.return_value.create_comment.call_count, 2)
-
-    @override_settings(DEBUG=True)
-    @patch('boards.views.ZendeskOrganization')
-    @patch('boards.views.ZendeskTicket')
-    @patch('boards.views.ZendeskRequester')
-    def test_ticket_create_view_should_create_only_tickets_in_their_board(
-        self,
-        mock_requester,
-        mock_ticket,
-        mock_organization,
-    ):
-        self.login()
-        mock_ticket.return_value.create.return_value = {
-            'ticket': {
-                'id': 1
-            }
-        }
-        mock_requester.return_value.search.return_value = {
-            'users': [{
-                'id': '2',
-                'organization_id': 69969,
-            }]
-        }
-        mock_organization.return_value.show.return_value = {
-            'organization': {
-                'id': 69969,
-                'name': 'Pronto Tools',
-            }
-        }
-        mock_ticket.return_value.create_comment.return_value = {
-            'audit': {
-                'events': [{
-                    'public': False,
-                    'body': 'Private Comment',
-                    'author_id': '2'
-                }]
-            }
-        }
-
-        board = Board.objects.create(name='Monthly Newsletter')
-        Ticket.objects.create(
-            subject='Ticket 2',
-            comment='Comment 2',
-            requester='client@hisotech.com',
-            created_by=self.agent,
-            assignee=self.agent,
-            group=self.agent_group,
-            ticket_type='question',
-            priority='low',
-            tags='welcome',
-            private_comment='Private comment',
-            board=board
-        )
 
         self.client.get(
-            reverse('board_tickets_create', kwargs={'slug': self.board.slug})
+            reverse(
+                'board_tickets_create',
+                kwargs={'slug': self.board.slug}
+            ) + '?excluded=2,4'
         )
 
-        self.assertEqual(mock_ticket.return_value.create.call_count, 1)
-        self.assertEqual(mock_ticket.return_value.create_comment.call_count, 1)
-
-        ticket_calls = [
-            call({
-                'ticket': {
-                    'subject': 'Ticket 1',
-                    'comment': {
-                        'body': 'Comment 1',
-                        'author_id': '123'
-                    },
-                    'requester_id': '2',
-                    'assignee_id': '123',
-                    'group_id': '123',
-                    'type': 'question',
-                    'due_at': '',
-                    'priority': 'urgent',
-                    'tags': ['welcome']
-                }
-            })
-        ]
-        mock_ticket.return_value.create.assert_has_calls(ticket_calls)
-
-        comment_calls = [
-            call({
-                'ticket': {
-                    'comment': {
-                        'author_id': '123',
-                        'body': 'Private comment',
-                        'public': False
-                    }
-                }
-            }, 1)
-        ]
-        mock_ticket.return_value.create_comment.assert_has_calls(comment_calls)
+        job = TicketsJob.objects.get()
+        self.assertEqual(job.get_ticket_ids(), [])
+        self.assertEqual(job.get_excluded_ids(), ['2', '4'])
 
-    @override_settings(DEBUG=True)
-    @patch('boards.views.ZendeskOrganization')
-    @patch('boards.views.ZendeskTicket')
-    @patch('boards.views.ZendeskRequester')
-    def test_ticket_create_view_should_create_only_selected_tickets(
-        self,
-        mock_requester,
-        mock_ticket,
-        mock_organization,
-    ):
+    def test_create_view_should_not_queue_same_job_twice(self):
         self.login()
-        mock_ticket.return_value.create.side_effect = [
-            {
-                'ticket': {
-                    'id': 1
-                }
-            },
-            {
-                'ticket': {
-                    'id': 2
-                }
-            },
-        ]
-        mock_requester.return_value.search.return_value = {
-            'users': [{
-                'id': '2',
-                'organization_id': 69969,
-            }]
-        }
-        mock_organization.return_value.show.return_value = {
-            'organization': {
-                'id': 69969,
-                'name': 'Pronto Tools',
-            }
-        }
-        mock_ticket.return_value.create_comment.return_value = {
-            'audit': {
-                'events': [{
-                    'public': False,
-                    'body': 'Private Comment',
-                    'author_id': '2'
-                }]
-            }
-        }
 
-        Ticket.objects.create(
-            subject='Ticket 2',
-            comment='Comment 2',
-            requester='client@hisotech.com',
-            created_by=self.agent,
-            assignee=self.agent,
-            group=self.agent_group,
-            ticket_type='question',
-            priority='low',
-            tags='welcome',
-            private_comment='Private comment 2',
-            board=self.board
-        )
+        url = reverse('board_tickets_create', kwargs={'slug': self.board.slug})
+        self.client.get(url)
+        self.client.get(url)
 
-        third_ticket = Ticket.objects.create(
-            subject='Ticket 3',
-            comment='Comment 3',
-            requester='client@hisotech.com',
-            created_by=self.agent,
-            assignee=self.agent,
-            group=self.agent_group,
-            ticket_type='question',
-            priority='low',
-            tags='welcome',
-            private_comment='Private comment 3',
-            board=self.board
-        )
+        self.assertEqual(TicketsJob.objects.count(), 1)
 
-        self.client.get(
-            reverse(
-                'board_tickets_create',
-                kwargs={'slug': self.board.slug}
-            ) + f'?tickets={self.ticket.id},{third_ticket.id}'
-        )
-
-        self.assertEqual(mock_ticket.return_value.create.call_count, 2)
-        self.assertEqual(mock_ticket.return_value.create_comment.call_count, 2)
-
-        ticket_calls = [
-            call({
-                'ticket': {
-                    'subject': 'Ticket 1',
-                    'comment': {
-                        'body': 'Comment 1',
-                        'author_id': '123'
-                    },
-                    'requester_id': '2',
-                    'assignee_id': '123',
-                    'group_id': '123',
-                    'type': 'question',
-                    'due_at': '',
-                    'priority': 'urgent',
-                    'tags': ['welcome']
-                }
-            }),
-            call({
-                'ticket': {
-                    'subject': 'Ticket 3',
-                    'comment': {
-                        'body': 'Comment 3',
-                        'author_id': '123'
-                    },
-                    'requester_id': '2',
-                    'assignee_id': '123',
-                    'group_id': '123',
-                    'type': 'question',
-                    'due_at': '',
-                    'priority': 'low',
-                    'tags': ['welcome']
-                }
-            }),
-        ]
-        mock_ticket.return_value.create.assert_has_calls(
-            ticket_calls,
-            any_order=True,
-        )
-
-        comment_calls = [
-            call({
-                'ticket': {
-                    'comment': {
-                        'author_id': '123',
-                        'body': 'Private comment 3',
-                        'public': False
-                    }
-                }
-            }, 1),
-            call({
-                'ticket': {
-                    'comment': {
-                        'author_id': '123',
-                        'body': 'Private comment',
-                        'public': False
-                    }
-                }
-            }, 2)
-        ]
-        mock_ticket.return_value.create_comment.assert_has_calls(
-            comment_calls,
-            any_order=True,
-        )
-
-    @override_settings(DEBUG=True)
-    @patch('boards.views.ZendeskOrganization')
-    @patch('boards.views.ZendeskTicket')
-    @patch('boards.views.ZendeskRequester')
-    def test_ticket_create_view_should_redirect_to_board(
-        self,
-        mock_requester,
-        mock_ticket,
-        mock_organization,
-    ):
+    def test_create_view_should_redirect_to_board(self):
         self.login()
-        mock_requester.return_value.search.return_value = {
-            'users': [{
-                'id': '1095195473',
-                'organization_id': 69969,
-            }]
-        }
-        mock_ticket.return_value.create.return_value = {
-            'ticket': {
-                'id': 1
-            }
-        }
-        mock_organization.return_value.show.return_value = {
-            'organization': {
-                'id': 69969,
-                'name': 'Pronto Tools',
-            }
-        }
 
         response = self.client.get(
             reverse('board_tickets_create', kwargs={'slug': self.board.slug})
@@ -1708,441 +1696,135 @@ class BoardZendeskTicketsCreateViewTest(TransactionTestCase):
             target_status_code=200
         )
 
-        requester = Requester.objects.last()
-        self.assertEqual(requester.zendesk_user_id, '1095195473')
-
-    @override_settings(DEBUG=True)
-    @patch('boards.views.ZendeskOrganization')
-    @patch('boards.views.ZendeskTicket')
-    @patch('boards.views.ZendeskRequester')
-    def test_ticket_create_view_should_set_zendesk_ticket_id_to_ticket(
-        self,
-        mock_requester,
-        mock_ticket,
-        mock_organization,
-    ):
+    def test_create_view_should_redirect_to_home_if_board_not_exist(self):
         self.login()
-        self.assertIsNone(self.ticket.zendesk_ticket_id)
-
-        ticket_url = 'https://pronto1445242156.zendesk.com/api/v2/' \
-            'tickets/16.json'
-        result = {
-            'ticket': {
-                'subject': 'Hello',
-                'submitter_id': 1095195473,
-                'priority': None,
-                'raw_subject': 'Hello',
-                'id': 16,
-                'url': ticket_url,
-                'group_id': 23338833,
-                'tags': ['welcome'],
-                'assignee_id': 1095195243,
-                'via': {
-                    'channel': 'api',
-                    'source': {
-                        'from': {}, 'to': {}, 'rel': None
-                    }
-                },
-                'ticket_form_id': None,
-                'updated_at': '2016-12-11T13:27:12Z',
-                'created_at': '2016-12-11T13:27:12Z',
-                'description': 'yeah..',
-                'status': 'open',
-                'requester_id': 1095195473,
-                'forum_topic_id': None
-            }
-        }
-        mock_ticket.return_value.create.return_value = result
-
-        mock_requester.return_value.search.return_value = {
-            'users': [{
-                'id': '1095195473',
-                'organization_id': 69969,
-            }]
-        }
-
-        mock_organization.return_value.show.return_value = {
-            'organization': {
-                'id': 69969,
-                'name': 'Pronto Tools',
-            }
-        }
 
-        self.client.get(
-            reverse('board_tickets_create', kwargs={'slug': self.board.slug})
+        response = self.client.get(
+            reverse('board_tickets_create', kwargs={'slug': 'ghost'}),
+            follow=True
         )
 
-        ticket = Ticket.objects.get(id=self.ticket.id)
-        self.assertEqual(ticket.zendesk_ticket_id, '16')
-
-    @override_settings(DEBUG=True)
-    @patch('boards.views.ZendeskOrganization')
-    @patch('boards.views.ZendeskTicket')
-    @patch('boards.views.ZendeskRequester')
-    def test_ticket_create_view_should_save_requester_id_requester(
-        self,
-        mock_requester,
-        mock_ticket,
-        mock_organization,
-    ):
-        self.login()
-        self.assertIsNone(self.ticket.zendesk_ticket_id)
-
-        ticket_url = 'https://pronto1445242156.zendesk.com/api/v2/' \
-            'tickets/16.json'
-        result = {
-            'ticket': {
-                'subject': 'Hello',
-                'submitter_id': 1095195473,
-                'priority': None,
-                'raw_subject': 'Hello',
-                'id': 16,
-                'url': ticket_url,
-                'group_id': 23338833,
-                'tags': ['welcome'],
-                'assignee_id': 1095195243,
-                'via': {
-                    'channel': 'api',
-                    'source': {
-                        'from': {}, 'to': {}, 'rel': None
-                    }
-                },
-                'ticket_form_id': None,
-                'updated_at': '2016-12-11T13:27:12Z',
-                'created_at': '2016-12-11T13:27:12Z',
-                'description': 'yeah..',
-                'status': 'open',
-                'requester_id': 1095195473,
-                'forum_topic_id': None
-            }
-        }
-        mock_ticket.return_value.create.return_value = result
-
-        mock_requester.return_value.search.return_value = {
-            'users': [{
-                'id': '1095195473',
-                'organization_id': 69969,
-            }]
-        }
-
-        mock_organization.return_value.show.return_value = {
-            'organization': {
-                'id': 69969,
-                'name': 'Pronto Tools',
-            }
-        }
-
-        self.client.get(
-            reverse('board_tickets_create', kwargs={'slug': self.board.slug})
+        self.assertRedirects(
+            response,
+            reverse('boards'),
+            status_code=302,
+            target_status_code=200
         )
+        self.assertEqual(TicketsJob.objects.count(), 0)
 
-        requester = Requester.objects.last()
-        self.assertEqual(requester.zendesk_user_id, '1095195473')
 
-    @override_settings(DEBUG=True)
-    @patch('boards.views.ZendeskOrganization')
-    @patch('boards.views.ZendeskTicket')
-    @patch('boards.views.ZendeskRequester')
-    def test_ticket_create_view_should_set_organization_to_ticket(
-        self,
-        mock_requester,
-        mock_ticket,
-        mock_organization,
-    ):
-        self.login()
-        self.assertIsNone(self.ticket.zendesk_ticket_id)
-
-        ticket_url = 'https://pronto1445242156.zendesk.com/api/v2/' \
-            'tickets/16.json'
-        result = {
-            'ticket': {
-                'subject': 'Hello',
-                'submitter_id': 1095195473,
-                'priority': None,
-                'raw_subject': 'Hello',
-                'id': 16,
-                'url': ticket_url,
-                'group_id': 23338833,
-                'tags': ['welcome'],
-                'assignee_id': 1095195243,
-                'via': {
-                    'channel': 'api',
-                    'source': {
-                        'from': {}, 'to': {}, 'rel': None
-                    }
-                },
-                'ticket_form_id': None,
-                'updated_at': '2016-12-11T13:27:12Z',
-                'created_at': '2016-12-11T13:27:12Z',
-                'description': 'yeah..',
-                'status': 'open',
-                'requester_id': 1095195473,
-                'forum_topic_id': None
-            }
-        }
-        mock_ticket.return_value.create.return_value = result
-
-        mock_requester.return_value.search.return_value = {
-            'users': [{
-                'id': '1095195473',
-                'organization_id': 69969,
-            }]
-        }
-
-        mock_organization.return_value.show.return_value = {
-            'organization': {
-                'id': 69969,
-                'name': 'Pronto Tools',
-            }
-        }
-
-        self.client.get(
-            reverse('board_tickets_create', kwargs={'slug': self.board.slug})
+class BoardZendeskTicketsProgressViewTest(TestCase):
+    def setUp(self):
+        self.board = Board.objects.create(name='Production')
+        self.url = reverse(
+            'board_tickets_progress',
+            kwargs={'slug': self.board.slug}
         )
 
-        ticket = Ticket.objects.get(id=self.ticket.id)
-        self.assertEqual(ticket.organization, 'Pronto Tools')
-
-    @patch('boards.views.ZendeskTicket')
-    def test_create_view_should_not_create_if_zendesk_ticket_id_not_empty(
-        self,
-        mock
-    ):
-        self.login()
-        ticket = Ticket.objects.get(id=self.ticket.id)
-        ticket.zendesk_ticket_id = '123'
-        ticket.save()
-
-        self.client.get(
-            reverse('board_tickets_create', kwargs={'slug': self.board.slug})
-        )
+    def login(self):
+        User.objects.create_superuser('natty', 'natty@test', 'pass')
+        self.client.login(username='natty', password='pass')
 
-        self.assertEqual(mock.return_value.create.call_count, 0)
+    def test_progress_view_should_require_login(self):
+        with self.settings(LOGIN_URL=reverse('login')):
+            response = self.client.get(self.url)
+            self.assertRedirects(
+                response,
+                '/login/?next=/production/tickets/progress/'
+            )
 
-    @override_settings(DEBUG=True)
-    @patch('boards.views.ZendeskOrganization')
-    @patch('boards.views.ZendeskTicket')
-    @patch('boards.views.ZendeskRequester')
-    def test_create_view_should_not_create_if_requester_id_is_empty(
-        self,
-        mock_requester,
-        mock_ticket,
-        mock_organization,
-    ):
+    def test_progress_view_should_return_no_status_if_no_job(self):
         self.login()
-        self.assertIsNone(self.ticket.zendesk_ticket_id)
-
-        ticket_url = 'https://pronto1445242156.zendesk.com/api/v2/' \
-            'tickets/16.json'
-        result = {
-            'ticket': {
-                'subject': 'Hello',
-                'submitter_id': 1095195473,
-                'priority': None,
-                'raw_subject': 'Hello',
-                'id': 16,
-                'url': ticket_url,
-                'group_id': 23338833,
-                'tags': ['welcome'],
-                'assignee_id': 1095195243,
-                'via': {
-                    'channel': 'api',
-                    'source': {
-                        'from': {}, 'to': {}, 'rel': None
-                    }
-                },
-                'ticket_form_id': None,
-                'updated_at': '2016-12-11T13:27:12Z',
-                'created_at': '2016-12-11T13:27:12Z',
-                'description': 'yeah..',
-                'status': 'open',
-                'requester_id': '',
-                'forum_topic_id': None
-            }
-        }
-        mock_ticket.return_value.create.return_value = result
-
-        mock_requester.return_value.search.return_value = {
-            'users': []
-        }
 
-        self.client.get(
-            reverse('board_tickets_create', kwargs={'slug': self.board.slug})
-        )
+        response = self.client.get(self.url)
 
-        ticket = Ticket.objects.last()
-        self.assertIsNone(ticket.zendesk_ticket_id)
+        self.assertEqual(response.json(), {'jobs': []})
 
-    @patch('boards.views.ZendeskRequester')
-    def test_create_view_should_not_create_ticket_if_no_requester(self, mock):
+    def test_progress_view_should_return_progress_of_latest_job(self):
         self.login()
-        self.ticket.requester = ''
-        self.ticket.save()
-
-        self.client.get(
-            reverse('board_tickets_create', kwargs={'slug': self.board.slug})
+        TicketsJob.objects.create(
+            board=self.board,
+            status='done',
+            total=2,
+            done=2
+        )
+        job = TicketsJob.objects.create(
+            board=self.board,
+            status='running',
+            heartbeat=timezone.now(),
+            total=10,
+            done=6,
+            failed=1,
+            errors='RecordInvalid: Requester: Pronto is suspended. '
+            '(kan@pronto.com)'
         )
 
-        self.assertEqual(mock.return_value.search.call_count, 0)
-        self.assertIsNone(self.ticket.zendesk_ticket_id)
-
-    @override_settings(DEBUG=True)
-    @patch('boards.views.ZendeskOrganization')
-    @patch('boards.views.ZendeskTicket')
-    @patch('boards.views.ZendeskRequester')
-    def test_create_view_should_show_msg_and_not_create_ticket_if_get_error(
-        self,
-        mock_requester,
-        mock_ticket,
-        mock_organization,
-    ):
-        self.login()
-
-        mock_ticket.return_value.create.side_effect = [
-            {
-                'description': 'Record validation errors',
-                'details': {
-                    'requester': [
-                        {
-                            'description': 'Requester: Pronto is suspended.'
-                        }
-                    ]
-                },
-                'error': 'RecordInvalid'
-            },
-            {
-                'ticket': {
-                    'id': 99
-                }
-            }
-        ]
-        mock_requester.return_value.search.return_value = {
-            'users': [{
-                'id': '2',
-                'organization_id': 69969,
-                'email': 'kan@pronto.com',
-            }]
-        }
-        mock_organization.return_value.show.return_value = {
-            'organization': {
-                'id': 69969,
-                'name': 'Pronto Tools',
-            }
-        }
-        mock_ticket.return_value.create_comment.return_value = {
-            'audit': {
-                'events': [{
-                    'public': False,
-                    'body': 'Private Comment',
-                    'author_id': '2'
-                }]
-            }
+        response = self.client.get(self.url)
+
+        expected = {
+            'id': job.id,
+            'action': 'create',
+            'status': 'running',
+            'total': 10,
+            'done': 6,
+            'failed': 1,
+            'remaining': 3,
+            'errors': [
+                'RecordInvalid: Requester: Pronto is suspended. '
+                '(kan@pronto.com)'
+            ],
+            'stale': False,
         }
+        self.assertEqual(response.json(), {'jobs': [expected]})
 
-        another_ticket = Ticket.objects.create(
-            subject='Ticket 2',
-            comment='Comment 2',
-            requester='client@hisotech.com',
-            created_by=self.agent,
-            assignee=self.agent,
-            group=self.agent_group,
-            ticket_type='question',
-            priority='low',
-            tags='welcome',
-            private_comment='Private comment',
-            board=self.board
+    def test_progress_view_should_return_latest_job_of_each_action(self):
+        self.login()
+        create = TicketsJob.objects.create(
+            board=self.board,
+            status='running',
+            heartbeat=timezone.now()
         )
-
-        response = self.client.get(
-            reverse('board_tickets_create', kwargs={'slug': self.board.slug}),
-            follow=True
+        TicketsJob.objects.create(
+            board=self.board,
+            action=TicketsJob.UPDATE,
+            status='done'
+        )
+        update = TicketsJob.objects.create(
+            board=self.board,
+            action=TicketsJob.UPDATE,
+            status='done',
+            failed=1,
+            errors='Update of ticket 12 failed'
         )
 
-        ticket = Ticket.objects.get(id=self.ticket.id)
-        self.assertEqual(ticket.zendesk_ticket_id, '99')
-        another_ticket = Ticket.objects.get(id=another_ticket.id)
-        self.assertIsNone(another_ticket.zendesk_ticket_id)
-
-        ticket_calls = [
-            call({
-                'ticket': {
-                    'subject': 'Ticket 2',
-                    'comment': {
-                        'body': 'Comment 2',
-                        'author_id': '123'
-                    },
-                    'requester_id': '2',
-                    'assignee_id': '123',
-                    'group_id': '123',
-                    'type': 'question',
-                    'due_at': '',
-                    'priority': 'low',
-                    'tags': ['welcome']
-                }
-            }),
-            call({
-                'ticket': {
-                    'subject': 'Ticket 1',
-                    'comment': {
-                        'body': 'Comment 1',
-                        'author_id': '123'
-                    },
-                    'requester_id': '2',
-                    'assignee_id': '123',
-                    'group_id': '123',
-                    'type': 'question',
-                    'due_at': '',
-                    'priority': 'urgent',
-                    'tags': ['welcome']
-                }
-            }),
-        ]
-        mock_ticket.return_value.create.assert_has_calls(ticket_calls)
-        self.assertEqual(mock_ticket.return_value.create.call_count, 2)
+        response = self.client.get(self.url)
 
-        mock_ticket.return_value.create_comment.assert_called_once_with(
-            {
-                'ticket': {
-                    'comment': {
-                        'author_id': '123',
-                        'body': 'Private comment',
-                        'public': False
-                    }
-                }
-            },
-            99
+        jobs = response.json()['jobs']
+        self.assertEqual(
+            [(each['id'], each['action']) for each in jobs],
+            [(create.id, 'create'), (update.id, 'update')]
         )
+        self.assertEqual(jobs[1]['errors'], ['Update of ticket 12 failed'])
 
-        search_calls = [
-            call('client@hisotech.com'),
-            call('client@hisotech.com'),
-        ]
-        mock_requester.return_value.search.assert_has_calls(search_calls)
-        self.assertEqual(mock_requester.return_value.search.call_count, 2)
-
-        organization_calls = [
-            call(69969),
-            call(69969),
-        ]
-        mock_organization.return_value.show.assert_has_calls(
-            organization_calls
+    def test_progress_view_should_report_job_of_crashed_worker_stale(
+        self
+    ):
+        self.login()
+        TicketsJob.objects.create(
+            board=self.board,
+            status='running',
+            heartbeat=timezone.now() - datetime.timedelta(hours=1)
         )
-        self.assertEqual(mock_organization.return_value.show.call_count, 2)
 
-        messages = list(response.context['messages'])
-        self.assertEqual(len(messages), 1)
+        response = self.client.get(self.url)
 
-        expected_message = 'RecordInvalid: Requester: Pronto is suspended. ' \
-            '(kan@pronto.com)'
-        self.assertEqual(messages[0].level, MSG.ERROR)
-        self.assertEqual(messages[0].message, expected_message)
+        self.assertTrue(response.json()['jobs'][0]['stale'])
 
-        self.assertRedirects(
-            response,
-            reverse('board_single', kwargs={'slug': self.board.slug}),
-            status_code=302,
-            target_status_code=200
-        )
+    def test_progress_view_should_not_return_job_of_other_board(self):
+        self.login()
+        board = Board.objects.create(name='Monthly Newsletter')
+        TicketsJob.objects.create(board=board, status='running')
 
-        expected = f'<li class="alert alert-danger">{expected_message}</li>'
-        self.assertContains(response, expected, status_code=200)
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.json(), {'jobs': []})
@@ -6,13 +6,17 @@ from .views import (
     BoardRequestersResetView,
     BoardResetView,
     BoardSingleView,
+    BoardTicketsDeactivateView,
+    BoardTicketsReactivateView,
     BoardZendeskTicketsCreateView,
+    BoardZendeskTicketsProgressView,
 )
 
 
 urlpatterns = [
     url(r'^$', login_required(BoardView.as_view()), name='boards'),
-    url(r'^edit_once/$', BoardSingleView.edit_once, name='edit_once'),
+    url(r'^edit_once/$',
+        login_required(BoardSingleView.edit_once), name='edit_once'),
     url(r'^(?P<slug>[\w-]+)/$',
         login_required(BoardSingleView.as_view()), name='board_single'),
     url(r'^(?P<slug>[\w-]+)/requesters/reset/$',
@@ -23,4 +27,13 @@ urlpatterns = [
     url(r'^(?P<slug>[\w-]+)/tickets/$',
         login_required(BoardZendeskTicketsCreateView.as_view()),
         name='board_tickets_create'),
+    url(r'^(?P<slug>[\w-]+)/tickets/deactivate/$',
+        login_required(BoardTicketsDeactivateView.as_view()),
+        name='board_tickets_deactivate'),
+    url(r'^(?P<slug>[\w-]+)/tickets/reactivate/$',
+        login_required(BoardTicketsReactivateView.as_view()),
+        name='board_tickets_reactivate'),
+    url(r'^(?P<slug>[\w-]+)/tickets/progress/$',
+        login_required(BoardZendeskTicketsProgressView.as_view()),
+        name='board_tickets_progress'),
 ]
@@ -1,26 +1,22 @@
 # -*- coding: utf-8 -*-
-import os
-import time
-
 from django.conf import settings
 from django.core.urlresolvers import reverse
 from django.contrib import messages
-from django.http import HttpResponseRedirect, HttpResponse
+from django.http import HttpResponseRedirect, JsonResponse
 from django.shortcuts import render
 from django.views.generic import TemplateView, View
 
-from django_tables2 import RequestConfig
-
-from .models import Board, BoardGroup
-from requesters.models import Requester
+from .models import Board, BoardGroup, TicketsJob
+from .services import TicketsJobServices
 from tickets.forms import TicketForm, TicketUpdateOnceForm
 from tickets.models import Ticket
+from tickets.pagination import KeysetPaginator
 from tickets.services import TicketServices
-from tickets.tables import TicketTable
-from zendesk.api import (
-    Organization as ZendeskOrganization,
-    User as ZendeskRequester,
-    Ticket as ZendeskTicket,
+from tickets.tables import (
+    TICKET_TABLE_FIELDS,
+    TICKET_TABLE_ORDERABLE,
+    TICKET_TABLE_RELATED,
+    TicketTable,
 )
 
 
@@ -51,6 +47,77 @@ class BoardView(TemplateView):
 class BoardSingleView(TemplateView):
     template_name = 'board_single.html'
 
+    def get_tickets(self, board, is_active=True):
+        return Ticket.objects.filter(
+            board=board, is_active=is_active
+        ).select_related(
+            *TICKET_TABLE_RELATED
+        ).only(
+            *TICKET_TABLE_FIELDS
+        ).order_by('id')
+
+    def get_per_page(self, request):
+        try:
+            per_page = int(request.GET.get('per_page'))
+        except (TypeError, ValueError):
+            return settings.BOARD_TICKETS_PER_PAGE
+
+        return min(max(per_page, 1), settings.BOARD_TICKETS_MAX_PER_PAGE)
+
+    def get_page_url(self, request, **cursor):
+        query = request.GET.copy()
+        query.pop('after', None)
+        query.pop('before', None)
+        query.update(cursor)
+
+        return f'?{query.urlencode()}'
+
+    def paginate_tickets(self, request, board):
+        # Boards can hold hundreds of thousands of tickets, so pages are
+        # fetched by seeking past a cursor instead of with OFFSET.
+        sort = request.GET.get('sort', '')
+        if sort.lstrip('-') not in TICKET_TABLE_ORDERABLE:
+            sort = None
+
+        # Deactivated tickets are listed apart, to pick the ones to restore.
+        inactive = request.GET.get('inactive') == '1'
+        tickets = self.get_tickets(board, is_active=not inactive)
+
+        paginator = KeysetPaginator(
+            tickets,
+            self.get_per_page(request),
+            order_by=sort
+        )
+        page = paginator.page(
+            after=request.GET.get('after'),
+            before=request.GET.get('before')
+        )
+
+        previous_page_url = None
+        if page.has_previous:
+            previous_page_url = self.get_page_url(
+                request,
+                before=page.previous_cursor
+            )
+        next_page_url = None
+        if page.has_next:
+            next_page_url = self.get_page_url(
+                request,
+                after=page.next_cursor
+            )
+
+        context = {
+            'tickets': TicketTable(page.object_list, order_by=sort),
+            'previous_page_url': previous_page_url,
+            'next_page_url': next_page_url,
+            'inactive': inactive,
+        }
+        if inactive:
+            # Restoring all asks for confirmation with how many there are.
+            context['inactive_count'] = tickets.count()
+
+        return context
+
     def get(self, request, slug):
         try:
             board = Board.objects.get(slug=slug)
@@ -67,34 +134,25 @@ class BoardSingleView(TemplateView):
         form = TicketForm(initial=initial)
         ticket_update_once_form = TicketUpdateOnceForm()
 
-        tickets = TicketTable(
-            Ticket.objects.filter(
-                board__slug=slug, is_active=True
-            ).order_by('id')
-        )
-        RequestConfig(request).configure(tickets)
-
         zendesk_ticket_url = settings.ZENDESK_URL + '/agent/tickets/'
         firebase_messaging_sender_id = settings.FIREBASE_MESSAGING_SENDER_ID
 
-        return render(
-            request,
-            self.template_name,
-            {
-                'board_name': board.name,
-                'board_slug': board.slug,
-                'form': form,
-                'ticket_update_once_form': ticket_update_once_form,
-                'tickets': tickets,
-                'zendesk_ticket_url': zendesk_ticket_url,
-                'firebase_api_key': settings.FIREBASE_API_KEY,
-                'firebase_auth_domain': settings.FIREBASE_AUTH_DOMAIN,
-                'firebase_database_url': settings.FIREBASE_DATABASE_URL,
-                'firebase_project_id': settings.FIREBASE_PROJECT_ID,
-                'firebase_storage_bucket': settings.FIREBASE_STORAGE_BUCKET,
-                'firebase_messaging_sender_id': firebase_messaging_sender_id
-            }
-        )
+        context = self.paginate_tickets(request, board)
+        context.update({
+            'board_name': board.name,
+            'board_slug': board.slug,
+            'form': form,
+            'ticket_update_once_form': ticket_update_once_form,
+            'zendesk_ticket_url': zendesk_ticket_url,
+            'firebase_api_key': settings.FIREBASE_API_KEY,
+            'firebase_auth_domain': settings.FIREBASE_AUTH_DOMAIN,
+            'firebase_database_url': settings.FIREBASE_DATABASE_URL,
+            'firebase_project_id': settings.FIREBASE_PROJECT_ID,
+            'firebase_storage_bucket': settings.FIREBASE_STORAGE_BUCKET,
+            'firebase_messaging_sender_id': firebase_messaging_sender_id
+        })
+
+        return render(request, self.template_name, context)
 
     def post(self, request, slug):
         try:
@@ -111,35 +169,27 @@ class BoardSingleView(TemplateView):
 
         ticket_update_once_form = TicketUpdateOnceForm()
 
-        tickets = TicketTable(
-            Ticket.objects.filter(
-                board__slug=slug, is_active=True
-            ).order_by('id')
-        )
         zendesk_ticket_url = settings.ZENDESK_URL + '/agent/tickets/'
         firebase_messaging_sender_id = settings.FIREBASE_MESSAGING_SENDER_ID
 
-        return render(
-            request,
-            self.template_name,
-            {
-                'board_name': board.name,
-                'board_slug': board.slug,
-                'form': form,
-                'ticket_update_once_form': ticket_update_once_form,
-                'tickets': tickets,
-                'zendesk_ticket_url': zendesk_ticket_url,
-                'firebase_api_key': settings.FIREBASE_API_KEY,
-                'firebase_auth_domain': settings.FIREBASE_AUTH_DOMAIN,
-                'firebase_database_url': settings.FIREBASE_DATABASE_URL,
-                'firebase_project_id': settings.FIREBASE_PROJECT_ID,
-                'firebase_storage_bucket': settings.FIREBASE_STORAGE_BUCKET,
-                'firebase_messaging_sender_id': firebase_messaging_sender_id
-            }
-        )
+        context = self.paginate_tickets(request, board)
+        context.update({
+            'board_name': board.name,
+            'board_slug': board.slug,
+            'form': form,
+            'ticket_update_once_form': ticket_update_once_form,
+            'zendesk_ticket_url': zendesk_ticket_url,
+            'firebase_api_key': settings.FIREBASE_API_KEY,
+            'firebase_auth_domain': settings.FIREBASE_AUTH_DOMAIN,
+            'firebase_database_url': settings.FIREBASE_DATABASE_URL,
+            'firebase_project_id': settings.FIREBASE_PROJECT_ID,
+            'firebase_storage_bucket': settings.FIREBASE_STORAGE_BUCKET,
+            'firebase_messaging_sender_id': firebase_messaging_sender_id
+        })
+
+        return render(request, self.template_name, context)
 
     def edit_once(self):
-        id_list = self.POST.getlist('id_list[]')
         edit_tags = self.POST.get('edit_tags')
         edit_subject = self.POST.get('edit_subject')
         edit_due_at = self.POST.get('edit_due_at')
@@ -148,8 +198,22 @@ class BoardSingleView(TemplateView):
 
         ticketServices = TicketServices()
 
-        ticketServices.edit_ticket_once(
-            id_list,
+        # Selecting all applies to the whole board, not only to the tickets
+        # of the page shown, less the ones left out.
+        board_slug = self.POST.get('board')
+        if self.POST.get('select_all') == 'true' and board_slug:
+            tickets = ticketServices.get_board_tickets(
+                board_slug,
+                self.POST.getlist('excluded_ids[]')
+            )
+        else:
+            tickets = Ticket.objects.filter(
+                board__slug=board_slug,
+                pk__in=self.POST.getlist('id_list[]')
+            )
+
+        updated = ticketServices.edit_tickets(
+            tickets,
             edit_tags,
             edit_requester,
             edit_subject,
@@ -157,15 +221,81 @@ class BoardSingleView(TemplateView):
             edit_assignee
         )
 
-        return HttpResponse(content_type="application/json")
+        # Tickets already created on Zendesk get the same edits from a
+        # background job. The requester is not sent, it would need a
+        # Zendesk user lookup per ticket.
+        propagated = 0
+        board = Board.objects.filter(slug=board_slug).first()
+        if self.POST.get('propagate') == 'true' and updated and board:
+            changes = ticketServices.build_zendesk_changes(
+                edit_tags,
+                edit_subject,
+                edit_due_at,
+                edit_assignee
+            )
+            ticket_ids = list(
+                tickets.filter(
+                    zendesk_ticket_id__isnull=False
+                ).values_list('id', flat=True)
+            )
+            if changes and ticket_ids:
+                jobServices = TicketsJobServices()
+                jobServices.enqueue_update(board, ticket_ids, changes)
+                propagated = len(ticket_ids)
+
+        # The board page is reloaded after an edit, the counts are shown
+        # there.
+        text = f'{updated} tickets updated.'
+        if propagated:
+            text += f' {propagated} tickets queued to be updated on Zendesk.'
+        messages.success(self, text)
+
+        return JsonResponse({'updated': updated, 'propagated': propagated})
+
+
+class BoardTicketsSelectionView(View):
+    # Tickets checked on the board page, or the whole board less the ones
+    # left out when all are selected, as edit_once selects them.
+    is_active = True
+
+    def get_selected_tickets(self, request, slug):
+        ticketServices = TicketServices()
+        if request.POST.get('select_all') == 'true':
+            return ticketServices.get_board_tickets(
+                slug,
+                request.POST.getlist('excluded_ids[]'),
+                is_active=self.is_active
+            )
+
+        return Ticket.objects.filter(
+            board__slug=slug,
+            pk__in=request.POST.getlist('id_list[]')
+        )
+
+
+class BoardTicketsDeactivateView(BoardTicketsSelectionView):
+    def post(self, request, slug):
+        tickets = self.get_selected_tickets(request, slug)
+        deactivated = TicketServices().deactivate_tickets(tickets)
+
+        return JsonResponse({'deactivated': deactivated})
+
+
+class BoardTicketsReactivateView(BoardTicketsSelectionView):
+    is_active = False
+
+    def post(self, request, slug):
+        tickets = self.get_selected_tickets(request, slug)
+        reactivated = TicketServices().reactivate_tickets(tickets)
+
+        return JsonResponse({'reactivated': reactivated})
 
 
 class BoardRequestersResetView(View):
     def get(self, request, slug):
-        Ticket.objects.filter(board__slug=slug).update(
-            requester='',
-            organization=''
-        )
+        ticketServices = TicketServices()
+        reset = ticketServices.reset_requesters(slug)
+        messages.success(request, f'Requesters of {reset} tickets reset.')
 
         return HttpResponseRedirect(
             reverse('board_single', kwargs={'slug': slug})
@@ -174,7 +304,9 @@ class BoardRequestersResetView(View):
 
 class BoardResetView(View):
     def get(self, request, slug):
-        Ticket.objects.filter(board__slug=slug).update(zendesk_ticket_id=None)
+        ticketServices = TicketServices()
+        reset = ticketServices.reset_zendesk_ticket_ids(slug)
+        messages.success(request, f'{reset} tickets reset.')
 
         return HttpResponseRedirect(
             reverse('board_single', kwargs={'slug': slug})
@@ -183,114 +315,63 @@ class BoardResetView(View):
 
 class BoardZendeskTicketsCreateView(View):
     def get(self, request, slug):
-        zendesk_ticket = ZendeskTicket()
-        zendesk_user = ZendeskRequester()
-        zendesk_organization = ZendeskOrganization()
+        try:
+            board = Board.objects.get(slug=slug)
+        except Board.DoesNotExist:
+            text = 'Oops! The board you are looking for ' \
+                'no longer exists..'
+            messages.error(request, text)
+
+            return HttpResponseRedirect(reverse('boards'))
 
         selected_tickets = request.GET.get('tickets')
         if selected_tickets:
-            tickets = Ticket.objects.filter(
-                id__in=selected_tickets.split(','),
-                board__slug=slug,
-                is_active=True
-            )
+            ticket_ids = selected_tickets.split(',')
         else:
-            tickets = Ticket.objects.filter(
-                board__slug=slug,
-                is_active=True
-            )
+            ticket_ids = None
 
-        tickets = tickets.exclude(zendesk_ticket_id__isnull=False)
-
-        for each in tickets:
-            if each.requester == '':
-                continue
-
-            if each.assignee:
-                assignee_id = each.assignee.zendesk_user_id
-            else:
-                assignee_id = os.environ.get('DEFAULT_ZENDESK_USER_ID', 0)
-
-            requester_result = zendesk_user.search(each.requester)
-
-            if each.due_at is not None:
-                due_at = each.due_at.isoformat()
-            else:
-                due_at = ''
-
-            if each.created_by:
-                created_by = each.created_by.zendesk_user_id
-            else:
-                created_by = assignee_id
-
-            try:
-                requester_id = requester_result['users'][0]['id']
-                data = {
-                    'ticket': {
-                        'subject': each.subject,
-                        'comment': {
-                            'body': each.comment,
-                            'author_id': created_by
-                        },
-                        'requester_id': requester_id,
-                        'assignee_id': assignee_id,
-                        'group_id': each.group.zendesk_group_id,
-                        'type': each.ticket_type,
-                        'due_at': due_at,
-                        'priority': each.priority,
-                        'tags': [tag.strip() for tag in each.tags.split(',')]
-                    }
-                }
-
-                organization_id = requester_result['users'][0][
-                    'organization_id'
-                ]
-                organization_result = zendesk_organization.show(
-                    organization_id
-                )
-
-                result = zendesk_ticket.create(data)
-                ticket = result.get('ticket')
-                if ticket:
-                    each.zendesk_ticket_id = ticket.get('id')
-                else:
-                    requester_email = requester_result['users'][0]['email']
-                    result_error = result.get('error')
-                    result_requester = result.get('details').get('requester')
-                    for each in result_requester:
-                        each_description = each.get('description')
-                        error_message = f'{result_error}: ' \
-                            f'{each_description} ({requester_email})'
-                        messages.error(request, error_message)
-                    continue
-
-                each.organization = organization_result['organization']['name']
-                each.save()
-
-                Requester.objects.get_or_create(
-                    email=each.requester,
-                    zendesk_user_id=requester_id
-                )
-
-                data = {
-                    'ticket': {
-                        'comment': {
-                            'author_id': assignee_id,
-                            'body': each.private_comment,
-                            'public': False
-                        }
-                    }
-                }
-                result = zendesk_ticket.create_comment(
-                    data,
-                    each.zendesk_ticket_id
-                )
-            except IndexError:
-                pass
+        # The whole board less the tickets left out, as "Edit rows" and
+        # "Deactivate rows" select them.
+        excluded_tickets = request.GET.get('excluded')
+        if excluded_tickets:
+            excluded_ids = excluded_tickets.split(',')
+        else:
+            excluded_ids = None
 
-            if not settings.DEBUG:
-                time.sleep(1)
+        jobServices = TicketsJobServices()
+        jobServices.enqueue(board, ticket_ids, excluded_ids)
 
         return HttpResponseRedirect(
             reverse('board_single', kwargs={'slug': slug})
         )
+
+
+class BoardZendeskTicketsProgressView(View):
+    def get(self, request, slug):
+        # The newest job of each action, so an update queued while the
+        # board's tickets are being created does not hide that progress.
+        jobs = []
+        for action, _ in TicketsJob.ACTION_CHOICES:
+            job = TicketsJob.objects.filter(
+                board__slug=slug,
+                action=action
+            ).order_by('-id').first()
+            if job:
+                jobs.append(job)
+
+        return JsonResponse({
+            'jobs': [
+                {
+                    'id': job.id,
+                    'action': job.action,
+                    'status': job.status,
+                    'total': job.total,
+                    'done': job.done,
+                    'failed': job.failed,
+                    'remaining': job.remaining,
+                    'errors': job.get_errors(),
+                    'stale': job.is_stale,
+                }
+                for job in sorted(jobs, key=lambda job: job.id)
+            ],
+        })
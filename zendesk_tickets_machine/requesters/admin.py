@@ -8,4 +8,6 @@ class RequesterAdmin(admin.ModelAdmin):
     list_display = (
         'email',
         'zendesk_user_id',
+        'organization_id',
+        'updated',
     )
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11a1 on 2026-10-18 16:40
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('requesters', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='requester',
+            name='organization_id',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='requester',
+            name='updated',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='requester',
+            name='email',
+            field=models.CharField(db_index=True, max_length=300),
+        ),
+    ]
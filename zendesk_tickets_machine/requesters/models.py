@@ -2,8 +2,10 @@ from django.db import models
 
 
 class Requester(models.Model):
-    email = models.CharField(max_length=300)
+    email = models.CharField(max_length=300, db_index=True)
     zendesk_user_id = models.CharField(max_length=100)
+    organization_id = models.CharField(max_length=100, null=True, blank=True)
+    updated = models.DateTimeField(null=True, blank=True)
 
     def __str__(self):
         return self.email
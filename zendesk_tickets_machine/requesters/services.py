@@ -0,0 +1,117 @@
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Requester
+
+
+class LRUCache(object):
+    def __init__(self, size):
+        self.size = size
+        self.lock = threading.Lock()
+        self.items = OrderedDict()
+
+    def get(self, key):
+        with self.lock:
+            value = self.items.get(key)
+            if value is not None:
+                self.items.move_to_end(key)
+
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.items[key] = value
+            self.items.move_to_end(key)
+            while len(self.items) > self.size:
+                self.items.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+
+
+requester_cache = LRUCache(settings.ZENDESK_REQUESTER_CACHE_SIZE)
+organization_cache = LRUCache(settings.ZENDESK_REQUESTER_CACHE_SIZE)
+
+
+class RequesterServices():
+    # Resolves requester emails to Zendesk users from this process' LRU
+    # first, then from the Requester table, so the Zendesk user search is
+    # only needed for new requesters or rows older than the TTL.
+    def __init__(self, ttl=None):
+        if ttl is None:
+            ttl = settings.ZENDESK_REQUESTER_CACHE_TTL
+
+        self.ttl = ttl
+        self.counters = Counter()
+
+    def lookup(self, email):
+        cached = requester_cache.get(email)
+        if cached is not None:
+            requester, cached_at = cached
+            if time.time() - cached_at < self.ttl:
+                self.count('memory')
+                return requester
+
+        row = Requester.objects.filter(
+            email=email,
+            updated__gte=timezone.now() - timedelta(seconds=self.ttl)
+        ).order_by('-updated').first()
+        if row is not None:
+            requester = self.build_requester(row)
+            requester_cache.set(email, (requester, row.updated.timestamp()))
+            self.count('database')
+            return requester
+
+        self.count('zendesk')
+        return None
+
+    def store(self, email, user):
+        organization_id = user.get('organization_id')
+        values = {
+            'zendesk_user_id': str(user['id']),
+            'organization_id': organization_id and str(organization_id),
+            'updated': timezone.now(),
+        }
+        if not Requester.objects.filter(email=email).update(**values):
+            Requester.objects.create(email=email, **values)
+
+        requester_cache.set(
+            email,
+            (self.build_requester(Requester(email=email, **values)),
+             time.time())
+        )
+
+    def get_organization_name(self, organization_id):
+        cached = organization_cache.get(str(organization_id))
+        if cached is not None:
+            name, cached_at = cached
+            if time.time() - cached_at < self.ttl:
+                return name
+
+        return None
+
+    def store_organizations(self, organizations):
+        now = time.time()
+        for each in organizations:
+            organization_cache.set(str(each['id']), (each['name'], now))
+
+    def count(self, source):
+        self.counters[source] += 1
+
+    def build_requester(self, row):
+        return {
+            'id': row.zendesk_user_id,
+            'email': row.email,
+            'organization_id': row.organization_id,
+        }
+
+    def get_summary(self):
+        return f'{self.counters["memory"]} memory hits, ' \
+            f'{self.counters["database"]} database hits, ' \
+            f'{self.counters["zendesk"]} Zendesk searches'
@@ -24,3 +24,9 @@ class RequesterAdminTest(TestCase):
 
         expected = '<div class="text"><a href="?o=2">Zendesk user id</a></div>'
         self.assertContains(response, expected, count=1, status_code=200)
+
+        expected = '<div class="text"><a href="?o=3">Organization id</a></div>'
+        self.assertContains(response, expected, count=1, status_code=200)
+
+        expected = '<div class="text"><a href="?o=4">Updated</a></div>'
+        self.assertContains(response, expected, count=1, status_code=200)
@@ -0,0 +1,181 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import Requester
+from ..services import (
+    LRUCache,
+    RequesterServices,
+    organization_cache,
+    requester_cache,
+)
+
+
+class LRUCacheTest(TestCase):
+    def test_set_should_evict_least_recently_used_item(self):
+        cache = LRUCache(2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_clear_should_remove_all_items(self):
+        cache = LRUCache(2)
+        cache.set('a', 1)
+
+        cache.clear()
+
+        self.assertIsNone(cache.get('a'))
+
+
+class RequesterServicesTest(TestCase):
+    def setUp(self):
+        requester_cache.clear()
+        organization_cache.clear()
+
+    def test_lookup_should_return_none_and_count_miss_if_unknown(self):
+        requesterServices = RequesterServices()
+
+        self.assertIsNone(requesterServices.lookup('client@hisotech.com'))
+        self.assertEqual(requesterServices.counters['zendesk'], 1)
+
+    def test_lookup_should_return_fresh_requester_from_database(self):
+        Requester.objects.create(
+            email='client@hisotech.com',
+            zendesk_user_id='2',
+            organization_id='69969',
+            updated=timezone.now()
+        )
+        requesterServices = RequesterServices()
+
+        requester = requesterServices.lookup('client@hisotech.com')
+
+        expected = {
+            'id': '2',
+            'email': 'client@hisotech.com',
+            'organization_id': '69969',
+        }
+        self.assertEqual(requester, expected)
+        self.assertEqual(requesterServices.counters['database'], 1)
+
+    def test_lookup_should_return_requester_from_memory_second_time(self):
+        Requester.objects.create(
+            email='client@hisotech.com',
+            zendesk_user_id='2',
+            updated=timezone.now()
+        )
+        requesterServices = RequesterServices()
+        requesterServices.lookup('client@hisotech.com')
+
+        with self.assertNumQueries(0):
+            requester = requesterServices.lookup('client@hisotech.com')
+
+        self.assertEqual(requester['id'], '2')
+        self.assertEqual(requesterServices.counters['memory'], 1)
+
+    def test_lookup_should_ignore_requester_older_than_ttl(self):
+        Requester.objects.create(
+            email='client@hisotech.com',
+            zendesk_user_id='2',
+            updated=timezone.now() - timedelta(seconds=120)
+        )
+        requesterServices = RequesterServices(ttl=60)
+
+        self.assertIsNone(requesterServices.lookup('client@hisotech.com'))
+
+    def test_lookup_should_ignore_requester_never_updated(self):
+        Requester.objects.create(
+            email='client@hisotech.com',
+            zendesk_user_id='2'
+        )
+        requesterServices = RequesterServices()
+
+        self.assertIsNone(requesterServices.lookup('client@hisotech.com'))
+
+    @patch('requesters.services.time.time')
+    def test_lookup_should_ignore_memory_entry_older_than_ttl(self, mock):
+        mock.return_value = 100.0
+        requesterServices = RequesterServices(ttl=60)
+        requesterServices.store('client@hisotech.com', {'id': 2})
+        Requester.objects.all().update(
+            updated=timezone.now() - timedelta(seconds=120)
+        )
+
+        mock.return_value = 200.0
+
+        self.assertIsNone(requesterServices.lookup('client@hisotech.com'))
+
+    def test_store_should_save_requester(self):
+        requesterServices = RequesterServices()
+
+        requesterServices.store(
+            'client@hisotech.com',
+            {'id': 2, 'organization_id': 69969}
+        )
+
+        requester = Requester.objects.get()
+        self.assertEqual(requester.email, 'client@hisotech.com')
+        self.assertEqual(requester.zendesk_user_id, '2')
+        self.assertEqual(requester.organization_id, '69969')
+        self.assertIsNotNone(requester.updated)
+
+    def test_store_should_update_existing_requester(self):
+        Requester.objects.create(
+            email='client@hisotech.com',
+            zendesk_user_id='1'
+        )
+        requesterServices = RequesterServices()
+
+        requesterServices.store('client@hisotech.com', {'id': 2})
+
+        requester = Requester.objects.get()
+        self.assertEqual(requester.zendesk_user_id, '2')
+        self.assertIsNone(requester.organization_id)
+        self.assertEqual(
+            requesterServices.lookup('client@hisotech.com')['id'],
+            '2'
+        )
+
+    def test_get_organization_name_should_return_stored_organization(self):
+        requesterServices = RequesterServices()
+        requesterServices.store_organizations([
+            {'id': 69969, 'name': 'Pronto Tools'},
+        ])
+
+        self.assertEqual(
+            requesterServices.get_organization_name('69969'),
+            'Pronto Tools'
+        )
+        self.assertIsNone(requesterServices.get_organization_name(1))
+
+    @patch('requesters.services.time.time')
+    def test_get_organization_name_should_ignore_entry_older_than_ttl(
+        self,
+        mock
+    ):
+        mock.return_value = 100.0
+        requesterServices = RequesterServices(ttl=60)
+        requesterServices.store_organizations([
+            {'id': 69969, 'name': 'Pronto Tools'},
+        ])
+
+        mock.return_value = 200.0
+
+        self.assertIsNone(requesterServices.get_organization_name(69969))
+
+    def test_get_summary_should_show_counters(self):
+        requesterServices = RequesterServices()
+        requesterServices.count('memory')
+        requesterServices.count('zendesk')
+
+        self.assertEqual(
+            requesterServices.get_summary(),
+            '1 memory hits, 0 database hits, 1 Zendesk searches'
+        )
@@ -62,22 +62,67 @@ $.ajaxSetup({
 });
 
 $("#button_edit_once_form").click(function(event){
-    var id_list = edit_once();
-    $.ajax({
-         type:"POST",
-         url:"/edit_once/",
-         data: {
-                  'id_list[]': id_list,
+    var data = {
                   'edit_tags': $('#edit_tags').val(),
                   'edit_subject': $('#edit_subject').val(),
                   'edit_due_at': $('#edit_due_at').val(),
                   'edit_assignee': $('#edit_assignee').val(),
                   'edit_requester': $('#edit_requester').val(),
-                },
-        success: location.reload()
+                  'propagate': $('#edit_propagate').is(':checked'),
+                  'board': $(this).data('board'),
+                };
+    $.extend(data, selected_tickets());
+    $.ajax({
+        type: "POST",
+        url: "/edit_once/",
+        data: data,
+        success: function() {
+            // the counts are shown on the reloaded page
+            location.reload();
+        }
+    });
+});
+
+$("#button_deactivate_tickets").click(function(event){
+    $.ajax({
+        type: "POST",
+        url: $(this).data('url'),
+        data: selected_tickets(),
+        success: function() {
+            location.reload();
+        }
+    });
+});
+
+$("#button_reactivate_tickets").click(function(event){
+    // restored tickets are created on Zendesk by the next "Create Tickets",
+    // so how many are restored is confirmed first
+    var data = selected_tickets();
+    var count = data['select_all'] ?
+        $(this).data('count') - data['excluded_ids[]'].length :
+        data['id_list[]'].length;
+    if (count <= 0 || !confirm('Restore ' + count + ' deactivated tickets?')) {
+        return;
+    }
+    $.ajax({
+        type: "POST",
+        url: $(this).data('url'),
+        data: data,
+        success: function() {
+            location.reload();
+        }
     });
 });
 
+function selected_tickets(){
+  if ($(':checkbox[name=select_all]').is(':checked')) {
+    // the server selects the tickets of the board, only the ones
+    // left out are sent
+    return {'select_all': true, 'excluded_ids[]': excluded_ids()};
+  }
+  return {'id_list[]': edit_once()};
+}
+
 function edit_once(){
   items = $(':checkbox[name="check"]:checked');
   var id_list = [];
@@ -86,3 +131,12 @@ function edit_once(){
   }
   return id_list;
 }
+
+function excluded_ids(){
+  items = $(':checkbox[name="check"]:not(:checked)');
+  var id_list = [];
+  for(i = 0; i<items.length; i++){
+    id_list.push(items[i].value);
+  }
+  return id_list;
+}
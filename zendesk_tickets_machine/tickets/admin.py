@@ -1,16 +1,115 @@
+import csv
+import io
+
 from django.contrib import admin
+from django.http import StreamingHttpResponse
 
 from import_export import resources
 from import_export.admin import ExportMixin
+from import_export.formats.base_formats import CSV
+from import_export.forms import ExportForm
+from import_export.signals import post_export
 
 from .models import (
     Ticket,
-    TicketZendeskAPIUsage
+    TicketZendeskAPIUsage,
+    TicketZendeskAPIUsageRollup
 )
 
 
+class StreamingExportMixin(ExportMixin):
+    # CSV exports are written row by row from a server-side cursor while
+    # the response is sent, so memory stays flat however many rows there
+    # are. Other formats are still built in memory by ExportMixin.
+    rows_per_chunk = 500
+
+    def export_action(self, request, *args, **kwargs):
+        formats = self.get_export_formats()
+        form = ExportForm(formats, request.POST or None)
+        if form.is_valid():
+            file_format = formats[int(form.cleaned_data['file_format'])]()
+            if isinstance(file_format, CSV):
+                return self.stream_csv(request, file_format)
+
+        return super(StreamingExportMixin, self).export_action(
+            request,
+            *args,
+            **kwargs
+        )
+
+    def stream_csv(self, request, file_format):
+        resource = self.get_export_resource_class()(
+            **self.get_export_resource_kwargs(request)
+        )
+        queryset = self.get_export_queryset(request)
+
+        response = StreamingHttpResponse(
+            self.generate_csv(resource, queryset),
+            content_type=file_format.get_content_type()
+        )
+        response['Content-Disposition'] = 'attachment; filename=%s' % (
+            self.get_export_filename(file_format),
+        )
+
+        post_export.send(sender=None, model=self.model)
+        return response
+
+    def generate_csv(self, resource, queryset):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(resource.get_export_headers())
+
+        for number, each in enumerate(queryset.iterator(), 1):
+            writer.writerow(resource.export_resource(each))
+            if number % self.rows_per_chunk == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        yield buffer.getvalue()
+
+
+class TicketResource(resources.ModelResource):
+    class Meta:
+        model = Ticket
+        fields = (
+            'id',
+            'subject',
+            'comment',
+            'organization',
+            'requester',
+            'assignee__name',
+            'group__name',
+            'ticket_type',
+            'due_at',
+            'priority',
+            'tags',
+            'private_comment',
+            'zendesk_ticket_id',
+            'board__name',
+            'is_active',
+        )
+        export_order = (
+            'id',
+            'subject',
+            'comment',
+            'organization',
+            'requester',
+            'assignee__name',
+            'group__name',
+            'ticket_type',
+            'due_at',
+            'priority',
+            'tags',
+            'private_comment',
+            'zendesk_ticket_id',
+            'board__name',
+            'is_active',
+        )
+
+
 @admin.register(Ticket)
-class TicketAdmin(admin.ModelAdmin):
+class TicketAdmin(StreamingExportMixin, admin.ModelAdmin):
     list_display = (
         'subject',
         'comment',
@@ -28,6 +127,12 @@ class TicketAdmin(admin.ModelAdmin):
         'board__name',
         'is_active',
     )
+    list_select_related = (
+        'assignee',
+        'group',
+        'board',
+    )
+    resource_class = TicketResource
 
 
 class TicketZendeskAPIUsageResource(resources.ModelResource):
@@ -52,7 +157,7 @@ class TicketZendeskAPIUsageResource(resources.ModelResource):
 
 
 @admin.register(TicketZendeskAPIUsage)
-class TicketZendeskAPIUsageAdmin(ExportMixin, admin.ModelAdmin):
+class TicketZendeskAPIUsageAdmin(StreamingExportMixin, admin.ModelAdmin):
     list_display = (
         'assignee',
         'ticket_type',
@@ -60,4 +165,53 @@ class TicketZendeskAPIUsageAdmin(ExportMixin, admin.ModelAdmin):
         'board',
         'created',
     )
+    list_select_related = (
+        'assignee',
+        'board',
+    )
     resource_class = TicketZendeskAPIUsageResource
+
+
+class TicketZendeskAPIUsageRollupResource(resources.ModelResource):
+    class Meta:
+        model = TicketZendeskAPIUsageRollup
+        fields = (
+            'date',
+            'board__name',
+            'assignee__name',
+            'ticket_type',
+            'priority',
+            'count',
+        )
+        export_order = (
+            'date',
+            'board__name',
+            'assignee__name',
+            'ticket_type',
+            'priority',
+            'count',
+        )
+
+
+@admin.register(TicketZendeskAPIUsageRollup)
+class TicketZendeskAPIUsageRollupAdmin(
+    StreamingExportMixin,
+    admin.ModelAdmin
+):
+    list_display = (
+        'date',
+        'board',
+        'assignee',
+        'ticket_type',
+        'priority',
+        'count',
+    )
+    list_filter = (
+        'date',
+        'board__name',
+    )
+    list_select_related = (
+        'board',
+        'assignee',
+    )
+    resource_class = TicketZendeskAPIUsageRollupResource
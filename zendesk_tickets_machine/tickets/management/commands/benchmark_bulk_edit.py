@@ -0,0 +1,109 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from agents.models import Agent
+from tickets.models import Ticket
+from tickets.services import TicketServices
+from zendesk.benchmark import create_benchmark_board
+
+
+# In the order of the edit_ticket_once arguments after the id list.
+EDIT_VALUES = (
+    'benchmark edited',
+    'edited@hisotech.com',
+    'Edited Subject',
+    '01/31/2017',
+)
+
+
+class Command(BaseCommand):
+    help = 'Measure bulk editing of tickets with one UPDATE against one ' \
+        'UPDATE per edited field, over large id lists'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default='100,1000,10000',
+            help='Comma separated number of tickets to edit at once'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Runs of each size, the fastest one is reported'
+        )
+
+    def handle(self, *args, **options):
+        sizes = [int(each) for each in options['sizes'].split(',')]
+
+        for size in sizes:
+            with transaction.atomic():
+                agent, id_list = self.create_board(size)
+                single = self.measure(
+                    self.edit_at_once,
+                    agent,
+                    id_list,
+                    options['repeat']
+                )
+                per_field = self.measure(
+                    self.edit_per_field,
+                    agent,
+                    id_list,
+                    options['repeat']
+                )
+                transaction.set_rollback(True)
+
+            self.stdout.write(
+                f'{size} tickets: one statement {single[0]:.3f}s '
+                f'({single[1]} queries), per field {per_field[0]:.3f}s '
+                f'({per_field[1]} queries)'
+            )
+
+    def create_board(self, tickets):
+        board = create_benchmark_board(
+            f'Benchmark Bulk Edit {tickets}',
+            tickets
+        )
+        # The edits assign the tickets to another agent.
+        agent = Agent.objects.create(
+            name='Benchmark Editor',
+            zendesk_user_id='2'
+        )
+        id_list = Ticket.objects.filter(board=board).values_list(
+            'id',
+            flat=True
+        )
+
+        # The endpoint receives the ids as strings from the form.
+        return agent, [str(each) for each in id_list]
+
+    def measure(self, edit, agent, id_list, repeat):
+        best = None
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                edit(agent, id_list)
+                elapsed = time.perf_counter() - started
+
+            if best is None or elapsed < best:
+                best = elapsed
+
+        return best, len(queries)
+
+    def edit_at_once(self, agent, id_list):
+        TicketServices().edit_ticket_once(id_list, *EDIT_VALUES, agent.id)
+
+    def edit_per_field(self, agent, id_list):
+        # How the edit ran before, one UPDATE for each field.
+        values = EDIT_VALUES + (agent.id,)
+        for number in range(len(values)):
+            TicketServices().edit_ticket_once(
+                id_list,
+                *[
+                    value if number == each else None
+                    for each, value in enumerate(values)
+                ]
+            )
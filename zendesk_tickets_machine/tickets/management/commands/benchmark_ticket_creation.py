@@ -0,0 +1,106 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+
+from requesters.models import Requester
+from requesters.services import organization_cache, requester_cache
+from tickets.models import Ticket
+from tickets.services import ZendeskTicketServices
+from zendesk.benchmark import (
+    create_benchmark_board,
+    create_unlimited_rate_limiter,
+)
+from zendesk.fake import FakeZendeskServer
+
+
+class Command(BaseCommand):
+    help = 'Compare sequential and concurrent ticket creation against a ' \
+        'local fake Zendesk server with added latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tickets',
+            type=int,
+            default=500,
+            help='Number of tickets on the benchmark board'
+        )
+        parser.add_argument(
+            '--requesters',
+            type=int,
+            default=None,
+            help='Number of distinct requesters, one per ticket by default'
+        )
+        parser.add_argument(
+            '--latency',
+            type=float,
+            default=0.05,
+            help='Seconds the fake server waits before each response'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=None,
+            help='Requests in flight for the concurrent run'
+        )
+
+    def handle(self, *args, **options):
+        server = FakeZendeskServer(latency=options['latency']).start()
+        try:
+            with override_settings(ZENDESK_API_URL=server.url):
+                with transaction.atomic():
+                    board = create_benchmark_board(
+                        'Benchmark Ticket Creation',
+                        options['tickets'],
+                        options['requesters']
+                    )
+                    # Sequential is the same pipeline with one request in
+                    # flight at a time.
+                    self.run(
+                        'sequential',
+                        server,
+                        board,
+                        ZendeskTicketServices(
+                            concurrency=1,
+                            rate_limiter=create_unlimited_rate_limiter()
+                        )
+                    )
+                    self.run(
+                        'concurrent',
+                        server,
+                        board,
+                        ZendeskTicketServices(
+                            concurrency=options['concurrency'],
+                            rate_limiter=create_unlimited_rate_limiter()
+                        )
+                    )
+                    transaction.set_rollback(True)
+        finally:
+            server.stop()
+
+    def run(self, mode, server, board, zendeskTicketServices):
+        tickets = Ticket.objects.filter(board=board)
+        tickets.update(zendesk_ticket_id=None)
+        Requester.objects.filter(
+            email__in=tickets.values('requester')
+        ).delete()
+        requester_cache.clear()
+        organization_cache.clear()
+        # Forget the tickets of the previous run, or they would all be
+        # reconciled by external_id instead of created.
+        server.reset()
+
+        started = time.perf_counter()
+        zendeskTicketServices.create_tickets(board.slug)
+        elapsed = time.perf_counter() - started
+
+        created = Ticket.objects.filter(
+            board=board,
+            zendesk_ticket_id__isnull=False
+        ).count()
+        self.stdout.write(
+            f'{mode}: {created} tickets, {server.requests} requests, '
+            f'{elapsed:.3f}s ('
+            f'{zendeskTicketServices.requesterServices.get_summary()})'
+        )
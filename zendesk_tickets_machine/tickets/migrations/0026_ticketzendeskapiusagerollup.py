@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11a1 on 2026-10-18 17:05
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+import django.db.models.deletion
+
+
+def backfill_rollups(apps, schema_editor):
+    TicketZendeskAPIUsage = apps.get_model('tickets', 'TicketZendeskAPIUsage')
+    TicketZendeskAPIUsageRollup = apps.get_model(
+        'tickets',
+        'TicketZendeskAPIUsageRollup'
+    )
+
+    rollups = TicketZendeskAPIUsage.objects.annotate(
+        date=TruncDate('created')
+    ).values(
+        'date',
+        'board_id',
+        'assignee_id',
+        'ticket_type',
+        'priority'
+    ).annotate(
+        count=Count('id')
+    ).order_by()
+    TicketZendeskAPIUsageRollup.objects.bulk_create(
+        [TicketZendeskAPIUsageRollup(**each) for each in rollups],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agents', '0001_initial'),
+        ('boards', '0002_auto_20170103_1313'),
+        ('tickets', '0025_ticket_organization'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketZendeskAPIUsageRollup',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('ticket_type', models.CharField(max_length=50)),
+                ('priority', models.CharField(max_length=50)),
+                ('count', models.IntegerField(default=0)),
+                ('assignee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='agents.Agent')),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='boards.Board')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='ticketzendeskapiusagerollup',
+            unique_together=set([('date', 'board', 'assignee', 'ticket_type', 'priority')]),
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11a1 on 2026-10-18 17:22
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0026_ticketzendeskapiusagerollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['board', 'is_active', 'id'], name='ticket_board_active_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['board', 'is_active', 'requester', 'id'], name='ticket_board_requester_idx'),
+        ),
+        # Tickets still to be created on Zendesk, the only ones the create
+        # job reads.
+        migrations.RunSQL(
+            'CREATE INDEX ticket_board_pending_idx '
+            'ON tickets_ticket (board_id, id) '
+            'WHERE is_active AND zendesk_ticket_id IS NULL',
+            'DROP INDEX ticket_board_pending_idx',
+        ),
+        # Matches the COALESCE boards order the nullable organization by.
+        migrations.RunSQL(
+            'CREATE INDEX ticket_board_organization_idx '
+            'ON tickets_ticket '
+            "(board_id, is_active, COALESCE(organization, ''), id)",
+            'DROP INDEX ticket_board_organization_idx',
+        ),
+    ]
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-from django.db import models
-from django.db.models.signals import pre_save
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+from django.db import connection, models, transaction
+from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
+from django.utils import timezone
 
 from agents.models import Agent
 from agent_groups.models import AgentGroup
@@ -62,20 +67,75 @@ class Ticket(models.Model):
     board = models.ForeignKey(Board)
     is_active = models.BooleanField(default=True)
 
+    class Meta:
+        # Boards list their active tickets by id or by requester. The
+        # pending tickets and the ordering by organization, which is
+        # nullable, use partial and expression indexes created in
+        # migration 0027.
+        indexes = [
+            models.Index(
+                fields=['board', 'is_active', 'id'],
+                name='ticket_board_active_id_idx'
+            ),
+            models.Index(
+                fields=['board', 'is_active', 'requester', 'id'],
+                name='ticket_board_requester_idx'
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        ticket = super(Ticket, cls).from_db(db, field_names, values)
+        ticket.track_zendesk_ticket_id()
+        return ticket
+
+    def track_zendesk_ticket_id(self):
+        # Remember the stored zendesk_ticket_id, so saving can tell that
+        # the ticket was just created on Zendesk without reading the row
+        # again. Nothing is remembered when the field was deferred.
+        if 'zendesk_ticket_id' in self.__dict__:
+            self._stored_zendesk_ticket_id = self.zendesk_ticket_id
+
+    def get_stored_zendesk_ticket_id(self):
+        if hasattr(self, '_stored_zendesk_ticket_id'):
+            return self._stored_zendesk_ticket_id
+
+        if self.pk is None:
+            return None
+
+        return Ticket.objects.filter(pk=self.pk).values_list(
+            'zendesk_ticket_id',
+            flat=True
+        ).first()
+
 
 @receiver(pre_save, sender=Ticket)
 def create_zendesk_api_usage(sender, instance, **kwargs):
-    try:
-        current_ticket = Ticket.objects.get(id=instance.id)
-        if not current_ticket.zendesk_ticket_id and instance.zendesk_ticket_id:
-            TicketZendeskAPIUsage.objects.create(
-                ticket_type=instance.ticket_type,
-                priority=instance.priority,
-                assignee=instance.assignee,
-                board=instance.board
-            )
-    except:
-        pass
+    if not instance.zendesk_ticket_id or instance.pk is None:
+        return
+
+    # Usage rows are per assignee, so tickets without one are not counted.
+    if instance.assignee_id is None:
+        return
+
+    if not instance.get_stored_zendesk_ticket_id():
+        usage = TicketZendeskAPIUsage(
+            ticket_type=instance.ticket_type or '',
+            priority=instance.priority,
+            assignee_id=instance.assignee_id,
+            board_id=instance.board_id
+        )
+
+        buffered = getattr(_usage_buffer, 'usages', None)
+        if buffered is None:
+            record_zendesk_api_usage([usage])
+        else:
+            buffered.append(usage)
+
+
+@receiver(post_save, sender=Ticket)
+def track_zendesk_ticket_id(sender, instance, **kwargs):
+    instance.track_zendesk_ticket_id()
 
 
 class TicketZendeskAPIUsage(models.Model):
@@ -84,3 +144,76 @@ class TicketZendeskAPIUsage(models.Model):
     assignee = models.ForeignKey(Agent)
     board = models.ForeignKey(Board)
     created = models.DateTimeField(auto_now_add=True)
+
+
+class TicketZendeskAPIUsageRollup(models.Model):
+    # Daily usage counts, kept up to date as usage is recorded, so reports
+    # read a row per day and combination instead of every usage row.
+    date = models.DateField()
+    board = models.ForeignKey(Board)
+    assignee = models.ForeignKey(Agent)
+    ticket_type = models.CharField(max_length=50)
+    priority = models.CharField(max_length=50)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = (
+            'date',
+            'board',
+            'assignee',
+            'ticket_type',
+            'priority',
+        )
+
+
+_usage_buffer = threading.local()
+
+
+@contextmanager
+def buffer_zendesk_api_usage():
+    # Usage of the tickets saved inside the block is written when it
+    # exits, with one INSERT for all rows and one for the rollups.
+    if getattr(_usage_buffer, 'usages', None) is not None:
+        yield
+        return
+
+    _usage_buffer.usages = []
+    try:
+        yield
+    finally:
+        usages = _usage_buffer.usages
+        _usage_buffer.usages = None
+        record_zendesk_api_usage(usages)
+
+
+def record_zendesk_api_usage(usages):
+    if not usages:
+        return
+
+    with transaction.atomic():
+        TicketZendeskAPIUsage.objects.bulk_create(usages)
+
+        counts = Counter(
+            (
+                timezone.localdate(each.created),
+                each.board_id,
+                each.assignee_id,
+                each.ticket_type,
+                each.priority,
+            )
+            for each in usages
+        )
+        # Rows are upserted in a fixed order, so concurrent workers lock
+        # the rollups they share in the same order and cannot deadlock.
+        rows = [key + (count,) for key, count in sorted(counts.items())]
+        values = ', '.join(['(%s, %s, %s, %s, %s, %s)'] * len(rows))
+        table = TicketZendeskAPIUsageRollup._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {table} '
+                '(date, board_id, assignee_id, ticket_type, priority, count) '
+                f'VALUES {values} ON CONFLICT '
+                '(date, board_id, assignee_id, ticket_type, priority) '
+                f'DO UPDATE SET count = {table}.count + EXCLUDED.count',
+                [value for row in rows for value in row]
+            )
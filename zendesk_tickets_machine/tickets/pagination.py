@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+import base64
+import binascii
+import json
+
+from django.db.models import F, Q, Value
+from django.db.models.functions import Coalesce
+
+
+class KeysetPage(object):
+    def __init__(self, object_list, has_next, has_previous, encode):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.encode = encode
+
+    @property
+    def next_cursor(self):
+        if self.has_next and self.object_list:
+            return self.encode(self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if self.has_previous and self.object_list:
+            return self.encode(self.object_list[0])
+
+
+class KeysetPaginator(object):
+    # Pages through a queryset by seeking past the last row shown instead
+    # of using OFFSET, so a page deep into a large board costs the same as
+    # the first one. Rows are ordered by id, or by a text field with the
+    # id breaking ties. NULLs of a nullable field sort as empty strings so
+    # the seek condition can compare them.
+    def __init__(self, queryset, per_page, order_by=None):
+        self.per_page = per_page
+        self.field = None
+        self.descending = False
+        if order_by:
+            self.descending = order_by.startswith('-')
+            self.field = order_by.lstrip('-')
+            value = F(self.field)
+            if queryset.model._meta.get_field(self.field).null:
+                value = Coalesce(value, Value(''))
+            queryset = queryset.annotate(keyset_value=value)
+        self.queryset = queryset
+
+    def get_keys(self):
+        if self.field:
+            return ('keyset_value', 'id')
+        return ('id',)
+
+    def encode(self, obj):
+        if not self.field:
+            return str(obj.id)
+
+        value = json.dumps([obj.keyset_value, obj.id]).encode()
+        return base64.urlsafe_b64encode(value).decode()
+
+    def decode(self, cursor):
+        # A cursor that cannot be read starts again from the first page.
+        try:
+            if not self.field:
+                return [int(cursor)]
+
+            value, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return [str(value), int(pk)]
+        except (binascii.Error, TypeError, ValueError):
+            return None
+
+    def seek(self, queryset, values, forward):
+        lookup = 'gt' if forward != self.descending else 'lt'
+        if not self.field:
+            return queryset.filter(**{f'id__{lookup}': values[0]})
+
+        value, pk = values
+        return queryset.filter(
+            Q(**{f'keyset_value__{lookup}': value}) |
+            Q(keyset_value=value, **{f'id__{lookup}': pk})
+        )
+
+    def page(self, after=None, before=None):
+        cursor = before or after
+        values = self.decode(cursor) if cursor else None
+        forward = not (before and values)
+
+        queryset = self.queryset
+        if values:
+            queryset = self.seek(queryset, values, forward)
+
+        descending = self.descending != (not forward)
+        prefix = '-' if descending else ''
+        queryset = queryset.order_by(
+            *[prefix + each for each in self.get_keys()]
+        )
+
+        object_list = list(queryset[:self.per_page + 1])
+        more = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+
+        if forward:
+            return KeysetPage(object_list, more, bool(values), self.encode)
+
+        object_list.reverse()
+        return KeysetPage(object_list, bool(values), more, self.encode)
@@ -1,11 +1,107 @@
+import asyncio
 import datetime
+import logging
+import os
 
+from django.conf import settings
+from django.db import transaction
 from django.utils.timezone import utc
 
-from .models import Ticket
+from .models import Ticket, buffer_zendesk_api_usage
+from agents.models import Agent
+from requesters.services import RequesterServices
+from zendesk.api import BULK_LIMIT
+from zendesk.async_api import (
+    Organization as ZendeskOrganization,
+    Ticket as ZendeskTicket,
+    User as ZendeskRequester,
+    create_session,
+)
+
+
+logger = logging.getLogger(__name__)
 
 
 class TicketServices():
+    def get_board_tickets(self, board_slug, excluded_ids=None, is_active=True):
+        # Selects the tickets of a whole board on the server, so selecting
+        # all does not send every id from the browser.
+        tickets = Ticket.objects.filter(
+            board__slug=board_slug,
+            is_active=is_active
+        )
+        if excluded_ids:
+            tickets = tickets.exclude(pk__in=excluded_ids)
+
+        return tickets
+
+    def deactivate_tickets(self, tickets):
+        # One UPDATE instead of a save per ticket. Only the tickets still
+        # active are counted, so the count is what actually changed.
+        return tickets.filter(is_active=True).update(is_active=False)
+
+    def reactivate_tickets(self, tickets):
+        return tickets.filter(is_active=False).update(is_active=True)
+
+    def reset_zendesk_ticket_ids(self, board_slug, progress=None):
+        tickets = Ticket.objects.filter(
+            board__slug=board_slug,
+            zendesk_ticket_id__isnull=False
+        )
+
+        return self.update_in_chunks(
+            tickets,
+            {'zendesk_ticket_id': None},
+            progress=progress
+        )
+
+    def reset_requesters(self, board_slug, progress=None):
+        tickets = Ticket.objects.filter(board__slug=board_slug).exclude(
+            requester='',
+            organization=''
+        )
+
+        return self.update_in_chunks(
+            tickets,
+            {'requester': '', 'organization': ''},
+            progress=progress
+        )
+
+    def update_in_chunks(self, tickets, values, progress=None):
+        # Updates the tickets a primary key range at a time, each in its own
+        # short transaction, so a large board does not keep its rows locked
+        # from edits and creation runs until the whole board is done. The
+        # tickets are filtered to the ones still needing the change, so a
+        # range only holds rows that are actually written.
+        chunk_size = settings.BOARD_RESET_CHUNK_SIZE
+        total = tickets.count()
+        done = 0
+        last_id = 0
+
+        if progress:
+            progress(total, done)
+
+        while True:
+            ids = list(
+                tickets.filter(id__gt=last_id).order_by(
+                    'id'
+                ).values_list('id', flat=True)[:chunk_size]
+            )
+            if not ids:
+                break
+
+            with transaction.atomic():
+                done += tickets.filter(
+                    id__gte=ids[0],
+                    id__lte=ids[-1]
+                ).update(**values)
+            last_id = ids[-1]
+
+            if progress:
+                progress(total, done)
+
+        return done
+
     def edit_ticket_once(
         self,
         id_list,
@@ -15,27 +111,551 @@ class TicketServices():
         edit_due_at,
         edit_assignee
     ):
+        return self.edit_tickets(
+            Ticket.objects.filter(pk__in=id_list),
+            edit_tags,
+            edit_requester,
+            edit_subject,
+            edit_due_at,
+            edit_assignee
+        )
+
+    def edit_tickets(
+        self,
+        tickets,
+        edit_tags,
+        edit_requester,
+        edit_subject,
+        edit_due_at,
+        edit_assignee
+    ):
+        # All the edited fields are set by one UPDATE, which Postgres
+        # applies atomically, so the tickets are scanned once and nobody
+        # sees an edit half done.
+        values = {}
         if edit_tags:
-            Ticket.objects.filter(
-                pk__in=id_list
-            ).update(tags=edit_tags)
+            values['tags'] = edit_tags
         if edit_subject:
-            Ticket.objects.filter(
-                pk__in=id_list
-            ).update(subject=edit_subject)
+            values['subject'] = edit_subject
         if edit_requester:
-            Ticket.objects.filter(
-                pk__in=id_list
-            ).update(requester=edit_requester)
+            values['requester'] = edit_requester
         if edit_due_at:
-            Ticket.objects.filter(
-                pk__in=id_list
-            ).update(
-                due_at=datetime.datetime.strptime(
-                    edit_due_at, "%m/%d/%Y"
-                ).replace(tzinfo=utc)
-            )
+            values['due_at'] = self.parse_due_at(edit_due_at)
         if edit_assignee:
+            values['assignee'] = edit_assignee
+
+        if not values:
+            return 0
+
+        return tickets.update(**values)
+
+    def parse_due_at(self, edit_due_at):
+        return datetime.datetime.strptime(
+            edit_due_at, "%m/%d/%Y"
+        ).replace(tzinfo=utc)
+
+    def build_zendesk_changes(
+        self,
+        edit_tags,
+        edit_subject,
+        edit_due_at,
+        edit_assignee
+    ):
+        # The edits as Zendesk ticket fields, in the format
+        # ZendeskTicketServices.build_ticket_data creates tickets with.
+        changes = {}
+        if edit_tags:
+            changes['tags'] = [tag.strip() for tag in edit_tags.split(',')]
+        if edit_subject:
+            changes['subject'] = edit_subject
+        if edit_due_at:
+            changes['due_at'] = self.parse_due_at(edit_due_at).isoformat()
+        if edit_assignee:
+            assignee = Agent.objects.filter(pk=edit_assignee).first()
+            if assignee:
+                changes['assignee_id'] = assignee.zendesk_user_id
+
+        return changes
+
+
+class ZendeskTicketServices():
+    # Creates all batches of a board in one event loop, so lookups, bulk
+    # creation and private comments overlap across tickets, with at most
+    # `concurrency` Zendesk requests in flight at any time.
+    def __init__(self, concurrency=None, rate_limiter=None):
+        if concurrency is None:
+            concurrency = settings.ZENDESK_API_CONCURRENCY
+
+        self.concurrency = concurrency
+        self.rate_limiter = rate_limiter
+        self.requesterServices = RequesterServices()
+
+    def run_until_complete(self, coroutine):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coroutine)
+        finally:
+            loop.close()
+
+    def get_pending_tickets(
+        self,
+        board_slug,
+        ticket_ids=None,
+        excluded_ids=None
+    ):
+        tickets = Ticket.objects.filter(
+            board__slug=board_slug,
+            is_active=True,
+            zendesk_ticket_id__isnull=True
+        )
+        if ticket_ids:
+            tickets = tickets.filter(id__in=ticket_ids)
+        if excluded_ids:
+            tickets = tickets.exclude(id__in=excluded_ids)
+
+        return tickets.select_related(
+            'assignee',
+            'created_by',
+            'group'
+        ).order_by('id')
+
+    def create_tickets(
+        self,
+        board_slug,
+        ticket_ids=None,
+        progress=None,
+        excluded_ids=None
+    ):
+        return self.run_until_complete(
+            self.create_tickets_async(
+                board_slug,
+                ticket_ids,
+                progress,
+                excluded_ids
+            )
+        )
+
+    async def create_tickets_async(
+        self,
+        board_slug,
+        ticket_ids=None,
+        progress=None,
+        excluded_ids=None
+    ):
+        tickets = list(
+            self.get_pending_tickets(board_slug, ticket_ids, excluded_ids)
+        )
+        total = len(tickets)
+        done = 0
+        errors = []
+        failed = 0
+
+        if progress:
+            progress(total, done, failed, errors)
+
+        self.requester_searches = {}
+        async with create_session(self.concurrency) as session:
+            semaphore = asyncio.Semaphore(self.concurrency)
+            self.zendesk_ticket = ZendeskTicket(
+                session,
+                semaphore,
+                self.rate_limiter
+            )
+            self.zendesk_user = ZendeskRequester(
+                session,
+                semaphore,
+                self.rate_limiter
+            )
+            self.zendesk_organization = ZendeskOrganization(
+                session,
+                semaphore,
+                self.rate_limiter
+            )
+
+            def add_batch(result):
+                nonlocal done, failed
+                size, created, batch_errors = result
+                done += created
+                errors.extend(batch_errors)
+                failed += size - created
+
+                if progress:
+                    progress(total, done, failed, errors)
+
+            await self.run_batches(
+                [
+                    self.create_batch_async(
+                        tickets[offset:offset + BULK_LIMIT]
+                    )
+                    for offset in range(0, total, BULK_LIMIT)
+                ],
+                add_batch
+            )
+
+        self.log_requester_lookups(board_slug)
+
+        return errors
+
+    async def create_batch_async(self, tickets):
+        existing = self.index_by_external_id(
+            tickets,
+            await self.zendesk_ticket.search_by_external_ids([
+                self.get_external_id(each) for each in tickets
+            ])
+        )
+
+        reconciled = [
+            (each, existing[self.get_external_id(each)])
+            for each in tickets
+            if self.get_external_id(each) in existing
+        ]
+        organizations = await asyncio.gather(*[
+            self.get_organization_name_async(
+                zendesk_ticket.get('organization_id')
+            )
+            for _, zendesk_ticket in reconciled
+        ])
+        for (each, _), organization in zip(reconciled, organizations):
+            each.organization = organization
+
+        tickets = [
+            each for each in tickets
+            if self.get_external_id(each) not in existing
+        ]
+        requesters = await asyncio.gather(*[
+            self.find_requester_async(each) for each in tickets
+        ])
+        pending = [
+            (each, requester)
+            for each, requester in zip(tickets, requesters)
+            if requester
+        ]
+
+        results = []
+        if pending:
+            results = await self.zendesk_ticket.create_many([
+                self.build_ticket_data(each, requester['id'])
+                for each, requester in pending
+            ])
+
+        pending, results = self.add_reconciled(pending, results, reconciled)
+        size = len(tickets) + len(reconciled)
+        if not pending:
+            return size, 0, []
+
+        created, errors, comments = self.save_results(pending, results)
+        if comments:
+            results = await self.zendesk_ticket.add_comments([
+                data for _, data in comments
+            ])
+            errors.extend(self.build_comment_errors(comments, results))
+
+        return size, created, errors
+
+    def get_zendesk_ticket_ids(self, ticket_ids):
+        return list(
             Ticket.objects.filter(
-                pk__in=id_list
-            ).update(assignee=edit_assignee)
+                id__in=ticket_ids,
+                zendesk_ticket_id__isnull=False
+            ).order_by('id').values_list('zendesk_ticket_id', flat=True)
+        )
+
+    def update_tickets(self, ticket_ids, changes, progress=None):
+        # Applies the same changes to the Zendesk tickets of the given
+        # tickets, with one update_many job per 100 tickets.
+        return self.run_until_complete(
+            self.update_tickets_async(ticket_ids, changes, progress)
+        )
+
+    async def update_tickets_async(self, ticket_ids, changes, progress=None):
+        zendesk_ticket_ids = self.get_zendesk_ticket_ids(ticket_ids)
+        total = len(zendesk_ticket_ids)
+        done = 0
+        errors = []
+        failed = 0
+
+        if progress:
+            progress(total, done, failed, errors)
+
+        async with create_session(self.concurrency) as session:
+            semaphore = asyncio.Semaphore(self.concurrency)
+            self.zendesk_ticket = ZendeskTicket(
+                session,
+                semaphore,
+                self.rate_limiter
+            )
+
+            def add_batch(result):
+                nonlocal done, failed
+                size, batch_errors = result
+                done += size - len(batch_errors)
+                errors.extend(batch_errors)
+                failed += len(batch_errors)
+
+                if progress:
+                    progress(total, done, failed, errors)
+
+            await self.run_batches(
+                [
+                    self.update_batch_async(
+                        zendesk_ticket_ids[offset:offset + BULK_LIMIT],
+                        changes
+                    )
+                    for offset in range(0, total, BULK_LIMIT)
+                ],
+                add_batch
+            )
+
+        return errors
+
+    async def run_batches(self, batches, add_batch):
+        # Hands each batch result over as soon as it is ready. When a batch
+        # fails, the others are cancelled and waited for before the error
+        # goes up, so none is left half done once the session closes.
+        tasks = [asyncio.ensure_future(each) for each in batches]
+        try:
+            for task in asyncio.as_completed(tasks):
+                add_batch(await task)
+        finally:
+            for each in tasks:
+                each.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def update_batch_async(self, zendesk_ticket_ids, changes):
+        results = await self.zendesk_ticket.update_many(
+            self.build_ticket_changes(zendesk_ticket_ids, changes)
+        )
+
+        return (
+            len(zendesk_ticket_ids),
+            self.build_update_errors(zendesk_ticket_ids, results)
+        )
+
+    def build_ticket_changes(self, zendesk_ticket_ids, changes):
+        return [
+            dict(changes, id=zendesk_ticket_id)
+            for zendesk_ticket_id in zendesk_ticket_ids
+        ]
+
+    def build_update_errors(self, zendesk_ticket_ids, results):
+        # One message per failed ticket, joining the messages when Zendesk
+        # gave several for the same ticket.
+        errors = []
+        for result in results:
+            if not result.get('error'):
+                continue
+
+            zendesk_ticket_id = zendesk_ticket_ids[result['index']]
+            descriptions = ', '.join(
+                str(each) for each in self.get_error_descriptions(result)
+            )
+            errors.append(
+                f'Update of ticket {zendesk_ticket_id} failed, '
+                f'{result.get("error")}: {descriptions}'
+            )
+
+        return errors
+
+    def get_external_id(self, ticket):
+        return f'ztm-{ticket.board_id}-{ticket.id}'
+
+    def index_by_external_id(self, tickets, zendesk_tickets):
+        external_ids = set(self.get_external_id(each) for each in tickets)
+        return {
+            each['external_id']: each
+            for each in zendesk_tickets
+            if each.get('external_id') in external_ids
+        }
+
+    def add_reconciled(self, pending, results, reconciled):
+        # Tickets found by external_id were created by an earlier run that
+        # stopped before saving their id, so they are saved like new ones.
+        pending = list(pending)
+        results = list(results)
+        for each, zendesk_ticket in reconciled:
+            results.append({'index': len(pending), 'id': zendesk_ticket['id']})
+            pending.append((each, {}))
+
+        return pending, results
+
+    async def find_requester_async(self, ticket):
+        if ticket.requester == '':
+            return None
+
+        # Tickets of the same requester share one lookup, even while its
+        # Zendesk search is still in flight.
+        search = self.requester_searches.get(ticket.requester)
+        if search is None:
+            search = asyncio.ensure_future(
+                self.search_requester_async(ticket.requester)
+            )
+            self.requester_searches[ticket.requester] = search
+        else:
+            self.requesterServices.count('memory')
+
+        requester = await search
+        if requester is None:
+            return None
+
+        ticket.organization = await self.get_organization_name_async(
+            requester['organization_id']
+        )
+
+        return requester
+
+    async def search_requester_async(self, email):
+        requester = self.requesterServices.lookup(email)
+        if requester is not None:
+            return requester
+
+        requester_result = await self.zendesk_user.search(
+            email,
+            include='organizations'
+        )
+        users = requester_result.get('users') or []
+        if not users:
+            return None
+
+        requester = users[0]
+        self.requesterServices.store(email, requester)
+        self.requesterServices.store_organizations(
+            requester_result.get('organizations') or []
+        )
+
+        return requester
+
+    async def get_organization_name_async(self, organization_id):
+        if organization_id is None:
+            return None
+
+        name = self.requesterServices.get_organization_name(organization_id)
+        if name is None:
+            organization_result = await self.zendesk_organization.show(
+                organization_id
+            )
+            organization = organization_result.get('organization')
+            if not organization:
+                return None
+
+            self.requesterServices.store_organizations([organization])
+            name = organization['name']
+
+        return name
+
+    def save_results(self, pending, results):
+        created = 0
+        errors = []
+        comments = []
+        # Usage rows of the whole batch are written together at the end.
+        with buffer_zendesk_api_usage():
+            for result in results:
+                each, requester = pending[result['index']]
+
+                zendesk_ticket_id = result.get('id')
+                if not zendesk_ticket_id:
+                    requester_email = requester.get('email', each.requester)
+                    errors.extend(
+                        self.build_error_messages(result, requester_email)
+                    )
+                    continue
+
+                # Only the fields set here are written, the ticket was read
+                # when the job started and may have been edited since.
+                each.zendesk_ticket_id = zendesk_ticket_id
+                each.save(update_fields=['zendesk_ticket_id', 'organization'])
+                created += 1
+
+                if not each.private_comment:
+                    continue
+
+                # Private comments are added with one update_many job per 100
+                # tickets instead of one PUT per ticket, see add_comments.
+                data = {
+                    'id': zendesk_ticket_id,
+                    'comment': {
+                        'author_id': self.get_assignee_id(each),
+                        'body': each.private_comment,
+                        'public': False
+                    }
+                }
+                requester_email = requester.get('email', each.requester)
+                comments.append((requester_email, data))
+
+        return created, errors, comments
+
+    def build_comment_errors(self, comments, results):
+        errors = []
+        for result in results:
+            if not result.get('error'):
+                continue
+
+            requester_email, data = comments[result['index']]
+            errors.extend([
+                f'Private comment on ticket {data["id"]} failed, {message}'
+                for message in self.build_error_messages(
+                    result,
+                    requester_email
+                )
+            ])
+
+        return errors
+
+    def log_requester_lookups(self, board_slug):
+        logger.info(
+            'Requester lookups for %s: %s',
+            board_slug,
+            self.requesterServices.get_summary()
+        )
+
+    def get_assignee_id(self, ticket):
+        if ticket.assignee:
+            return ticket.assignee.zendesk_user_id
+
+        return os.environ.get('DEFAULT_ZENDESK_USER_ID', 0)
+
+    def build_ticket_data(self, ticket, requester_id):
+        assignee_id = self.get_assignee_id(ticket)
+
+        if ticket.due_at is not None:
+            due_at = ticket.due_at.isoformat()
+        else:
+            due_at = ''
+
+        if ticket.created_by:
+            created_by = ticket.created_by.zendesk_user_id
+        else:
+            created_by = assignee_id
+
+        return {
+            'external_id': self.get_external_id(ticket),
+            'subject': ticket.subject,
+            'comment': {
+                'body': ticket.comment,
+                'author_id': created_by
+            },
+            'requester_id': requester_id,
+            'assignee_id': assignee_id,
+            'group_id': ticket.group.zendesk_group_id,
+            'type': ticket.ticket_type,
+            'due_at': due_at,
+            'priority': ticket.priority,
+            'tags': [tag.strip() for tag in ticket.tags.split(',')]
+        }
+
+    def get_error_descriptions(self, result):
+        details = result.get('details')
+        if isinstance(details, dict):
+            return [
+                each.get('description')
+                for field in details.values()
+                for each in field
+            ]
+
+        return [details or result.get('description')]
+
+    def build_error_messages(self, result, requester_email):
+        result_error = result.get('error')
+        return [
+            f'{result_error}: {description} ({requester_email})'
+            for description in self.get_error_descriptions(result)
+        ]
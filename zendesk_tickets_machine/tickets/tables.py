@@ -1,20 +1,68 @@
 # -*- coding: utf-8 -*-
 from django.conf import settings
+from django.core.urlresolvers import reverse
+from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 
 import django_tables2 as tables
+from django_tables2.tables import TableData
 
 from .models import Ticket
 
 
-TEMPLATE = '<a href="{% url "ticket_edit" record.id %}" ' \
-    'class="tbl_icon edit"><i class="fa fa-pencil modal-button" ' \
+MANAGE_TEMPLATE = '<a href="{}" class="tbl_icon edit">' \
+    '<i class="fa fa-pencil modal-button" ' \
     'data-target="#modal-edit-ticket"></i></a>&nbsp;' \
-    '<a href="{% url "ticket_delete" record.id %}" ' \
-    'class="tbl_icon_delete"><i class="fa fa-trash-o"></i></a>'
+    '<a href="{}" class="tbl_icon_delete"><i class="fa fa-trash-o"></i></a>'
+
+# Stands in for the ticket id, so the manage URLs are reversed once per
+# table instead of twice per row.
+URL_PLACEHOLDER_ID = 999999999
+
+# The columns TicketTable renders, so boards load only those and the
+# related names in the same query.
+TICKET_TABLE_FIELDS = (
+    'id',
+    'subject',
+    'comment',
+    'organization',
+    'requester',
+    'created_by__name',
+    'assignee__name',
+    'group__name',
+    'ticket_type',
+    'due_at',
+    'priority',
+    'tags',
+    'private_comment',
+    'zendesk_ticket_id',
+)
+TICKET_TABLE_RELATED = (
+    'created_by',
+    'assignee',
+    'group',
+)
+
+
+# The columns a board can be ordered by, besides the ticket id.
+TICKET_TABLE_ORDERABLE = (
+    'organization',
+    'requester',
+)
+
+
+class TicketTableData(TableData):
+    # A board page is a list of tickets already ordered by the database.
+    # Sorting it again in Python would not follow the database collation,
+    # so only querysets are ordered here.
+    def order_by(self, aliases):
+        if hasattr(self, 'queryset'):
+            super().order_by(aliases)
 
 
 class TicketTable(tables.Table):
+    TableDataClass = TicketTableData
+
     check = tables.CheckBoxColumn(
         verbose_name=('Edit'),
         accessor='pk',
@@ -43,7 +91,7 @@ class TicketTable(tables.Table):
     tags = tables.Column(default='-', orderable=False)
     private_comment = tables.Column(default='-', orderable=False)
     zendesk_ticket_id = tables.Column(default='-', orderable=False)
-    manage = tables.TemplateColumn(TEMPLATE, orderable=False)
+    manage = tables.Column(empty_values=(), orderable=False)
 
     class Meta:
         model = Ticket
@@ -51,6 +99,22 @@ class TicketTable(tables.Table):
         exclude = ('id', 'board', 'is_active')
         attrs = {'class': 'table table-hover table-zendesk-tickets'}
 
+    def render_manage(self, record):
+        if not hasattr(self, 'manage_urls'):
+            self.manage_urls = [
+                reverse(name, kwargs={'ticket_id': URL_PLACEHOLDER_ID})
+                for name in ('ticket_edit', 'ticket_delete')
+            ]
+
+        ticket_id = str(record.id)
+        return format_html(
+            MANAGE_TEMPLATE,
+            *[
+                each.replace(str(URL_PLACEHOLDER_ID), ticket_id, 1)
+                for each in self.manage_urls
+            ]
+        )
+
     def render_zendesk_ticket_id(self, value):
         url = '<a href="%s/agent/tickets/%s" target="_blank">%s</a>' \
             % (settings.ZENDESK_URL, value, value)
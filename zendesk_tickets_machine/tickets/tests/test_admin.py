@@ -1,9 +1,17 @@
+import datetime
+from unittest.mock import patch
+
 from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from ..admin import TicketAdmin
 
 from ..models import (
     Ticket,
-    TicketZendeskAPIUsage
+    TicketZendeskAPIUsage,
+    TicketZendeskAPIUsageRollup
 )
 from agents.models import Agent
 from agent_groups.models import AgentGroup
@@ -89,6 +97,102 @@ class TicketAdminTest(TestCase):
         self.assertContains(response, expected, count=1, status_code=200)
 
 
+class TicketExportTest(TestCase):
+    def setUp(self):
+        User.objects.create_superuser('admin', 'admin@pronto.com', 'admin')
+        self.client.login(username='admin', password='admin')
+
+        self.url = '/admin/tickets/ticket/export/'
+
+        self.agent = Agent.objects.create(name='Kan', zendesk_user_id='123')
+        self.agent_group = AgentGroup.objects.create(
+            name='Development',
+            zendesk_group_id='123'
+        )
+        self.board = Board.objects.create(name='Pre-Production')
+
+    def create_ticket(self, subject):
+        return Ticket.objects.create(
+            subject=subject,
+            comment='Comment',
+            requester='client@hisotech.com',
+            assignee=self.agent,
+            group=self.agent_group,
+            priority='high',
+            board=self.board
+        )
+
+    def test_ticket_admin_should_have_export_button(self):
+        response = self.client.get('/admin/tickets/ticket/')
+
+        expected = '<a href="' + self.url + '?" class="export_link">Export</a>'
+        self.assertContains(response, expected, count=1, status_code=200)
+
+    def test_ticket_admin_should_stream_csv_export(self):
+        ticket = self.create_ticket('Welcome')
+
+        response = self.client.post(self.url, {'file_format': '0'})
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertTrue(response.has_header('Content-Disposition'))
+
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(
+            lines[0],
+            'id,subject,comment,organization,requester,assignee__name,'
+            'group__name,ticket_type,due_at,priority,tags,private_comment,'
+            'zendesk_ticket_id,board__name,is_active'
+        )
+        self.assertEqual(
+            lines[1],
+            f'{ticket.id},Welcome,Comment,,client@hisotech.com,Kan,'
+            'Development,,,high,,,,Pre-Production,1'
+        )
+
+    def test_csv_export_should_not_query_related_objects_per_row(self):
+        self.create_ticket('First')
+        with CaptureQueriesContext(connection) as one_ticket:
+            b''.join(
+                self.client.post(
+                    self.url,
+                    {'file_format': '0'}
+                ).streaming_content
+            )
+
+        for number in range(5):
+            self.create_ticket(f'Ticket {number}')
+        with CaptureQueriesContext(connection) as six_tickets:
+            content = b''.join(
+                self.client.post(
+                    self.url,
+                    {'file_format': '0'}
+                ).streaming_content
+            )
+
+        self.assertEqual(len(content.splitlines()), 7)
+        self.assertEqual(len(six_tickets), len(one_ticket))
+
+    def test_csv_export_should_be_written_in_chunks(self):
+        for number in range(3):
+            self.create_ticket(f'Ticket {number}')
+
+        with patch.object(TicketAdmin, 'rows_per_chunk', 2):
+            response = self.client.post(self.url, {'file_format': '0'})
+            chunks = list(response.streaming_content)
+
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(chunks[0].decode().count('\r\n'), 3)
+
+    def test_other_formats_should_still_be_exported(self):
+        self.create_ticket('Welcome')
+
+        response = self.client.post(self.url, {'file_format': '2'})
+
+        self.assertFalse(response.streaming)
+        self.assertEqual(response.status_code, 200)
+
+
 class TicketZendeskAPIUsageAdminTest(TestCase):
     def setUp(self):
         User.objects.create_superuser('admin', 'admin@pronto.com', 'admin')
@@ -160,9 +264,51 @@ class TicketZendeskAPIUsageExportTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTrue(response.has_header('Content-Disposition'))
         self.assertEqual(response['Content-Type'], 'text/csv')
+        content = b''.join(response.streaming_content).decode()
 
         expected = 'id,ticket_type,priority,assignee__name,board__name,created'
-        self.assertContains(response, expected, count=1, status_code=200)
+        self.assertEqual(content.count(expected), 1)
 
         expected = f'{ticket_api_usage.id},question,high,Kan,Pre-Production'
+        self.assertEqual(content.count(expected), 1)
+
+
+class TicketZendeskAPIUsageRollupExportTest(TestCase):
+    def setUp(self):
+        User.objects.create_superuser('admin', 'admin@pronto.com', 'admin')
+        self.client.login(username='admin', password='admin')
+
+        self.url = '/admin/tickets/ticketzendeskapiusagerollup/'
+
+    def test_access_rollup_admin_should_have_export_button(self):
+        response = self.client.get(self.url)
+
+        expected = '<a href="' + self.url + 'export/?" ' \
+            'class="export_link">Export</a>'
         self.assertContains(response, expected, count=1, status_code=200)
+
+    def test_rollup_admin_should_be_able_to_export_csv(self):
+        agent = Agent.objects.create(name='Kan', zendesk_user_id='123')
+        board = Board.objects.create(name='Pre-Production')
+        TicketZendeskAPIUsageRollup.objects.create(
+            date=datetime.date(2017, 8, 3),
+            board=board,
+            assignee=agent,
+            ticket_type='question',
+            priority='high',
+            count=42
+        )
+
+        response = self.client.post(
+            self.url + 'export/',
+            {'file_format': '0'}
+        )
+
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        content = b''.join(response.streaming_content).decode()
+
+        expected = 'date,board__name,assignee__name,ticket_type,priority,count'
+        self.assertEqual(content.count(expected), 1)
+
+        expected = '2017-08-03,Pre-Production,Kan,question,high,42'
+        self.assertEqual(content.count(expected), 1)
@@ -0,0 +1,61 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from ..models import Ticket
+
+
+class BenchmarkTicketCreationCommandTest(TestCase):
+    def test_benchmark_should_create_all_tickets_in_both_modes(self):
+        out = StringIO()
+
+        call_command(
+            'benchmark_ticket_creation',
+            tickets=5,
+            latency=0,
+            stdout=out
+        )
+
+        output = out.getvalue()
+        self.assertIn('sequential: 5 tickets, 10 requests', output)
+        self.assertIn('concurrent: 5 tickets, 10 requests', output)
+        self.assertEqual(Ticket.objects.count(), 0)
+
+    def test_benchmark_should_search_each_requester_once(self):
+        out = StringIO()
+
+        call_command(
+            'benchmark_ticket_creation',
+            tickets=5,
+            requesters=2,
+            latency=0,
+            stdout=out
+        )
+
+        output = out.getvalue()
+        self.assertIn('sequential: 5 tickets, 7 requests', output)
+        self.assertIn('concurrent: 5 tickets, 7 requests', output)
+        self.assertIn(
+            '3 memory hits, 0 database hits, 2 Zendesk searches',
+            output
+        )
+
+
+class BenchmarkBulkEditCommandTest(TestCase):
+    def test_benchmark_should_report_queries_of_each_size(self):
+        out = StringIO()
+
+        call_command(
+            'benchmark_bulk_edit',
+            sizes='2,5',
+            repeat=1,
+            stdout=out
+        )
+
+        output = out.getvalue()
+        self.assertIn('2 tickets: one statement', output)
+        self.assertIn('(1 queries), per field', output)
+        self.assertIn('(5 queries)', output)
+        self.assertIn('5 tickets: one statement', output)
+        self.assertEqual(Ticket.objects.count(), 0)
@@ -0,0 +1,87 @@
+from django.db import connection
+from django.test import TestCase
+
+from ..models import Ticket
+from ..pagination import KeysetPaginator
+from ..services import ZendeskTicketServices
+from agent_groups.models import AgentGroup
+from boards.models import Board
+from boards.views import BoardSingleView
+
+
+class TicketIndexTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Many boards, so a board is a small share of the tickets as in
+        # production and reading it through the board indexes pays off.
+        agent_group = AgentGroup.objects.create(name='Development')
+        boards = Board.objects.bulk_create([
+            Board(
+                name=f'Pre-Production {number}',
+                slug=f'pre-production-{number}'
+            )
+            for number in range(200)
+        ])
+        cls.board = boards[0]
+        Ticket.objects.bulk_create([
+            Ticket(
+                subject=f'Ticket {number}',
+                comment='Comment',
+                requester=f'client{number}@hisotech.com',
+                group=agent_group,
+                zendesk_ticket_id=str(number) if number % 3 else None,
+                board=boards[number % len(boards)]
+            )
+            for number in range(10000)
+        ])
+        # Without statistics the planner guesses the table holds a row
+        # or two and any index looks as good as another.
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE boards_board')
+            cursor.execute('ANALYZE tickets_ticket')
+
+    def explain(self, queryset):
+        # The test table is still small enough for Postgres to rather scan
+        # it whole, which would not show which index it picks.
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute(f'EXPLAIN {sql}', params)
+            return '\n'.join(row[0] for row in cursor.fetchall())
+
+    def explain_board_page(self, order_by=None):
+        paginator = KeysetPaginator(
+            BoardSingleView().get_tickets(self.board),
+            25,
+            order_by=order_by
+        )
+        return self.explain(
+            paginator.queryset.order_by(*paginator.get_keys())[:26]
+        )
+
+    def test_board_page_should_use_board_index(self):
+        plan = self.explain_board_page()
+
+        self.assertIn('ticket_board_active_id_idx', plan)
+        self.assertNotIn('Sort', plan)
+
+    def test_board_page_by_requester_should_use_requester_index(self):
+        plan = self.explain_board_page('-requester')
+
+        self.assertIn('ticket_board_requester_idx', plan)
+        self.assertNotIn('Sort', plan)
+
+    def test_board_page_by_organization_should_use_organization_index(
+        self
+    ):
+        plan = self.explain_board_page('organization')
+
+        self.assertIn('ticket_board_organization_idx', plan)
+        self.assertNotIn('Sort', plan)
+
+    def test_pending_tickets_should_use_pending_index(self):
+        plan = self.explain(
+            ZendeskTicketServices().get_pending_tickets(self.board.slug)
+        )
+
+        self.assertIn('ticket_board_pending_idx', plan)
@@ -1,8 +1,13 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
 from ..models import (
     Ticket,
-    TicketZendeskAPIUsage
+    TicketZendeskAPIUsage,
+    TicketZendeskAPIUsageRollup,
+    buffer_zendesk_api_usage
 )
 from agents.models import Agent
 from agent_groups.models import AgentGroup
@@ -132,6 +137,127 @@ class TicketTest(TestCase):
         self.assertEqual(TicketZendeskAPIUsage.objects.count(), 0)
 
 
+class TicketZendeskAPIUsageSignalTest(TestCase):
+    def setUp(self):
+        self.agent = Agent.objects.create(name='Kan', zendesk_user_id='123')
+        agent_group = AgentGroup.objects.create(
+            name='Development',
+            zendesk_group_id='123'
+        )
+        board = Board.objects.create(
+            name='Pre-Production',
+            slug='pre-production'
+        )
+        self.ticket = Ticket.objects.create(
+            subject='Welcome to Pronto Service',
+            comment='Comment',
+            requester='client@hisotech.com',
+            assignee=self.agent,
+            group=agent_group,
+            ticket_type='question',
+            priority='urgent',
+            board=board
+        )
+
+    def test_saving_loaded_ticket_should_not_read_it_again(self):
+        ticket = Ticket.objects.get(id=self.ticket.id)
+        ticket.zendesk_ticket_id = '1234'
+
+        with CaptureQueriesContext(connection) as queries:
+            ticket.save()
+
+        self.assertFalse(
+            [each for each in queries if each['sql'].startswith('SELECT')]
+        )
+        self.assertEqual(TicketZendeskAPIUsage.objects.count(), 1)
+
+    def test_saving_ticket_again_should_not_store_usage_twice(self):
+        ticket = Ticket.objects.get(id=self.ticket.id)
+        ticket.zendesk_ticket_id = '1234'
+        ticket.save()
+        ticket.subject = 'Edited'
+        ticket.save()
+
+        Ticket.objects.get(id=self.ticket.id).save()
+
+        self.assertEqual(TicketZendeskAPIUsage.objects.count(), 1)
+
+    def test_ticket_without_assignee_should_not_store_usage(self):
+        ticket = Ticket.objects.get(id=self.ticket.id)
+        ticket.assignee = None
+        ticket.zendesk_ticket_id = '1234'
+
+        ticket.save()
+
+        self.assertEqual(TicketZendeskAPIUsage.objects.count(), 0)
+        self.assertEqual(
+            Ticket.objects.get(id=self.ticket.id).zendesk_ticket_id,
+            '1234'
+        )
+
+    def test_ticket_with_deferred_zendesk_ticket_id_should_read_it(self):
+        ticket = Ticket.objects.only('id', 'assignee').get(id=self.ticket.id)
+        ticket.zendesk_ticket_id = '1234'
+
+        ticket.save()
+
+        usage = TicketZendeskAPIUsage.objects.get()
+        self.assertEqual(usage.assignee, self.agent)
+
+    def test_ticket_without_ticket_type_should_store_usage(self):
+        ticket = Ticket.objects.get(id=self.ticket.id)
+        ticket.ticket_type = None
+        ticket.zendesk_ticket_id = '1234'
+
+        ticket.save()
+
+        self.assertEqual(TicketZendeskAPIUsage.objects.get().ticket_type, '')
+
+    def test_saving_ticket_should_count_usage_in_daily_rollup(self):
+        ticket = Ticket.objects.get(id=self.ticket.id)
+        ticket.zendesk_ticket_id = '1234'
+        ticket.save()
+
+        rollup = TicketZendeskAPIUsageRollup.objects.get()
+        self.assertEqual(rollup.date, timezone.localdate())
+        self.assertEqual(rollup.board, self.ticket.board)
+        self.assertEqual(rollup.assignee, self.agent)
+        self.assertEqual(rollup.ticket_type, 'question')
+        self.assertEqual(rollup.priority, 'urgent')
+        self.assertEqual(rollup.count, 1)
+
+    def test_buffered_usage_should_be_written_when_block_exits(self):
+        tickets = [Ticket.objects.get(id=self.ticket.id)]
+        for number in range(2):
+            self.ticket.pk = None
+            self.ticket.save()
+            tickets.append(Ticket.objects.get(id=self.ticket.id))
+
+        with buffer_zendesk_api_usage():
+            for number, ticket in enumerate(tickets):
+                ticket.zendesk_ticket_id = str(number + 1)
+                ticket.save()
+
+            self.assertEqual(TicketZendeskAPIUsage.objects.count(), 0)
+
+        self.assertEqual(TicketZendeskAPIUsage.objects.count(), 3)
+        self.assertEqual(TicketZendeskAPIUsageRollup.objects.get().count, 3)
+
+    def test_buffered_usage_should_not_add_queries_per_ticket(self):
+        for number in range(2):
+            self.ticket.pk = None
+            self.ticket.save()
+        tickets = list(Ticket.objects.all())
+
+        # One UPDATE per ticket, then one INSERT of the usage rows and one
+        # upsert of the rollups inside a savepoint.
+        with self.assertNumQueries(len(tickets) + 4):
+            with buffer_zendesk_api_usage():
+                for number, ticket in enumerate(tickets):
+                    ticket.zendesk_ticket_id = str(number + 1)
+                    ticket.save()
+
+
 class TicketZendeskAPIUsageTest(TestCase):
     def test_save_ticket_zendesk_api_usage(self):
         agent = Agent.objects.create(name='Kan', zendesk_user_id='123')
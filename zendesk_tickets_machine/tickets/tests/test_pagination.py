@@ -0,0 +1,126 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from ..models import Ticket
+from ..pagination import KeysetPaginator
+from agent_groups.models import AgentGroup
+from boards.models import Board
+
+
+class KeysetPaginatorTest(TestCase):
+    def setUp(self):
+        agent_group = AgentGroup.objects.create(name='Development')
+        board = Board.objects.create(name='Pre-Production')
+        requesters = ['b@hisotech.com', 'a@hisotech.com', 'b@hisotech.com']
+        organizations = ['Pronto', None, '']
+        self.tickets = [
+            Ticket.objects.create(
+                subject=f'Ticket {number}',
+                comment='Comment',
+                requester=requesters[number % 3],
+                organization=organizations[number % 3],
+                group=agent_group,
+                board=board
+            )
+            for number in range(7)
+        ]
+
+    def get_ids(self, page):
+        return [each.id for each in page.object_list]
+
+    def test_pages_should_follow_each_other_by_id(self):
+        paginator = KeysetPaginator(Ticket.objects.all(), 3)
+
+        first = paginator.page()
+        second = paginator.page(after=first.next_cursor)
+        third = paginator.page(after=second.next_cursor)
+
+        ids = [each.id for each in self.tickets]
+        self.assertEqual(self.get_ids(first), ids[:3])
+        self.assertEqual(self.get_ids(second), ids[3:6])
+        self.assertEqual(self.get_ids(third), ids[6:])
+        self.assertFalse(first.has_previous)
+        self.assertTrue(second.has_previous)
+        self.assertTrue(second.has_next)
+        self.assertFalse(third.has_next)
+        self.assertIsNone(third.next_cursor)
+
+    def test_previous_page_should_be_the_page_before(self):
+        paginator = KeysetPaginator(Ticket.objects.all(), 3)
+        first = paginator.page()
+        second = paginator.page(after=first.next_cursor)
+
+        previous = paginator.page(before=second.previous_cursor)
+
+        self.assertEqual(self.get_ids(previous), self.get_ids(first))
+        self.assertFalse(previous.has_previous)
+        self.assertTrue(previous.has_next)
+
+    def test_pages_should_be_ordered_by_field_then_id(self):
+        paginator = KeysetPaginator(
+            Ticket.objects.all(),
+            2,
+            order_by='requester'
+        )
+
+        ids = []
+        page = paginator.page()
+        ids += self.get_ids(page)
+        while page.has_next:
+            page = paginator.page(after=page.next_cursor)
+            ids += self.get_ids(page)
+
+        expected = list(
+            Ticket.objects.order_by('requester', 'id').values_list(
+                'id',
+                flat=True
+            )
+        )
+        self.assertEqual(ids, expected)
+
+    def test_descending_pages_should_sort_nulls_as_empty(self):
+        paginator = KeysetPaginator(
+            Ticket.objects.all(),
+            2,
+            order_by='-organization'
+        )
+
+        organizations = []
+        page = paginator.page()
+        organizations += [each.organization for each in page.object_list]
+        while page.has_next:
+            page = paginator.page(after=page.next_cursor)
+            organizations += [
+                each.organization for each in page.object_list
+            ]
+
+        self.assertEqual(len(organizations), 7)
+        self.assertEqual(organizations[:3], ['Pronto'] * 3)
+        self.assertEqual(set(organizations[3:]), {None, ''})
+
+    def test_unreadable_cursor_should_start_from_first_page(self):
+        paginator = KeysetPaginator(
+            Ticket.objects.all(),
+            3,
+            order_by='requester'
+        )
+
+        page = paginator.page(before='not-a-cursor')
+
+        self.assertEqual(
+            self.get_ids(page),
+            self.get_ids(paginator.page())
+        )
+        self.assertFalse(page.has_previous)
+
+    def test_page_should_not_use_offset(self):
+        paginator = KeysetPaginator(Ticket.objects.all(), 3)
+        cursor = paginator.page().next_cursor
+
+        with CaptureQueriesContext(connection) as queries:
+            paginator.page(after=cursor)
+
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('OFFSET', queries[0]['sql'])
+        self.assertIn('LIMIT 4', queries[0]['sql'])
@@ -1,14 +1,25 @@
+import asyncio
 import datetime
+from unittest.mock import MagicMock, patch
 
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
 from django.utils.timezone import utc
 
-from ..models import Ticket
-from ..services import TicketServices
+from ..models import (
+    Ticket,
+    TicketZendeskAPIUsage,
+    TicketZendeskAPIUsageRollup,
+)
+from ..services import TicketServices, ZendeskTicketServices
 from agents.models import Agent
 from agent_groups.models import AgentGroup
 from boards.models import Board
 from requesters.models import Requester
+from requesters.services import organization_cache, requester_cache
+from zendesk.resilience import ZendeskUnavailableError
 
 
 class TicketServicesTest(TestCase):
@@ -160,3 +171,1076 @@ class TicketServicesTest(TestCase):
             Ticket.objects.get(id=self.second_ticket.id).assignee,
             agent
         )
+
+    def test_edit_ticket_once_should_update_in_one_query(self):
+        ticketServices = TicketServices()
+
+        with CaptureQueriesContext(connection) as queries:
+            updated = ticketServices.edit_ticket_once(
+                [self.first_ticket.id, self.second_ticket.id],
+                'aa bb',
+                None,
+                'New Subject',
+                '01/31/2017',
+                None
+            )
+
+        self.assertEqual(updated, 2)
+        self.assertEqual(len(queries), 1)
+        self.assertTrue(queries[0]['sql'].startswith('UPDATE'))
+        self.assertEqual(
+            list(
+                Ticket.objects.order_by('id').values_list(
+                    'tags',
+                    'subject',
+                    'requester'
+                )
+            ),
+            [
+                ('aa bb', 'New Subject', 'client@hisotech.com'),
+                ('aa bb', 'New Subject', 'client+another@hisotech.com'),
+            ]
+        )
+
+    def test_edit_tickets_of_board_should_update_in_one_query(self):
+        ticketServices = TicketServices()
+        tickets = ticketServices.get_board_tickets(
+            self.board.slug,
+            [self.second_ticket.id]
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            updated = ticketServices.edit_tickets(
+                tickets,
+                'aa bb',
+                None,
+                None,
+                None,
+                None
+            )
+
+        self.assertEqual(updated, 1)
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(
+            Ticket.objects.get(id=self.first_ticket.id).tags,
+            'aa bb'
+        )
+        self.assertEqual(
+            Ticket.objects.get(id=self.second_ticket.id).tags,
+            'welcome internal'
+        )
+
+    def test_edit_ticket_once_without_values_should_not_update(self):
+        ticketServices = TicketServices()
+
+        with CaptureQueriesContext(connection) as queries:
+            updated = ticketServices.edit_ticket_once(
+                [self.first_ticket.id],
+                '',
+                '',
+                '',
+                '',
+                ''
+            )
+
+        self.assertEqual(updated, 0)
+        self.assertEqual(len(queries), 0)
+
+    def test_deactivate_tickets_should_update_in_one_query(self):
+        self.second_ticket.is_active = False
+        self.second_ticket.save()
+
+        ticketServices = TicketServices()
+        with CaptureQueriesContext(connection) as queries:
+            deactivated = ticketServices.deactivate_tickets(
+                ticketServices.get_board_tickets(self.board.slug)
+            )
+
+        self.assertEqual(deactivated, 1)
+        self.assertEqual(len(queries), 1)
+        self.assertFalse(Ticket.objects.filter(is_active=True).exists())
+
+    def test_reactivate_tickets_should_count_only_inactive_tickets(self):
+        self.second_ticket.is_active = False
+        self.second_ticket.save()
+
+        ticketServices = TicketServices()
+        reactivated = ticketServices.reactivate_tickets(
+            Ticket.objects.filter(board=self.board)
+        )
+
+        self.assertEqual(reactivated, 1)
+        self.second_ticket.refresh_from_db()
+        self.assertTrue(self.second_ticket.is_active)
+
+    @override_settings(BOARD_RESET_CHUNK_SIZE=2)
+    def test_reset_zendesk_ticket_ids_should_update_in_chunks(self):
+        for number in range(4):
+            self.first_ticket.pk = None
+            self.first_ticket.zendesk_ticket_id = str(number)
+            self.first_ticket.save()
+        other_ticket = Ticket.objects.get(id=self.second_ticket.id)
+        other_ticket.pk = None
+        other_ticket.zendesk_ticket_id = '99'
+        other_ticket.board = Board.objects.create(name='Production')
+        other_ticket.save()
+        progress = []
+
+        ticketServices = TicketServices()
+        with CaptureQueriesContext(connection) as queries:
+            reset = ticketServices.reset_zendesk_ticket_ids(
+                self.board.slug,
+                progress=lambda *args: progress.append(args)
+            )
+
+        self.assertEqual(reset, 5)
+        self.assertEqual(progress, [(5, 0), (5, 2), (5, 4), (5, 5)])
+        self.assertEqual(
+            len([
+                each for each in queries
+                if each['sql'].startswith('UPDATE')
+            ]),
+            3
+        )
+        self.assertFalse(
+            Ticket.objects.filter(
+                board=self.board,
+                zendesk_ticket_id__isnull=False
+            ).exists()
+        )
+        other_ticket.refresh_from_db()
+        self.assertEqual(other_ticket.zendesk_ticket_id, '99')
+
+    def test_reset_zendesk_ticket_ids_should_skip_tickets_already_reset(
+        self
+    ):
+        ticketServices = TicketServices()
+        ticketServices.reset_zendesk_ticket_ids(self.board.slug)
+
+        with CaptureQueriesContext(connection) as queries:
+            reset = ticketServices.reset_zendesk_ticket_ids(self.board.slug)
+
+        self.assertEqual(reset, 0)
+        self.assertFalse(
+            [each for each in queries if each['sql'].startswith('UPDATE')]
+        )
+
+    def test_reset_requesters_should_skip_tickets_already_reset(self):
+        Ticket.objects.filter(id=self.second_ticket.id).update(
+            requester='',
+            organization=''
+        )
+
+        ticketServices = TicketServices()
+        reset = ticketServices.reset_requesters(self.board.slug)
+
+        self.assertEqual(reset, 1)
+        self.first_ticket.refresh_from_db()
+        self.assertEqual(self.first_ticket.requester, '')
+        self.assertEqual(self.first_ticket.organization, '')
+
+    def test_build_zendesk_changes_should_use_zendesk_fields(self):
+        agent = Agent.objects.create(name='Natty', zendesk_user_id='456')
+
+        ticketServices = TicketServices()
+        changes = ticketServices.build_zendesk_changes(
+            'aa, bb',
+            'New Subject',
+            '03/09/2017',
+            agent.id
+        )
+
+        self.assertEqual(
+            changes,
+            {
+                'tags': ['aa', 'bb'],
+                'subject': 'New Subject',
+                'due_at': '2017-03-09T00:00:00+00:00',
+                'assignee_id': '456',
+            }
+        )
+
+    def test_build_zendesk_changes_without_values_should_be_empty(self):
+        ticketServices = TicketServices()
+        changes = ticketServices.build_zendesk_changes('', '', '', '')
+
+        self.assertEqual(changes, {})
+
+
+class CoroutineMock(MagicMock):
+    # Awaiting a call gives what a call to a MagicMock returns.
+    async def __call__(self, *args, **kwargs):
+        result = super(CoroutineMock, self).__call__(*args, **kwargs)
+        if asyncio.iscoroutine(result):
+            result = await result
+
+        return result
+
+    def _get_child_mock(self, **kwargs):
+        return MagicMock(**kwargs)
+
+
+class ClientMock(MagicMock):
+    # Stands for a zendesk.async_api client, all its methods are coroutines.
+    def _get_child_mock(self, **kwargs):
+        return CoroutineMock(**kwargs)
+
+
+def client_class_mock():
+    return MagicMock(return_value=ClientMock())
+
+
+@patch('tickets.services.ZendeskOrganization', new_callable=client_class_mock)
+@patch('tickets.services.ZendeskTicket', new_callable=client_class_mock)
+@patch('tickets.services.ZendeskRequester', new_callable=client_class_mock)
+class ZendeskTicketServicesTest(TransactionTestCase):
+    def setUp(self):
+        requester_cache.clear()
+        organization_cache.clear()
+
+        self.agent = Agent.objects.create(name='Kan', zendesk_user_id='123')
+        self.agent_group = AgentGroup.objects.create(
+            name='Development',
+            zendesk_group_id='123'
+        )
+        self.board = Board.objects.create(name='Production')
+        self.ticket = Ticket.objects.create(
+            subject='Ticket 1',
+            comment='Comment 1',
+            requester='client@hisotech.com',
+            created_by=self.agent,
+            assignee=self.agent,
+            group=self.agent_group,
+            ticket_type='question',
+            priority='urgent',
+            tags='welcome',
+            private_comment='Private comment',
+            board=self.board
+        )
+        self.deleted_ticket = Ticket.objects.create(
+            subject='Ticket (Deleted)',
+            comment='Comment',
+            requester='client@hisotech.com',
+            created_by=self.agent,
+            assignee=self.agent,
+            group=self.agent_group,
+            ticket_type='question',
+            priority='urgent',
+            tags='welcome',
+            private_comment='Private comment',
+            board=self.board,
+            is_active=False
+        )
+
+    def create_ticket(self, subject, board=None, **kwargs):
+        return Ticket.objects.create(
+            subject=subject,
+            comment=subject.replace('Ticket', 'Comment'),
+            requester=kwargs.pop('requester', 'client@hisotech.com'),
+            created_by=self.agent,
+            assignee=self.agent,
+            group=self.agent_group,
+            ticket_type='question',
+            priority='low',
+            tags='welcome',
+            private_comment=kwargs.pop(
+                'private_comment',
+                'Private comment'
+            ),
+            board=board or self.board,
+            **kwargs
+        )
+
+    def mock_lookups(self, mock_requester, mock_organization, **user):
+        mock_requester.return_value.search.return_value = {
+            'users': [dict({
+                'id': '2',
+                'organization_id': 69969,
+            }, **user)]
+        }
+        mock_organization.return_value.show.return_value = {
+            'organization': {
+                'id': 69969,
+                'name': 'Pronto Tools',
+            }
+        }
+
+    def build_ticket_data(self, subject, priority, **kwargs):
+        ticket = Ticket.objects.get(subject=subject)
+        data = {
+            'external_id': f'ztm-{ticket.board_id}-{ticket.id}',
+            'subject': subject,
+            'comment': {
+                'body': subject.replace('Ticket', 'Comment'),
+                'author_id': '123'
+            },
+            'requester_id': '2',
+            'assignee_id': '123',
+            'group_id': '123',
+            'type': 'question',
+            'due_at': '',
+            'priority': priority,
+            'tags': ['welcome']
+        }
+        data.update(kwargs)
+        return data
+
+    def build_comment(
+        self,
+        ticket_id,
+        body='Private comment',
+        author_id='123'
+    ):
+        return {
+            'id': ticket_id,
+            'comment': {
+                'author_id': author_id,
+                'body': body,
+                'public': False
+            }
+        }
+
+    def test_create_tickets_should_send_data_to_create_zendesk_tickets(
+        self,
+        mock_requester,
+        mock_ticket,
+        mock_organization,
+    ):
+        self.ticket.tags = 'welcome, pronto_marketing'
+        self.ticket.save()
+        self.mock_lookups(mock_requester, mock_organization)
+        mock_ticket.return_value.create_many.return_value = [
+            {'index': 0, 'id': 1}
+        ]
+
+        zendeskTicketServices = ZendeskTicketServices()
+        zendeskTicketServices.create_tickets(self.board.slug)
+
+        data = self.build_ticket_data(
+            'Ticket 1',
+            'urgent',
+            tags=['welcome', 'pronto_marketing']
+        )
+        mock_ticket.return_value.create_many.assert_called_once_with([data])
+        mock_ticket.return_value.add_comments.assert_called_once_with([
+            self.build_comment(1)
+        ])
+        self.assertEqual(mock_ticket.return_value.create_comment.call_count, 0)
+        mock_requester.return_value.search.assert_called_once_with(
+            'client@hisotech.com',
+            include='organizations'
+        )
+        mock_organization.return_value.show.assert_called_once_with(69969)
+
+    @patch.dict('os.environ', {'DEFAULT_ZENDESK_USER_ID': '9909'})
+    def test_create_ticket_with_no_assignee_should_use_default_assignee(
+        self,
+        mock_requester,
+        mock_ticket,
+        mock_organization,
+    ):
+        self.ticket.assignee = None
+        self.ticket.save()
+        self.mock_lookups(mock_requester, mock_organization)
+        mock_ticket.return_value.create_many.return_value = [
+            {'index': 0, 'id': 1}
+        ]
+
+        zendeskTicketServices = ZendeskTicketServices()
+        zendeskTicketServices.create_tickets(self.board.slug)
+
+        data = self.build_ticket_data(
+            'Ticket 1',
+            'urgent',
+            assignee_id='9909'
+        )
+        mock_ticket.return_value.create_many.assert_called_once_with([data])
+        mock_ticket.return_value.add_comments.assert_called_once_with([
+            self.build_comment(1, author_id='9909')
+        ])
+
+    def test_create_tickets_should_create_all_tickets_in_one_bulk_call(
+        self,
+        mock_requester,
+        mock_ticket,
+        mock_organization,
+    ):
+        self.mock_lookups(mock_requester, mock_organization)
+        mock_ticket.return_value.create_many.return_value = [
+            {'index': 0, 'id': 1},
+            {'index': 1, 'id': 2},
+        ]
+        second_ticket = self.create_ticket(
+            'Ticket 2',
+            private_comment='Private comment 2'
+        )
+
+        zendeskTicketServices = ZendeskTicketServices()
+        zendeskTicketServices.create_tickets(self.board.slug)
+
+        mock_ticket.return_value.create_many.assert_called_once_with([
+            self.build_ticket_data('Ticket 1', 'urgent'),
+            self.build_ticket_data('Ticket 2', 'low'),
+        ])
+
+        mock_ticket.return_value.add_comments.assert_called_once_with([
+            self.build_comment(1),
+            self.build_comment(2, 'Private comment 2'),
+        ])
+
+        self.assertEqual(
+            Ticket.objects.get(id=self.ticket.id).zendesk_ticket_id,
+            '1'
+        )
+        self.assertEqual(
+            Ticket.objects.get(id=second_ticket.id).zendesk_ticket_id,
+            '2'
+        )
+
+    def test_create_tickets_should_create_only_tickets_in_their_board(
+        self,
+        mock_requester,
+        mock_ticket,
+        mock_organization,
+    ):
+        self.mock_lookups(mock_requester, mock_organization)
+        mock_ticket.return_value.create_many.return_value = [
+            {'index': 0, 'id': 1}
+        ]
+        board = Board.objects.create(name='Monthly Newsletter')
+        self.create_ticket('Ticket 2', board=board)
+
+        zendeskTicketServices = ZendeskTicketServices()
+        zendeskTicketServices.create_tickets(self.board.slug)
+
+        mock_ticket.return_value.create_many.assert_called_once_with([
+            self.build_ticket_data('Ticket 1', 'urgent'),
+        ])
+        mock_ticket.return_value.add_comments.assert_called_once_with([
+            self.build_comment(1),
+        ])
+
+    def test_create_tickets_should_create_only_selected_tickets(
+        self,
+        mock_requester,
+        mock_ticket,
+        mock_organization,
+    ):
+        self.mock_lookups(mock_requester, mock_organization)
+        mock_ticket.return_value.create_many.return_value = [
+            {'index': 0, 'id': 1},
+            {'index': 1, 'id': 2},
+        ]
+        self.create_ticket('Ticket 2', private_comment='Private comment 2')
+        third_ticket = self.create_ticket(
+            'Ticket 3',
+            private_comment='Private comment 3'
+        )
+
+        zendeskTicketServices = ZendeskTicketServices()
+        zendeskTicketServices.create_tickets(
+            self.board.slug,
+            [str(self.ticket.id), str(third_ticket.id)]
+        )
+
+        mock_ticket.return_value.create_many.assert_called_once_with([
+            self.build_ticket_data('Ticket 1', 'urgent'),
+            self.build_ticket_data('Ticket 3', 'low'),
+        ])
+
+        mock_ticket.return_value.add_comments.assert_called_once_with([
+            self.build_comment(1),
+            self.build_comment(2, 'Private comment 3'),
+        ])
+
+    def test_create_tickets_should_leave_out_excluded_tickets(
+        self,
+        mock_requester,
+        mock_ticket,
+        mock_organization,
+    ):
+        self.mock_lookups(mock_requester, mock_organization)
+        mock_ticket.return_value.create_many.return_value = [
+            {'index': 0, 'id': 17},
+        ]
+        excluded = self.create_ticket('Ticket 2')
+
+        zendeskTicketServices = ZendeskTicketServices()
+        zendeskTicketServices.create_tickets(
+            self.board.slug,
+            excluded_ids=[excluded.id]
+        )
+
+        tickets = mock_ticket.return_value.create_many.call_args[0][0]
+        self.assertEqual([each['subject'] for each in tickets], ['Ticket 1'])
+        excluded.refresh_from_db()
+        self.assertIsNone(excluded.zendesk_ticket_id)
+
+    def test_create_tickets_should_set_zendesk_ticket_id_to_ticket(
+        self,
+        mock_requester,
+        mock_ticket,
+        mock_organization,
+    ):
+        self.assertIsNone(self.ticket.zendesk_ticket_id)
+        self.mock_lookups(mock_requester, mock_organization)
+        mock_ticket.return_value.create_many.return_value = [
+            {'index': 0, 'id': 16}
+        ]
+
+        zendeskTicketServices = ZendeskTicketServices()
+        zendeskTicketServices.create_tickets(self.board.slug)
+
+        ticket = Ticket.objects.get(id=self.ticket.id)
+        self.assertEqual(ticket.zendesk_ticket_id, '16')
+
+    def test_create_tickets_should_keep_changes_made_during_the_run(
+        self,
+        mock_requester,
+        mock_ticket,
+        mock_organization,
+    ):
+        self.mock_lookups(mock_requester, mock_organization)
+
+        def create_many(tickets):
+            # The ticket is deactivated and edited while it is created.
+            Ticket.objects.filter(id=self.ticket.id).update(
+                is_active=False,
+                tags='edited'
+            )
+            return [{'index': 0, 'id': 16}]
+
+        mock_ticket.return_value.create_many.side_effect = create_many
+
+        zendeskTicketServices = ZendeskTicketServices()
+        zendeskTicketServices.create_tickets(self.board.slug)
+
+        ticket = Ticket.objects.get(id=self.ticket.id)
+        self.assertEqual(ticket.zendesk_ticket_id, '16')
+        self.assertFalse(ticket.is_active)
+        self.assertEqual(ticket.tags, 'edited')
+
+    def test_create_tickets_should_record_usage_of_batch_together(
+        self,
+        mock_requester,
+        mock_ticket,
+        mock_organization,
+    ):
+        self.create_ticket('Ticket 2')
+        self.mock_lookups(mock_requester, mock_organization)
+        mock_ticket.return_value.create_many.return_value = [
+            {'index': 0, 'id': 16},
+            {'index': 1, 'id': 17},
+        ]
+
+        zendeskTicketServices = ZendeskTicketServices()
+        zendeskTicketServices.create_tickets(self.board.slug)
+
+        self.assertEqual(TicketZendeskAPIUsage.objects.count(), 2)
+        self.assertEqual(
+            sorted(
+                TicketZendeskAPIUsageRollup.objects.values_list(
+                    'priority',
+                    'count'
+                )
+            ),
+            [('low', 1), ('urgent', 1)]
+        )
+
+    def test_create_tickets_should_save_requester_id_requester(
+        self,
+        mock_requester,
+        mock_ticket,
+        mock_organization,
+    ):
+        self.mock_lookups(mock_requester, mock_organization, id='1095195473')
+        mock_ticket.return_value.create_many.return_value = [
+            {'index': 0, 'id': 16}
+        ]
+
+        zendeskTicketServices = ZendeskTicketServices()
+        zendeskTicketServices.create_tickets(self.board.slug)
+
+        requester = Requester.objects.last()
+        self.assertEqual(requester.email, 'client@hisotech.com')
+        self.assertEqual(requester.zendesk_user_id, '1095195473')
+
+    def test_create_tickets_should_not_search_requester_known_in_database(
+        self,
+        mock_requester,
+        mock_ticket,
+        mock_organization,
+    ):
+        self.mock_lookups(mock_requester, mock_organization)
+        mock_ticket.return_value.create_many.return_value = [
+            {'index': 0, 'id': 16}
+        ]
+        Requester.objects.create(
+            email='client@hisotech.com',
+            zendesk_user_id='2',
+            organization_id='69969',
+            updated=timezone.now()
+        )
+
+        zendeskTicketServices = ZendeskTicketServices()
+        zendeskTicketServices.create_tickets(self.board.slug)
+
+        self.assertEqual(mock_requester.return_value.search.call_count, 0)
+        mock_organization.return_value.show.assert_called_once_with('69969')
+        mock_ticket.return_value.create_many.assert_called_once_with([
+            self.build_ticket_data('Ticket 1', 'urgent')
+        ])
+
+    def test_create_tickets_should_reconcile_tickets_already_in_zendesk(
+        self,
+        mock_requester,
+        mock_ticket,
+        mock_organization,
+    ):
+        self.mock_lookups(mock_requester, mock_organization)
+        external_id = f'ztm-{self.board.id}-{self.ticket.id}'
+        mock_ticket.return_value.search_by_external_ids.return_value = [
+            {'id': 77, 'external_id': external_id, 'organization_id': 69969},
+            {'id': 78, 'external_id': 'ztm-0-0', 'organization_id': 69969},
+        ]
+        mock_ticket.return_value.create_many.return_value = [
+            {'index': 0, 'id': 99},
+        ]
+        another_ticket = self.create_ticket('Ticket 2')
+
+        zendeskTicketServices = ZendeskTicketServices()
+        errors = zendeskTicketServices.create_tickets(self.board.slug)
+
+        self.assertEqual(errors, [])
+        search = mock_ticket.return_value.search_by_external_ids
+        search.assert_called_once_with(
+            [external_id, f'ztm-{self.board.id}-{another_ticket.id}']
+        )
+        mock_ticket.return_value.create_many.assert_called_once_with([
+            self.build_ticket_data('Ticket 2', 'low'),
+        ])
+        mock_ticket.return_value.add_comments.assert_called_once_with([
+            self.build_comment(99),
+            self.build_comment(77),
+        ])
+
+        ticket = Ticket.objects.get(id=self.ticket.id)
+        self.assertEqual(ticket.zendesk_ticket_id, '77')
+        self.assertEqual(ticket.organization, 'Pronto Tools')
+        another_ticket = Ticket.objects.get(id=another_ticket.id)
+        self.assertEqual(another_ticket.zendesk_ticket_id, '99')
+
+    def test_create_tickets_should_use_sideloaded_organization(
+        self,
+        mock_requester,
+        mock_ticket,
+        mock_organization,
+    ):
+        mock_requester.return_value.search.return_value = {
+            'users': [{'id': '2', 'organization_id': 69969}],
+            'organizations': [{'id': 69969, 'name': 'Pronto Tools'}],
+        }
+        mock_ticket.return_value.create_many.return_value = [
+            {'index': 0, 'id': 16}
+        ]
+
+        zendeskTicketServices = ZendeskTicketServices()
+        zendeskTicketServices.create_tickets(self.board.slug)
+
+        self.assertEqual(mock_organization.return_value.show.call_count, 0)
+        ticket = Ticket.objects.get(id=self.ticket.id)
+        self.assertEqual(ticket.organization, 'Pronto Tools')
+
+    def test_create_tickets_should_not_show_organization_if_user_has_none(
+        self,
+        mock_requester,
+        mock_ticket,
+        mock_organization,
+    ):
+        mock_requester.return_value.search.return_value = {
+            'users': [{'id': '2', 'organization_id': None}],
+        }
+        mock_ticket.return_value.create_many.return_value = [
+            {'index': 0, 'id': 16}
+        ]
+
+        zendeskTicketServices = ZendeskTicketServices()
+        zendeskTicketServices.create_tickets(self.board.slug)
+
+        self.assertEqual(mock_organization.return_value.show.call_count, 0)
+        ticket = Ticket.objects.get(id=self.ticket.id)
+        self.assertIsNone(ticket.organization)
+
+    def test_create_tickets_should_leave_organization_empty_if_not_found(
+        self,
+        mock_requester,
+        mock_ticket,
+        mock_organization,
+    ):
+        self.mock_lookups(mock_requester, mock_organization)
+        mock_organization.return_value.show.return_value = {
+            'error': 'RecordNotFound',
+            'description': 'Not found'
+        }
+        mock_ticket.return_value.create_many.return_value = [
+            {'index': 0, 'id': 16}
+        ]
+
+        zendeskTicketServices = ZendeskTicketServices()
+        zendeskTicketServices.create_tickets(self.board.slug)
+
+        ticket = Ticket.objects.get(id=self.ticket.id)
+        self.assertEqual(ticket.zendesk_ticket_id, '16')
+        self.assertIsNone(ticket.organization)
+
+    def test_create_tickets_should_search_each_requester_once(
+        self,
+        mock_requester,
+        mock_ticket,
+        mock_organization,
+    ):
+        self.mock_lookups(mock_requester, mock_organization)
+        mock_ticket.return_value.create_many.return_value = []
+        self.create_ticket('Ticket 2')
+        self.create_ticket('Ticket 3')
+
+        zendeskTicketServices = ZendeskTicketServices()
+        zendeskTicketServices.create_tickets(self.board.slug)
+
+        mock_requester.return_value.search.assert_called_once_with(
+            'client@hisotech.com',
+            include='organizations'
+        )
+        self.assertEqual(
+            zendeskTicketServices.requesterServices.get_summary(),
+            '2 memory hits, 0 database hits, 1 Zendesk searches'
+        )
+
+    def test_create_tickets_should_set_organization_to_ticket(
+        self,
+        mock_requester,
+        mock_ticket,
+        mock_organization,
+    ):
+        self.mock_lookups(mock_requester, mock_organization)
+        mock_ticket.return_value.create_many.return_value = [
+            {'index': 0, 'id': 16}
+        ]
+
+        zendeskTicketServices = ZendeskTicketServices()
+        zendeskTicketServices.create_tickets(self.board.slug)
+
+        ticket = Ticket.objects.get(id=self.ticket.id)
+        self.assertEqual(ticket.organization, 'Pronto Tools')
+
+    def test_create_tickets_should_not_create_if_zendesk_ticket_id_not_empty(
+        self,
+        mock_requester,
+        mock_ticket,
+        mock_organization,
+    ):
+        self.ticket.zendesk_ticket_id = '123'
+        self.ticket.save()
+
+        zendeskTicketServices = ZendeskTicketServices()
+        zendeskTicketServices.create_tickets(self.board.slug)
+
+        self.assertEqual(mock_requester.return_value.search.call_count, 0)
+        self.assertEqual(mock_ticket.return_value.create_many.call_count, 0)
+
+    def test_create_tickets_should_not_create_if_requester_id_is_empty(
+        self,
+        mock_requester,
+        mock_ticket,
+        mock_organization,
+    ):
+        mock_requester.return_value.search.return_value = {
+            'users': []
+        }
+
+        zendeskTicketServices = ZendeskTicketServices()
+        zendeskTicketServices.create_tickets(self.board.slug)
+
+        self.assertEqual(mock_ticket.return_value.create_many.call_count, 0)
+        ticket = Ticket.objects.get(id=self.ticket.id)
+        self.assertIsNone(ticket.zendesk_ticket_id)
+
+    def test_create_tickets_should_not_create_ticket_if_no_requester(
+        self,
+        mock_requester,
+        mock_ticket,
+        mock_organization,
+    ):
+        self.ticket.requester = ''
+        self.ticket.save()
+
+        zendeskTicketServices = ZendeskTicketServices()
+        zendeskTicketServices.create_tickets(self.board.slug)
+
+        self.assertEqual(mock_requester.return_value.search.call_count, 0)
+        self.assertEqual(mock_ticket.return_value.create_many.call_count, 0)
+
+    def test_create_tickets_should_return_errors_and_create_other_tickets(
+        self,
+        mock_requester,
+        mock_ticket,
+        mock_organization,
+    ):
+        self.mock_lookups(
+            mock_requester,
+            mock_organization,
+            email='kan@pronto.com'
+        )
+        mock_ticket.return_value.create_many.return_value = [
+            {
+                'index': 0,
+                'error': 'RecordInvalid',
+                'details': {
+                    'requester': [
+                        {
+                            'description': 'Requester: Pronto is suspended.'
+                        }
+                    ]
+                },
+            },
+            {'index': 1, 'id': 99},
+        ]
+        another_ticket = self.create_ticket('Ticket 2')
+
+        zendeskTicketServices = ZendeskTicketServices()
+        errors = zendeskTicketServices.create_tickets(self.board.slug)
+
+        expected_message = 'RecordInvalid: Requester: Pronto is suspended. ' \
+            '(kan@pronto.com)'
+        self.assertEqual(errors, [expected_message])
+
+        ticket = Ticket.objects.get(id=self.ticket.id)
+        self.assertIsNone(ticket.zendesk_ticket_id)
+        another_ticket = Ticket.objects.get(id=another_ticket.id)
+        self.assertEqual(another_ticket.zendesk_ticket_id, '99')
+
+        mock_ticket.return_value.add_comments.assert_called_once_with([
+            self.build_comment(99)
+        ])
+
+    def test_create_tickets_should_return_error_if_job_failed(
+        self,
+        mock_requester,
+        mock_ticket,
+        mock_organization,
+    ):
+        self.mock_lookups(mock_requester, mock_organization)
+        mock_ticket.return_value.create_many.return_value = [
+            {'index': 0, 'error': 'failed', 'details': 'Job was killed'},
+        ]
+
+        zendeskTicketServices = ZendeskTicketServices()
+        errors = zendeskTicketServices.create_tickets(self.board.slug)
+
+        self.assertEqual(
+            errors,
+            ['failed: Job was killed (client@hisotech.com)']
+        )
+        self.assertEqual(mock_ticket.return_value.add_comments.call_count, 0)
+
+    def test_create_tickets_should_not_add_empty_private_comment(
+        self,
+        mock_requester,
+        mock_ticket,
+        mock_organization,
+    ):
+        self.mock_lookups(mock_requester, mock_organization)
+        mock_ticket.return_value.create_many.return_value = [
+            {'index': 0, 'id': 1},
+            {'index': 1, 'id': 2},
+        ]
+        self.create_ticket('Ticket 2', private_comment='')
+
+        zendeskTicketServices = ZendeskTicketServices()
+        zendeskTicketServices.create_tickets(self.board.slug)
+
+        mock_ticket.return_value.add_comments.assert_called_once_with([
+            self.build_comment(1)
+        ])
+
+    def test_create_tickets_should_return_error_if_private_comment_failed(
+        self,
+        mock_requester,
+        mock_ticket,
+        mock_organization,
+    ):
+        self.mock_lookups(mock_requester, mock_organization)
+        mock_ticket.return_value.create_many.return_value = [
+            {'index': 0, 'id': 1},
+        ]
+        mock_ticket.return_value.add_comments.return_value = [
+            {'index': 0, 'error': 'failed', 'details': 'Job was killed'},
+        ]
+
+        zendeskTicketServices = ZendeskTicketServices()
+        errors = zendeskTicketServices.create_tickets(self.board.slug)
+
+        self.assertEqual(
+            errors,
+            [
+                'Private comment on ticket 1 failed, '
+                'failed: Job was killed (client@hisotech.com)'
+            ]
+        )
+        self.assertEqual(
+            Ticket.objects.get(id=self.ticket.id).zendesk_ticket_id,
+            '1'
+        )
+
+    def test_create_tickets_should_report_progress_after_each_batch(
+        self,
+        mock_requester,
+        mock_ticket,
+        mock_organization,
+    ):
+        self.mock_lookups(mock_requester, mock_organization)
+        mock_ticket.return_value.create_many.return_value = [
+            {'index': 0, 'error': 'failed', 'details': 'Job was killed'},
+            {'index': 1, 'id': 99},
+        ]
+        self.create_ticket('Ticket 2')
+        progress = []
+
+        zendeskTicketServices = ZendeskTicketServices()
+        zendeskTicketServices.create_tickets(
+            self.board.slug,
+            progress=lambda *args: progress.append(
+                (args[0], args[1], args[2], list(args[3]))
+            )
+        )
+
+        self.assertEqual(
+            progress,
+            [
+                (2, 0, 0, []),
+                (2, 1, 1, ['failed: Job was killed (client@hisotech.com)']),
+            ]
+        )
+
+    def test_update_tickets_should_update_created_tickets_in_batches(
+        self,
+        mock_requester,
+        mock_ticket,
+        mock_organization,
+    ):
+        mock_ticket.return_value.update_many.return_value = []
+        tickets = [
+            self.create_ticket(
+                f'Ticket {number}',
+                zendesk_ticket_id=str(1000 + number)
+            )
+            for number in range(101)
+        ]
+        pending = self.create_ticket('Ticket Pending')
+
+        zendeskTicketServices = ZendeskTicketServices()
+        errors = zendeskTicketServices.update_tickets(
+            [each.id for each in tickets] + [pending.id],
+            {'subject': 'New Subject'}
+        )
+
+        self.assertEqual(errors, [])
+        calls = mock_ticket.return_value.update_many.call_args_list
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(len(calls[0][0][0]), 100)
+        self.assertEqual(
+            calls[0][0][0][0],
+            {'id': '1000', 'subject': 'New Subject'}
+        )
+        self.assertEqual(
+            calls[1][0][0],
+            [{'id': '1100', 'subject': 'New Subject'}]
+        )
+
+    def test_update_tickets_should_report_failed_tickets(
+        self,
+        mock_requester,
+        mock_ticket,
+        mock_organization,
+    ):
+        mock_ticket.return_value.update_many.return_value = [
+            {
+                'index': 1,
+                'error': 'TicketUpdateFailed',
+                'details': 'Ticket is closed',
+            },
+        ]
+        first = self.create_ticket('Ticket 2', zendesk_ticket_id='11')
+        second = self.create_ticket('Ticket 3', zendesk_ticket_id='12')
+        progress = []
+
+        zendeskTicketServices = ZendeskTicketServices()
+        errors = zendeskTicketServices.update_tickets(
+            [first.id, second.id],
+            {'tags': ['aa']},
+            progress=lambda *args: progress.append(
+                (args[0], args[1], args[2], list(args[3]))
+            )
+        )
+
+        expected = [
+            'Update of ticket 12 failed, TicketUpdateFailed: '
+            'Ticket is closed'
+        ]
+        self.assertEqual(errors, expected)
+        self.assertEqual(progress, [(2, 0, 0, []), (2, 1, 1, expected)])
+
+    def test_create_tickets_should_share_one_concurrency_limit(
+        self,
+        mock_requester,
+        mock_ticket,
+        mock_organization,
+    ):
+        self.mock_lookups(mock_requester, mock_organization)
+        mock_ticket.return_value.create_many.return_value = []
+        self.create_ticket('Ticket 1')
+
+        zendeskTicketServices = ZendeskTicketServices(concurrency=3)
+        zendeskTicketServices.create_tickets(self.board.slug)
+
+        semaphores = [
+            each.call_args[0][1]
+            for each in (mock_requester, mock_ticket, mock_organization)
+        ]
+        self.assertIs(semaphores[0], semaphores[1])
+        self.assertIs(semaphores[1], semaphores[2])
+
+    def test_create_tickets_should_cancel_other_batches_when_one_fails(
+        self,
+        mock_requester,
+        mock_ticket,
+        mock_organization,
+    ):
+        self.mock_lookups(mock_requester, mock_organization)
+        for number in range(101):
+            self.create_ticket(f'Ticket {number}')
+        calls = []
+        cancelled = []
+
+        async def create_many(tickets):
+            calls.append(tickets)
+            if len(calls) == 2:
+                raise ZendeskUnavailableError('Zendesk is unavailable')
+
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.append(tickets)
+                raise
+
+        mock_ticket.return_value.create_many.side_effect = create_many
+
+        zendeskTicketServices = ZendeskTicketServices()
+        with self.assertRaises(ZendeskUnavailableError):
+            zendeskTicketServices.create_tickets(self.board.slug)
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(cancelled, calls[:1])
+        self.assertFalse(
+            Ticket.objects.filter(zendesk_ticket_id__isnull=False).exists()
+        )
@@ -6,6 +6,7 @@ from django.views.generic import TemplateView, View
 
 from .forms import TicketForm
 from .models import Ticket
+from .services import TicketServices
 
 
 class TicketEditView(TemplateView):
@@ -77,8 +78,10 @@ class TicketDeleteView(View):
 
             return HttpResponseRedirect(reverse('boards'))
 
-        ticket.is_active = False
-        ticket.save()
+        ticketServices = TicketServices()
+        ticketServices.deactivate_tickets(
+            Ticket.objects.filter(id=ticket.id)
+        )
 
         board_slug = ticket.board.slug
 
@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from .models import RateLimitBucket
+
+
+@admin.register(RateLimitBucket)
+class RateLimitBucketAdmin(admin.ModelAdmin):
+    list_display = (
+        'name',
+        'capacity',
+        'tokens',
+    )
@@ -1,70 +1,330 @@
+import itertools
+import os
+import threading
+import time
+
 import requests
+from requests.adapters import HTTPAdapter
 
 from django.conf import settings
 
+from .rate_limit import DatabaseRateLimiter, RateLimiter
+from .resilience import (
+    CircuitBreaker,
+    ZendeskUnavailableError,
+    get_retry_delay,
+    is_server_error,
+)
+
+
+BULK_LIMIT = 100
+SEARCH_LIMIT = 50
+JOB_STATUS_FINISHED = ('completed', 'failed', 'killed')
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+_rate_limiters = {}
+_circuit_breakers = {}
+
+
+def get_session():
+    # uWSGI forks its workers after the app is loaded, so sessions are kept
+    # per process id to never share pooled sockets between processes.
+    pid = os.getpid()
+    session = _sessions.get(pid)
+    if session is not None:
+        return session
+
+    with _sessions_lock:
+        session = _sessions.get(pid)
+        if session is None:
+            _sessions.clear()
+            session = _sessions[pid] = create_session()
+
+    return session
+
+
+def get_rate_limiter():
+    pid = os.getpid()
+    rate_limiter = _rate_limiters.get(pid)
+    if rate_limiter is not None:
+        return rate_limiter
+
+    with _sessions_lock:
+        rate_limiter = _rate_limiters.get(pid)
+        if rate_limiter is None:
+            _rate_limiters.clear()
+            rate_limiter = _rate_limiters[pid] = create_rate_limiter()
+
+    return rate_limiter
+
+
+def get_circuit_breaker():
+    pid = os.getpid()
+    circuit_breaker = _circuit_breakers.get(pid)
+    if circuit_breaker is not None:
+        return circuit_breaker
+
+    with _sessions_lock:
+        circuit_breaker = _circuit_breakers.get(pid)
+        if circuit_breaker is None:
+            _circuit_breakers.clear()
+            circuit_breaker = _circuit_breakers[pid] = CircuitBreaker()
+
+    return circuit_breaker
+
+
+def create_rate_limiter():
+    if settings.ZENDESK_API_RATE_LIMITER == 'database':
+        return DatabaseRateLimiter()
+
+    return RateLimiter()
 
-class Ticket(object):
-    def __init__(self):
+
+def create_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=settings.ZENDESK_API_POOL_SIZE,
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    if not settings.ZENDESK_API_KEEP_ALIVE:
+        session.headers['Connection'] = 'close'
+
+    return session
+
+
+class ZendeskAPI(object):
+    def __init__(
+        self,
+        session=None,
+        rate_limiter=None,
+        circuit_breaker=None
+    ):
         self.zendesk_api_url = settings.ZENDESK_API_URL
         self.zendesk_api_user = settings.ZENDESK_API_USER
         self.zendesk_api_token = settings.ZENDESK_API_TOKEN
         self.headers = {'content-type': 'application/json'}
+        self.timeout = (
+            settings.ZENDESK_API_CONNECT_TIMEOUT,
+            settings.ZENDESK_API_READ_TIMEOUT,
+        )
+        self.session = session or get_session()
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.circuit_breaker = circuit_breaker or get_circuit_breaker()
+
+    def request(self, method, url, idempotent=None, **kwargs):
+        for attempt in itertools.count():
+            self.circuit_breaker.before_request()
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.request(
+                    method,
+                    url,
+                    auth=(self.zendesk_api_user, self.zendesk_api_token),
+                    headers=self.headers,
+                    timeout=self.timeout,
+                    **kwargs
+                )
+            except requests.RequestException as e:
+                self.circuit_breaker.record_failure()
+                delay = get_retry_delay(
+                    attempt,
+                    method,
+                    idempotent,
+                    connect_failed=isinstance(e, requests.ConnectTimeout)
+                )
+                if delay is None:
+                    raise ZendeskUnavailableError(
+                        f'{method} {url} failed: {e}'
+                    ) from e
+
+                time.sleep(delay)
+                continue
+
+            self.rate_limiter.update(response.headers)
+            self.circuit_breaker.record_status(response.status_code)
+            delay = get_retry_delay(
+                attempt,
+                method,
+                idempotent,
+                status=response.status_code,
+                headers=response.headers
+            )
+            if delay is None:
+                return parse_response(method, url, response)
+
+            if delay:
+                time.sleep(delay)
+
+
+def parse_response(method, url, response):
+    if is_server_error(response.status_code):
+        raise ZendeskUnavailableError(
+            f'{method} {url} failed: HTTP {response.status_code}'
+        )
+
+    try:
+        result = response.json()
+    except ValueError:
+        result = None
+
+    if not isinstance(result, dict):
+        return {
+            'error': f'HTTP {response.status_code}',
+            'description': 'Zendesk did not return a JSON object',
+        }
+
+    return result
+
+
+def collect_job_results(job_status, offset, batch):
+    # Results of create_many point to their ticket by `index`, the ones of
+    # update_many only by the ticket `id`, so these are matched by id.
+    positions = {
+        str(each['id']): index
+        for index, each in enumerate(batch)
+        if each.get('id') is not None
+    }
 
+    results = {}
+    for each in job_status.get('results') or []:
+        if positions:
+            index = positions.get(str(each.get('id')))
+        else:
+            index = each.get('index')
+        if index is None:
+            continue
+
+        index += offset
+        result = dict(each, index=index)
+        if each.get('success') is False and not each.get('error'):
+            result['error'] = each.get('status') or 'Failed'
+        results[index] = result
+
+    for index in range(offset, offset + len(batch)):
+        if index not in results:
+            results[index] = {
+                'index': index,
+                'error': job_status.get('status'),
+                'details': job_status.get('message'),
+            }
+
+    return [results[index] for index in sorted(results)]
+
+
+def build_external_id_query(external_ids):
+    return 'type:ticket ' + ' '.join(
+        f'external_id:"{each}"' for each in external_ids
+    )
+
+
+class JobStatus(ZendeskAPI):
+    def show(self, job_id):
+        url = self.zendesk_api_url + f'/api/v2/job_statuses/{job_id}.json'
+        return self.request('GET', url)
+
+    def wait(self, job_id):
+        deadline = time.monotonic() + settings.ZENDESK_JOB_STATUS_TIMEOUT
+        while True:
+            job_status = self.show(job_id).get('job_status', {})
+            if job_status.get('status') in JOB_STATUS_FINISHED:
+                return job_status
+
+            if time.monotonic() >= deadline:
+                return dict(
+                    job_status,
+                    message=f'Job {job_id} did not finish in time'
+                )
+
+            time.sleep(settings.ZENDESK_JOB_STATUS_POLL_INTERVAL)
+
+
+class Ticket(ZendeskAPI):
     def create(self, data):
         url = self.zendesk_api_url + '/api/v2/tickets.json'
-        response = requests.post(
-            url,
-            auth=(self.zendesk_api_user, self.zendesk_api_token),
-            headers=self.headers,
-            json=data
+        return self.request('POST', url, json=data)
+
+    def create_many(self, tickets):
+        url = self.zendesk_api_url + '/api/v2/tickets/create_many.json'
+        return self.run_jobs('POST', url, tickets)
+
+    def update_many(self, tickets):
+        url = self.zendesk_api_url + '/api/v2/tickets/update_many.json'
+        return self.run_jobs('PUT', url, tickets)
+
+    def add_comments(self, tickets):
+        # Each ticket gets its comment again if the job is sent twice, so
+        # it is only retried when Zendesk did not take it.
+        url = self.zendesk_api_url + '/api/v2/tickets/update_many.json'
+        return self.run_jobs('PUT', url, tickets, idempotent=False)
+
+    def run_jobs(self, method, url, tickets, idempotent=None):
+        zendesk_job_status = JobStatus(
+            session=self.session,
+            rate_limiter=self.rate_limiter
         )
-        return response.json()
+
+        results = []
+        for offset in range(0, len(tickets), BULK_LIMIT):
+            batch = tickets[offset:offset + BULK_LIMIT]
+            result = self.request(
+                method,
+                url,
+                idempotent=idempotent,
+                json={'tickets': batch}
+            )
+
+            job_status = result.get('job_status')
+            if job_status:
+                job_status = zendesk_job_status.wait(job_status['id'])
+            else:
+                job_status = {
+                    'status': result.get('error'),
+                    'message': result.get('description'),
+                }
+
+            results.extend(
+                collect_job_results(job_status, offset, batch)
+            )
+
+        return results
+
+    def search_by_external_ids(self, external_ids):
+        url = self.zendesk_api_url + '/api/v2/search.json'
+
+        tickets = []
+        for offset in range(0, len(external_ids), SEARCH_LIMIT):
+            batch = external_ids[offset:offset + SEARCH_LIMIT]
+            page_url = url
+            params = {'query': build_external_id_query(batch)}
+            while page_url:
+                result = self.request('GET', page_url, params=params)
+                tickets.extend(result.get('results') or [])
+                page_url = result.get('next_page')
+                params = None
+
+        return tickets
 
     def create_comment(self, data, ticket_id):
         url = self.zendesk_api_url + f'/api/v2/tickets/{ticket_id}.json'
-        response = requests.put(
-            url,
-            auth=(self.zendesk_api_user, self.zendesk_api_token),
-            headers=self.headers,
-            json=data
-        )
-        return response.json()
-
+        return self.request('PUT', url, idempotent=False, json=data)
 
-class User(object):
-    def __init__(self):
-        self.zendesk_api_url = settings.ZENDESK_API_URL
-        self.zendesk_api_user = settings.ZENDESK_API_USER
-        self.zendesk_api_token = settings.ZENDESK_API_TOKEN
-        self.headers = {'content-type': 'application/json'}
 
-    def search(self, query):
+class User(ZendeskAPI):
+    def search(self, query, include=None):
         url = self.zendesk_api_url + '/api/v2/users/search.json'
         payload = {
             'query': query
         }
-        response = requests.get(
-            url,
-            auth=(self.zendesk_api_user, self.zendesk_api_token),
-            headers=self.headers,
-            params=payload
-        )
-        return response.json()
+        if include:
+            payload['include'] = include
+        return self.request('GET', url, params=payload)
 
 
-class Organization(object):
-    def __init__(self):
-        self.zendesk_api_url = settings.ZENDESK_API_URL
-        self.zendesk_api_user = settings.ZENDESK_API_USER
-        self.zendesk_api_token = settings.ZENDESK_API_TOKEN
-        self.headers = {'content-type': 'application/json'}
-
+class Organization(ZendeskAPI):
     def show(self, organization_id):
         url = self.zendesk_api_url + \
             f'/api/v2/organizations/{organization_id}.json'
-        response = requests.get(
-            url,
-            auth=(self.zendesk_api_user, self.zendesk_api_token),
-            headers=self.headers,
-        )
-        return response.json()
+        return self.request('GET', url)
@@ -0,0 +1,260 @@
+import asyncio
+import itertools
+import time
+
+import aiohttp
+
+from django.conf import settings
+
+from .api import (
+    BULK_LIMIT,
+    JOB_STATUS_FINISHED,
+    SEARCH_LIMIT,
+    build_external_id_query,
+    collect_job_results,
+    get_circuit_breaker,
+    get_rate_limiter,
+)
+from .resilience import (
+    ZendeskUnavailableError,
+    get_retry_delay,
+    is_server_error,
+)
+
+
+def create_session(concurrency=None):
+    if concurrency is None:
+        concurrency = settings.ZENDESK_API_CONCURRENCY
+
+    connector = aiohttp.TCPConnector(
+        limit=concurrency,
+        force_close=not settings.ZENDESK_API_KEEP_ALIVE,
+    )
+    return aiohttp.ClientSession(connector=connector)
+
+
+class ZendeskAPI(object):
+    # The same endpoints as zendesk.api, for use inside an event loop. All
+    # clients sharing a semaphore share its limit of requests in flight.
+    def __init__(
+        self,
+        session,
+        semaphore=None,
+        rate_limiter=None,
+        circuit_breaker=None
+    ):
+        self.zendesk_api_url = settings.ZENDESK_API_URL
+        self.auth = aiohttp.BasicAuth(
+            settings.ZENDESK_API_USER,
+            settings.ZENDESK_API_TOKEN
+        )
+        self.headers = {'content-type': 'application/json'}
+        self.timeout = aiohttp.ClientTimeout(
+            sock_connect=settings.ZENDESK_API_CONNECT_TIMEOUT,
+            sock_read=settings.ZENDESK_API_READ_TIMEOUT,
+        )
+        self.session = session
+        self.semaphore = semaphore or asyncio.Semaphore(
+            settings.ZENDESK_API_CONCURRENCY
+        )
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.circuit_breaker = circuit_breaker or get_circuit_breaker()
+
+    async def request(self, method, url, idempotent=None, **kwargs):
+        for attempt in itertools.count():
+            self.circuit_breaker.before_request()
+
+            try:
+                async with self.semaphore:
+                    await self.wait_for_token()
+                    async with self.session.request(
+                        method,
+                        url,
+                        auth=self.auth,
+                        headers=self.headers,
+                        timeout=self.timeout,
+                        **kwargs
+                    ) as response:
+                        status = response.status
+                        headers = response.headers
+                        result = await read_json(response)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.circuit_breaker.record_failure()
+                delay = get_retry_delay(
+                    attempt,
+                    method,
+                    idempotent,
+                    connect_failed=isinstance(e, aiohttp.ClientConnectorError)
+                )
+                if delay is None:
+                    raise ZendeskUnavailableError(
+                        f'{method} {url} failed: {e!r}'
+                    ) from e
+
+                await asyncio.sleep(delay)
+                continue
+
+            self.rate_limiter.update(headers)
+            self.circuit_breaker.record_status(status)
+            delay = get_retry_delay(
+                attempt,
+                method,
+                idempotent,
+                status=status,
+                headers=headers
+            )
+            if delay is None:
+                break
+
+            if delay:
+                await asyncio.sleep(delay)
+
+        if is_server_error(status):
+            raise ZendeskUnavailableError(
+                f'{method} {url} failed: HTTP {status}'
+            )
+
+        if not isinstance(result, dict):
+            return {
+                'error': f'HTTP {status}',
+                'description': 'Zendesk did not return a JSON object',
+            }
+
+        return result
+
+    async def wait_for_token(self):
+        # Only requests holding the semaphore take a token, so the ones
+        # queued behind it do not run the budget down. Reserving is a short
+        # lock (a row lock for the database bucket), so it is done inline
+        # and only the wait is awaited.
+        wait = self.rate_limiter.reserve()
+        if wait <= 0:
+            return
+
+        try:
+            await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            self.rate_limiter.release()
+            raise
+
+
+async def read_json(response):
+    try:
+        return await response.json(content_type=None)
+    except ValueError:
+        return None
+
+
+class JobStatus(ZendeskAPI):
+    async def show(self, job_id):
+        url = self.zendesk_api_url + f'/api/v2/job_statuses/{job_id}.json'
+        return await self.request('GET', url)
+
+    async def wait(self, job_id):
+        deadline = time.monotonic() + settings.ZENDESK_JOB_STATUS_TIMEOUT
+        while True:
+            job_status = (await self.show(job_id)).get('job_status', {})
+            if job_status.get('status') in JOB_STATUS_FINISHED:
+                return job_status
+
+            if time.monotonic() >= deadline:
+                return dict(
+                    job_status,
+                    message=f'Job {job_id} did not finish in time'
+                )
+
+            await asyncio.sleep(settings.ZENDESK_JOB_STATUS_POLL_INTERVAL)
+
+
+class Ticket(ZendeskAPI):
+    async def create(self, data):
+        url = self.zendesk_api_url + '/api/v2/tickets.json'
+        return await self.request('POST', url, json=data)
+
+    async def create_many(self, tickets):
+        url = self.zendesk_api_url + '/api/v2/tickets/create_many.json'
+        return await self.run_jobs('POST', url, tickets)
+
+    async def update_many(self, tickets):
+        url = self.zendesk_api_url + '/api/v2/tickets/update_many.json'
+        return await self.run_jobs('PUT', url, tickets)
+
+    async def add_comments(self, tickets):
+        # Each ticket gets its comment again if the job is sent twice, so
+        # it is only retried when Zendesk did not take it.
+        url = self.zendesk_api_url + '/api/v2/tickets/update_many.json'
+        return await self.run_jobs('PUT', url, tickets, idempotent=False)
+
+    async def run_jobs(self, method, url, tickets, idempotent=None):
+        batches = [
+            (offset, tickets[offset:offset + BULK_LIMIT])
+            for offset in range(0, len(tickets), BULK_LIMIT)
+        ]
+        job_results = await asyncio.gather(*[
+            self.run_job(method, url, offset, batch, idempotent)
+            for offset, batch in batches
+        ])
+
+        return [result for results in job_results for result in results]
+
+    async def run_job(self, method, url, offset, batch, idempotent=None):
+        result = await self.request(
+            method,
+            url,
+            idempotent=idempotent,
+            json={'tickets': batch}
+        )
+
+        job_status = result.get('job_status')
+        if job_status:
+            zendesk_job_status = JobStatus(
+                self.session,
+                semaphore=self.semaphore,
+                rate_limiter=self.rate_limiter
+            )
+            job_status = await zendesk_job_status.wait(job_status['id'])
+        else:
+            job_status = {
+                'status': result.get('error'),
+                'message': result.get('description'),
+            }
+
+        return collect_job_results(job_status, offset, batch)
+
+    async def search_by_external_ids(self, external_ids):
+        url = self.zendesk_api_url + '/api/v2/search.json'
+
+        tickets = []
+        for offset in range(0, len(external_ids), SEARCH_LIMIT):
+            batch = external_ids[offset:offset + SEARCH_LIMIT]
+            page_url = url
+            params = {'query': build_external_id_query(batch)}
+            while page_url:
+                result = await self.request('GET', page_url, params=params)
+                tickets.extend(result.get('results') or [])
+                page_url = result.get('next_page')
+                params = None
+
+        return tickets
+
+    async def create_comment(self, data, ticket_id):
+        url = self.zendesk_api_url + f'/api/v2/tickets/{ticket_id}.json'
+        return await self.request('PUT', url, idempotent=False, json=data)
+
+
+class User(ZendeskAPI):
+    async def search(self, query, include=None):
+        url = self.zendesk_api_url + '/api/v2/users/search.json'
+        payload = {
+            'query': query
+        }
+        if include:
+            payload['include'] = include
+        return await self.request('GET', url, params=payload)
+
+
+class Organization(ZendeskAPI):
+    async def show(self, organization_id):
+        url = self.zendesk_api_url + \
+            f'/api/v2/organizations/{organization_id}.json'
+        return await self.request('GET', url)
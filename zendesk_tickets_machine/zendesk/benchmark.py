@@ -0,0 +1,43 @@
+from agents.models import Agent
+from agent_groups.models import AgentGroup
+from boards.models import Board
+from tickets.models import Ticket
+
+from .rate_limit import RateLimiter
+
+
+# Shared by the benchmark commands that run against FakeZendeskServer.
+
+
+def create_unlimited_rate_limiter():
+    # The fake server has no rate limit, so do not pace the requests.
+    return RateLimiter(limit=10 ** 6)
+
+
+def create_benchmark_board(name, tickets, requesters=None):
+    # A board of pending tickets, each requester on tickets / requesters of
+    # them, one ticket each by default.
+    requesters = requesters or tickets
+    board = Board.objects.create(name=name)
+    agent = Agent.objects.create(name='Benchmark', zendesk_user_id='1')
+    agent_group = AgentGroup.objects.create(
+        name='Benchmark',
+        zendesk_group_id='1'
+    )
+    Ticket.objects.bulk_create([
+        Ticket(
+            subject=f'Ticket {number}',
+            comment=f'Comment {number}',
+            requester=f'client{number % requesters}@hisotech.com',
+            assignee=agent,
+            group=agent_group,
+            ticket_type='question',
+            priority='normal',
+            tags='benchmark',
+            private_comment='Private comment',
+            board=board
+        )
+        for number in range(tickets)
+    ])
+
+    return board
@@ -0,0 +1,479 @@
+import itertools
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+
+BULK_LIMIT = 100
+SEARCH_PAGE_SIZE = 100
+RATE_LIMIT_PERIOD = 60
+EXTERNAL_ID_PATTERN = re.compile(r'external_id:"([^"]*)"')
+
+# (method, path, handler) for each endpoint zendesk.api uses. Handlers
+# take the query parameters, the JSON body and the groups of the path.
+ROUTES = [
+    (method, re.compile(path), handler)
+    for method, path, handler in (
+        ('GET', r'/api/v2/users/search\.json', 'search_users'),
+        (
+            'GET',
+            r'/api/v2/organizations/(?P<organization_id>\d+)\.json',
+            'show_organization'
+        ),
+        ('GET', r'/api/v2/search\.json', 'search'),
+        (
+            'GET',
+            r'/api/v2/job_statuses/(?P<job_id>\w+)\.json',
+            'show_job_status'
+        ),
+        ('GET', r'/api/v2/tickets/(?P<ticket_id>\d+)\.json', 'show_ticket'),
+        ('POST', r'/api/v2/tickets\.json', 'create_ticket'),
+        ('POST', r'/api/v2/tickets/create_many\.json', 'create_many'),
+        ('PUT', r'/api/v2/tickets/update_many\.json', 'update_many'),
+        ('PUT', r'/api/v2/tickets/(?P<ticket_id>\d+)\.json', 'update_ticket'),
+    )
+]
+
+
+class FakeZendeskRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super(FakeZendeskRequestHandler, self).setup()
+        self.server.count_connection()
+
+    def do_GET(self):
+        self.handle_request('GET')
+
+    def do_POST(self):
+        self.handle_request('POST')
+
+    def do_PUT(self):
+        self.handle_request('PUT')
+
+    def handle_request(self, method):
+        url = urlsplit(self.path)
+        params = {
+            key: values[-1]
+            for key, values in parse_qs(url.query).items()
+        }
+        # Always read the body, or it is left on a kept-alive connection.
+        data = self.read_body()
+
+        status, result, headers = self.server.dispatch(
+            method,
+            url.path,
+            params,
+            data
+        )
+        self.respond(result, status, headers)
+
+    def read_body(self):
+        length = int(self.headers.get('Content-Length', 0))
+        if not length:
+            return {}
+
+        try:
+            return json.loads(self.rfile.read(length).decode('utf-8'))
+        except ValueError:
+            return {}
+
+    def respond(self, data, status=200, headers=None):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, str(value))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeZendeskServer(ThreadingMixIn, HTTPServer):
+    # A local stand-in for the parts of the Zendesk API this project uses.
+    # Tickets, users and jobs are kept in memory, so reconciling by
+    # external_id and commenting on created tickets work like the real
+    # thing. `rate_limit` is requests per minute, answered with 429 and
+    # Retry-After once used up, and `error_rate` is the share of requests
+    # answered with one of `error_statuses`.
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(
+        self,
+        host='127.0.0.1',
+        port=0,
+        latency=0,
+        rate_limit=None,
+        error_rate=0,
+        error_statuses=(500, 503),
+        organizations=1,
+        job_polls=0,
+        seed=None
+    ):
+        super(FakeZendeskServer, self).__init__(
+            (host, port),
+            FakeZendeskRequestHandler
+        )
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses
+        self.organization_count = organizations
+        self.job_polls = job_polls
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.reset()
+
+    @property
+    def url(self):
+        host, port = self.server_address
+        return f'http://{host}:{port}'
+
+    def reset(self):
+        with self.lock:
+            self.connections = 0
+            self.requests = 0
+            self.failures = deque()
+            self.window_started = time.monotonic()
+            self.window_requests = 0
+            self.tickets = {}
+            self.comments = {}
+            self.users = {}
+            self.organizations = {
+                organization_id: {
+                    'id': organization_id,
+                    'name': f'Organization {organization_id}',
+                }
+                for organization_id in range(1, self.organization_count + 1)
+            }
+            self.job_statuses = {}
+            self.ticket_ids = itertools.count(1)
+            self.user_ids = itertools.count(1)
+            self.job_ids = itertools.count(1)
+
+    def reset_counters(self):
+        with self.lock:
+            self.connections = 0
+            self.requests = 0
+
+    def count_connection(self):
+        with self.lock:
+            self.connections += 1
+
+    def fail_next(self, status, count=1):
+        # Answer the next `count` requests with `status`, before routing.
+        with self.lock:
+            self.failures.extend([status] * count)
+
+    def dispatch(self, method, path, params, data):
+        with self.lock:
+            self.requests += 1
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        headers = {}
+        with self.lock:
+            if self.rate_limit:
+                retry_after = self.take_rate_limit(headers)
+                if retry_after is not None:
+                    headers['Retry-After'] = retry_after
+                    return 429, {
+                        'error': 'TooManyRequests',
+                        'description': 'Rate limit exceeded',
+                    }, headers
+
+            status = self.take_failure()
+            if status is not None:
+                if status == 429:
+                    headers['Retry-After'] = 1
+                return status, {
+                    'error': f'HTTP {status}',
+                    'description': 'Injected failure',
+                }, headers
+
+        for route_method, pattern, handler in ROUTES:
+            match = pattern.fullmatch(path)
+            if route_method == method and match:
+                status, result = getattr(self, handler)(
+                    params,
+                    data,
+                    **match.groupdict()
+                )
+                return status, result, headers
+
+        return 404, {'error': 'InvalidEndpoint'}, headers
+
+    def take_rate_limit(self, headers):
+        now = time.monotonic()
+        if now - self.window_started >= RATE_LIMIT_PERIOD:
+            self.window_started = now
+            self.window_requests = 0
+
+        self.window_requests += 1
+        headers['X-Rate-Limit'] = self.rate_limit
+        headers['X-Rate-Limit-Remaining'] = max(
+            self.rate_limit - self.window_requests,
+            0
+        )
+        if self.window_requests > self.rate_limit:
+            return math.ceil(self.window_started + RATE_LIMIT_PERIOD - now)
+
+        return None
+
+    def take_failure(self):
+        if self.failures:
+            return self.failures.popleft()
+
+        if self.error_rate and self.random.random() < self.error_rate:
+            return self.random.choice(self.error_statuses)
+
+        return None
+
+    def add_user(self, email, organization_id=None):
+        with self.lock:
+            return self.add_user_locked(email, organization_id)
+
+    def add_user_locked(self, email, organization_id=None):
+        user_id = next(self.user_ids)
+        if organization_id is None and self.organization_count:
+            organization_id = (user_id - 1) % self.organization_count + 1
+
+        user = {
+            'id': user_id,
+            'email': email,
+            'organization_id': organization_id,
+        }
+        self.users[email] = user
+        return user
+
+    def search_users(self, params, data):
+        # Every email is a known user, so requester lookups always succeed.
+        query = params.get('query', '')
+        with self.lock:
+            user = self.users.get(query)
+            if user is None and '@' in query:
+                user = self.add_user_locked(query)
+
+            users = [user] if user else []
+            result = {'users': users}
+            if params.get('include') == 'organizations':
+                result['organizations'] = [
+                    self.organizations[each['organization_id']]
+                    for each in users
+                    if each['organization_id'] in self.organizations
+                ]
+
+        return 200, result
+
+    def show_organization(self, params, data, organization_id):
+        organization = self.organizations.get(int(organization_id))
+        if organization is None:
+            return 404, {
+                'error': 'RecordNotFound',
+                'description': 'Not found',
+            }
+
+        return 200, {'organization': organization}
+
+    def search(self, params, data):
+        query = params.get('query', '')
+        external_ids = set(EXTERNAL_ID_PATTERN.findall(query))
+        with self.lock:
+            matches = [
+                dict(each, result_type='ticket')
+                for each in self.tickets.values()
+                if each.get('external_id') in external_ids
+            ]
+
+        page = int(params.get('page', 1))
+        start = (page - 1) * SEARCH_PAGE_SIZE
+        next_page = None
+        if start + SEARCH_PAGE_SIZE < len(matches):
+            next_page = self.url + '/api/v2/search.json?' + urlencode({
+                'query': query,
+                'page': page + 1,
+            })
+
+        return 200, {
+            'results': matches[start:start + SEARCH_PAGE_SIZE],
+            'next_page': next_page,
+            'count': len(matches),
+        }
+
+    def show_ticket(self, params, data, ticket_id):
+        with self.lock:
+            ticket = self.tickets.get(int(ticket_id))
+            ticket = ticket and dict(ticket)
+
+        if ticket is None:
+            return 404, {
+                'error': 'RecordNotFound',
+                'description': 'Not found',
+            }
+
+        return 200, {'ticket': ticket}
+
+    def create_ticket(self, params, data):
+        with self.lock:
+            ticket = self.create_ticket_locked(data.get('ticket') or {})
+
+        return 201, {'ticket': ticket}
+
+    def update_ticket(self, params, data, ticket_id):
+        with self.lock:
+            ticket = self.update_ticket_locked(
+                int(ticket_id),
+                data.get('ticket') or {}
+            )
+
+        if ticket is None:
+            return 404, {
+                'error': 'RecordNotFound',
+                'description': 'Not found',
+            }
+
+        return 200, {'ticket': ticket}
+
+    def create_many(self, params, data):
+        tickets = data.get('tickets') or []
+        if len(tickets) > BULK_LIMIT:
+            return 400, self.build_too_many_error()
+
+        with self.lock:
+            results = [
+                {
+                    'index': index,
+                    'id': self.create_ticket_locked(each)['id'],
+                    'action': 'create',
+                    'status': 'Created',
+                    'success': True,
+                }
+                for index, each in enumerate(tickets)
+            ]
+            job_status = self.create_job_status_locked(results)
+
+        return 200, {'job_status': job_status}
+
+    def update_many(self, params, data):
+        tickets = data.get('tickets') or []
+        if len(tickets) > BULK_LIMIT:
+            return 400, self.build_too_many_error()
+
+        # Like Zendesk, results tell the ticket by its id only, and not
+        # in the order of the request.
+        with self.lock:
+            results = []
+            for each in tickets:
+                values = dict(each)
+                ticket_id = parse_id(values.pop('id', None))
+                if self.update_ticket_locked(ticket_id, values) is None:
+                    results.append({
+                        'id': ticket_id,
+                        'action': 'update',
+                        'status': 'Failed',
+                        'success': False,
+                        'error': 'TicketNotFound',
+                        'details': f'Ticket {ticket_id} not found',
+                    })
+                else:
+                    results.append({
+                        'id': ticket_id,
+                        'action': 'update',
+                        'status': 'Updated',
+                        'success': True,
+                    })
+            results.reverse()
+            job_status = self.create_job_status_locked(results)
+
+        return 200, {'job_status': job_status}
+
+    def show_job_status(self, params, data, job_id):
+        with self.lock:
+            job = self.job_statuses.get(job_id)
+            if job is None:
+                return 404, {
+                    'error': 'RecordNotFound',
+                    'description': 'Not found',
+                }
+
+            # A job reports `working` for its first `job_polls` polls.
+            if job['polls'] < self.job_polls:
+                job['polls'] += 1
+                job_status = {'id': job_id, 'status': 'working'}
+            else:
+                job_status = {
+                    'id': job_id,
+                    'status': 'completed',
+                    'total': len(job['results']),
+                    'progress': len(job['results']),
+                    'results': job['results'],
+                }
+
+        return 200, {'job_status': job_status}
+
+    def create_job_status(self, results):
+        with self.lock:
+            return self.create_job_status_locked(results)
+
+    def create_job_status_locked(self, results):
+        job_id = f'job{next(self.job_ids)}'
+        self.job_statuses[job_id] = {'polls': 0, 'results': results}
+        return {'id': job_id, 'status': 'queued'}
+
+    def create_ticket_locked(self, values):
+        values = dict(values)
+        comment = values.pop('comment', None)
+
+        ticket = dict(values, id=next(self.ticket_ids), status='new')
+        self.tickets[ticket['id']] = ticket
+        self.comments[ticket['id']] = [comment] if comment else []
+        return dict(ticket)
+
+    def update_ticket_locked(self, ticket_id, values):
+        ticket = self.tickets.get(ticket_id)
+        if ticket is None:
+            return None
+
+        values = dict(values)
+        comment = values.pop('comment', None)
+        ticket.update(values)
+        if comment:
+            self.comments[ticket_id].append(comment)
+        return dict(ticket)
+
+    def build_too_many_error(self):
+        return {
+            'error': 'InvalidValue',
+            'description': f'At most {BULK_LIMIT} tickets per request',
+        }
+
+    def start(self):
+        thread = threading.Thread(target=self.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def parse_id(value):
+    # Ticket ids come as numbers or strings, like Zendesk accepts them.
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return value
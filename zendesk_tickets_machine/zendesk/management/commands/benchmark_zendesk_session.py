@@ -0,0 +1,64 @@
+import time
+
+import requests
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from zendesk.api import (
+    Organization,
+    Ticket,
+    User,
+    create_session,
+)
+from zendesk.benchmark import create_unlimited_rate_limiter
+from zendesk.fake import FakeZendeskServer
+
+
+class Command(BaseCommand):
+    help = 'Compare per-call requests with the pooled Zendesk session ' \
+        'against a local fake Zendesk server'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tickets',
+            type=int,
+            default=100,
+            help='Number of tickets to simulate (4 API calls each)'
+        )
+
+    def handle(self, *args, **options):
+        server = FakeZendeskServer().start()
+        try:
+            with override_settings(ZENDESK_API_URL=server.url):
+                for mode, session in (
+                    ('per-call', requests),
+                    ('pooled', create_session()),
+                ):
+                    server.reset_counters()
+                    started = time.perf_counter()
+                    self.simulate(session, options['tickets'])
+                    elapsed = time.perf_counter() - started
+
+                    self.stdout.write(
+                        f'{mode}: {server.requests} requests, '
+                        f'{server.connections} connections, '
+                        f'{elapsed:.3f}s'
+                    )
+        finally:
+            server.stop()
+
+    def simulate(self, session, tickets):
+        rate_limiter = create_unlimited_rate_limiter()
+        zendesk_ticket = Ticket(session=session, rate_limiter=rate_limiter)
+        zendesk_user = User(session=session, rate_limiter=rate_limiter)
+        zendesk_organization = Organization(
+            session=session,
+            rate_limiter=rate_limiter
+        )
+
+        for _ in range(tickets):
+            zendesk_user.search('client@hisotech.com')
+            zendesk_organization.show(1)
+            zendesk_ticket.create({'ticket': {}})
+            zendesk_ticket.create_comment({'ticket': {}}, 1)
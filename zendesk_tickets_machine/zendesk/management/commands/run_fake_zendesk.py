@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand
+
+from zendesk.fake import FakeZendeskServer
+
+
+class Command(BaseCommand):
+    help = 'Serve a local fake Zendesk API for load testing, point ' \
+        'ZENDESK_API_URL at it'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument(
+            '--latency',
+            type=float,
+            default=0,
+            help='Seconds to wait before each response'
+        )
+        parser.add_argument(
+            '--rate-limit',
+            type=int,
+            default=None,
+            help='Requests per minute before answering with 429'
+        )
+        parser.add_argument(
+            '--error-rate',
+            type=float,
+            default=0,
+            help='Share of requests answered with a 500 or 503'
+        )
+        parser.add_argument(
+            '--organizations',
+            type=int,
+            default=1,
+            help='Number of organizations users are spread across'
+        )
+        parser.add_argument(
+            '--job-polls',
+            type=int,
+            default=0,
+            help='Polls a bulk job reports as working before completing'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=None,
+            help='Seed for the injected errors'
+        )
+
+    def handle(self, *args, **options):
+        server = FakeZendeskServer(
+            host=options['host'],
+            port=options['port'],
+            latency=options['latency'],
+            rate_limit=options['rate_limit'],
+            error_rate=options['error_rate'],
+            organizations=options['organizations'],
+            job_polls=options['job_polls'],
+            seed=options['seed']
+        )
+        self.stdout.write(f'Fake Zendesk API listening on {server.url}')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stdout.write(
+                f'{server.requests} requests, {len(server.tickets)} tickets'
+            )
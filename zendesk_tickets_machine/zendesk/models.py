@@ -0,0 +1,12 @@
+from django.db import models
+
+
+class RateLimitBucket(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    capacity = models.FloatField()
+    tokens = models.FloatField()
+    updated = models.FloatField()
+    blocked_until = models.FloatField(default=0)
+
+    def __str__(self):
+        return self.name
@@ -0,0 +1,125 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import RateLimitBucket
+
+
+class Bucket(object):
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.time()
+        self.blocked_until = 0
+
+
+class RateLimiter(object):
+    # Token bucket holding the requests we can still send in the current
+    # window. It is corrected from the rate limit headers of every response,
+    # so requests only wait once Zendesk says the budget is running out.
+    def __init__(self, limit=None, period=60):
+        if limit is None:
+            limit = settings.ZENDESK_API_RATE_LIMIT
+
+        self.limit = limit
+        self.period = period
+        self.lock = threading.Lock()
+        self.bucket = Bucket(limit)
+
+    @contextmanager
+    def locked_bucket(self):
+        with self.lock:
+            yield self.bucket
+
+    def refill(self, bucket, now):
+        elapsed = max(now - bucket.updated, 0)
+        bucket.tokens = min(
+            bucket.capacity,
+            bucket.tokens + elapsed * bucket.capacity / self.period
+        )
+        bucket.updated = now
+
+    def reserve(self):
+        with self.locked_bucket() as bucket:
+            now = time.time()
+            self.refill(bucket, now)
+            bucket.tokens -= 1
+
+            wait = max(bucket.blocked_until - now, 0)
+            if bucket.tokens < 0:
+                wait = max(
+                    wait,
+                    -bucket.tokens * self.period / bucket.capacity
+                )
+
+            return wait
+
+    def release(self):
+        # Gives back the token of a request that was never sent.
+        with self.locked_bucket() as bucket:
+            bucket.tokens = min(bucket.capacity, bucket.tokens + 1)
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def update(self, headers):
+        limit = parse_header(headers, 'X-Rate-Limit')
+        remaining = parse_header(headers, 'X-Rate-Limit-Remaining')
+        retry_after = parse_header(headers, 'Retry-After')
+        if limit is None and remaining is None and retry_after is None:
+            return
+
+        with self.locked_bucket() as bucket:
+            now = time.time()
+            self.refill(bucket, now)
+
+            if limit:
+                bucket.capacity = limit
+            if remaining is not None:
+                bucket.tokens = min(bucket.tokens, remaining)
+            if retry_after is not None:
+                bucket.tokens = min(bucket.tokens, 0)
+                bucket.blocked_until = max(
+                    bucket.blocked_until,
+                    now + retry_after
+                )
+
+
+class DatabaseRateLimiter(RateLimiter):
+    # Keeps the bucket in a row locked with SELECT ... FOR UPDATE, so all
+    # uWSGI processes take from the same account-wide budget and concurrent
+    # runs queue up for it instead of tripping 429s for everyone.
+    def __init__(self, name='zendesk', limit=None, period=60):
+        super(DatabaseRateLimiter, self).__init__(limit, period)
+        self.name = name
+
+    @contextmanager
+    def locked_bucket(self):
+        with transaction.atomic():
+            bucket, _ = RateLimitBucket.objects.select_for_update(
+            ).get_or_create(
+                name=self.name,
+                defaults={
+                    'capacity': self.limit,
+                    'tokens': self.limit,
+                    'updated': time.time(),
+                }
+            )
+            yield bucket
+            bucket.save()
+
+
+def parse_header(headers, name):
+    value = headers.get(name)
+    if not isinstance(value, str):
+        return None
+
+    try:
+        return float(value)
+    except ValueError:
+        return None
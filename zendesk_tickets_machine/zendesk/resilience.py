@@ -0,0 +1,133 @@
+import random
+import threading
+import time
+
+from django.conf import settings
+
+
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+RETRY_STATUSES = (429, 503)
+SERVER_ERROR_STATUSES = range(500, 600)
+
+
+class ZendeskAPIError(Exception):
+    pass
+
+
+class ZendeskUnavailableError(ZendeskAPIError):
+    pass
+
+
+class CircuitOpenError(ZendeskUnavailableError):
+    pass
+
+
+def is_server_error(status):
+    return status in SERVER_ERROR_STATUSES
+
+
+def is_idempotent(method, idempotent=None):
+    # A PUT adding a comment adds it again when sent twice, so callers can
+    # tell that a request is not safe to repeat whatever its method.
+    if idempotent is None:
+        return method in IDEMPOTENT_METHODS
+
+    return idempotent
+
+
+def should_retry_status(method, status, idempotent=None):
+    # 429 and 503 mean Zendesk did not handle the request, so even a POST
+    # can be sent again. Other server errors may have created something.
+    if status in RETRY_STATUSES:
+        return True
+
+    return is_idempotent(method, idempotent) and is_server_error(status)
+
+
+def get_retry_delay(
+    attempt,
+    method,
+    idempotent=None,
+    status=None,
+    headers=None,
+    connect_failed=False
+):
+    # Seconds to wait before sending a request again, or None when it is
+    # not sent again. zendesk.api and zendesk.async_api both decide with
+    # it, `status` is None when no response came back.
+    if attempt >= settings.ZENDESK_API_RETRIES:
+        return None
+
+    if status is None:
+        # A request that failed while connecting was never sent, any other
+        # failure may have reached Zendesk.
+        if not (connect_failed or is_idempotent(method, idempotent)):
+            return None
+    elif not should_retry_status(method, status, idempotent):
+        return None
+    elif 'Retry-After' in (headers or {}):
+        # The rate limiter already waits for Retry-After, so only back off
+        # when Zendesk did not say how long to wait.
+        return 0
+
+    return get_backoff(attempt)
+
+
+def get_backoff(attempt):
+    # Exponential backoff with full jitter, so clients retrying after the
+    # same outage do not all come back at the same moment.
+    delay = min(
+        settings.ZENDESK_API_BACKOFF_MAX,
+        settings.ZENDESK_API_BACKOFF_BASE * 2 ** attempt
+    )
+    return random.uniform(0, delay)
+
+
+class CircuitBreaker(object):
+    # Opens after `threshold` failures in a row and then rejects requests
+    # right away for `reset_timeout` seconds. After that one request is let
+    # through, and its outcome closes the circuit or opens it again.
+    def __init__(self, threshold=None, reset_timeout=None):
+        if threshold is None:
+            threshold = settings.ZENDESK_API_CIRCUIT_BREAKER_THRESHOLD
+        if reset_timeout is None:
+            reset_timeout = settings.ZENDESK_API_CIRCUIT_BREAKER_TIMEOUT
+
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+
+    def before_request(self):
+        with self.lock:
+            if self.opened_at is None:
+                return
+
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                raise CircuitOpenError(
+                    'Zendesk API is unavailable, '
+                    f'not sending requests for {self.reset_timeout}s'
+                )
+
+            # Let this request through as the trial, and keep rejecting the
+            # others until it has succeeded.
+            self.opened_at = time.monotonic()
+
+    def record_status(self, status):
+        # A 429 only says the requests go too fast, Zendesk itself is fine.
+        if is_server_error(status):
+            self.record_failure()
+        elif status != 429:
+            self.record_success()
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
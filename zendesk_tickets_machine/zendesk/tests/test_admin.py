@@ -0,0 +1,31 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from ..models import RateLimitBucket
+
+
+class RateLimitBucketAdminTest(TestCase):
+    def setUp(self):
+        User.objects.create_superuser('admin', 'admin@pronto.com', 'admin')
+        self.client.login(username='admin', password='admin')
+
+        self.url = '/admin/zendesk/ratelimitbucket/'
+
+    def test_access_rate_limit_bucket_admin_should_have_columns(self):
+        RateLimitBucket.objects.create(
+            name='zendesk',
+            capacity=700,
+            tokens=650,
+            updated=0
+        )
+
+        response = self.client.get(self.url)
+
+        expected = '<div class="text"><a href="?o=1">Name</a></div>'
+        self.assertContains(response, expected, count=1, status_code=200)
+
+        expected = '<div class="text"><a href="?o=2">Capacity</a></div>'
+        self.assertContains(response, expected, count=1, status_code=200)
+
+        expected = '<div class="text"><a href="?o=3">Tokens</a></div>'
+        self.assertContains(response, expected, count=1, status_code=200)
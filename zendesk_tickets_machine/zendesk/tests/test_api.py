@@ -1,23 +1,315 @@
-from unittest.mock import patch
+from unittest.mock import MagicMock, call, patch
+
+import requests
 
 from django.conf import settings
 from django.test import TestCase
+from django.test.utils import override_settings
 
 from ..api import (
+    JobStatus,
     Organization,
     Ticket,
     User,
+    create_rate_limiter,
+    create_session,
+    get_rate_limiter,
+    get_session,
+)
+from ..rate_limit import DatabaseRateLimiter, RateLimiter
+from ..resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ZendeskUnavailableError,
 )
 
 
+class SessionTest(TestCase):
+    def test_get_session_should_return_same_session_in_same_process(self):
+        self.assertIs(get_session(), get_session())
+
+    @patch('zendesk.api.os.getpid')
+    def test_get_session_should_create_new_session_in_forked_process(
+        self,
+        mock
+    ):
+        mock.return_value = 1
+        session = get_session()
+
+        mock.return_value = 2
+
+        self.assertIsNot(get_session(), session)
+
+    def test_api_clients_should_share_session(self):
+        self.assertIs(Ticket().session, User().session)
+        self.assertIs(User().session, Organization().session)
+
+    def test_api_clients_should_share_rate_limiter(self):
+        self.assertIs(Ticket().rate_limiter, get_rate_limiter())
+        self.assertIs(User().rate_limiter, Organization().rate_limiter)
+
+    @override_settings(ZENDESK_API_RATE_LIMITER='database')
+    def test_create_rate_limiter_should_share_budget_through_database(self):
+        self.assertIsInstance(create_rate_limiter(), DatabaseRateLimiter)
+
+    @override_settings(ZENDESK_API_RATE_LIMITER='local')
+    def test_create_rate_limiter_should_keep_budget_in_process_if_local(
+        self
+    ):
+        rate_limiter = create_rate_limiter()
+
+        self.assertIsInstance(rate_limiter, RateLimiter)
+        self.assertNotIsInstance(rate_limiter, DatabaseRateLimiter)
+
+    @patch('zendesk.api.get_session')
+    def test_request_should_go_through_rate_limiter(self, mock):
+        response = mock.return_value.request.return_value
+        response.status_code = 200
+        response.headers = {'X-Rate-Limit-Remaining': '10'}
+
+        with patch('zendesk.api.get_rate_limiter') as mock_rate_limiter:
+            User().search('kan@prontomarketing.com')
+
+        rate_limiter = mock_rate_limiter.return_value
+        rate_limiter.acquire.assert_called_once_with()
+        rate_limiter.update.assert_called_once_with(response.headers)
+
+    @override_settings(ZENDESK_API_RETRIES=2)
+    @patch('zendesk.api.time.sleep')
+    @patch('zendesk.api.get_rate_limiter')
+    @patch('zendesk.api.get_session')
+    def test_request_should_retry_when_rate_limited(self, mock, _, __):
+        limited = MagicMock(status_code=429)
+        succeeded = MagicMock(status_code=200)
+        succeeded.json.return_value = {'users': []}
+        mock.return_value.request.side_effect = [limited, succeeded]
+
+        result = User().search('kan@prontomarketing.com')
+
+        self.assertEqual(result, {'users': []})
+        self.assertEqual(mock.return_value.request.call_count, 2)
+
+    @override_settings(ZENDESK_API_RETRIES=2)
+    @patch('zendesk.api.time.sleep')
+    @patch('zendesk.api.get_rate_limiter')
+    @patch('zendesk.api.get_session')
+    def test_request_should_give_up_after_rate_limit_retries(
+        self,
+        mock,
+        _,
+        __
+    ):
+        limited = MagicMock(status_code=429)
+        limited.json.return_value = {'error': 'TooManyRequests'}
+        mock.return_value.request.return_value = limited
+
+        result = User().search('kan@prontomarketing.com')
+
+        self.assertEqual(result, {'error': 'TooManyRequests'})
+        self.assertEqual(mock.return_value.request.call_count, 3)
+
+    @override_settings(ZENDESK_API_POOL_SIZE=25)
+    def test_create_session_should_use_pool_size_from_settings(self):
+        session = create_session()
+
+        adapter = session.get_adapter('https://pronto.zendesk.com')
+        self.assertEqual(adapter._pool_maxsize, 25)
+
+    @override_settings(ZENDESK_API_KEEP_ALIVE=False)
+    def test_create_session_should_close_connection_if_no_keep_alive(self):
+        session = create_session()
+
+        self.assertEqual(session.headers['Connection'], 'close')
+
+
+@override_settings(ZENDESK_API_RETRIES=2)
+@patch('zendesk.api.time.sleep')
+class RequestRetryTest(TestCase):
+    def setUp(self):
+        self.session = MagicMock()
+        self.circuit_breaker = CircuitBreaker(threshold=10)
+
+    def build_client(self, client_class):
+        return client_class(
+            session=self.session,
+            rate_limiter=MagicMock(),
+            circuit_breaker=self.circuit_breaker
+        )
+
+    def build_response(self, status_code, json=None, headers=None):
+        response = MagicMock(status_code=status_code, headers=headers or {})
+        response.json.return_value = json
+        return response
+
+    def test_get_should_be_retried_after_server_error(self, mock_sleep):
+        self.session.request.side_effect = [
+            self.build_response(502),
+            self.build_response(200, {'users': []}),
+        ]
+
+        result = self.build_client(User).search('kan@prontomarketing.com')
+
+        self.assertEqual(result, {'users': []})
+        self.assertEqual(self.session.request.call_count, 2)
+        self.assertEqual(mock_sleep.call_count, 1)
+
+    def test_get_should_raise_after_retries_on_server_errors(self, _):
+        self.session.request.return_value = self.build_response(500)
+
+        with self.assertRaises(ZendeskUnavailableError):
+            self.build_client(User).search('kan@prontomarketing.com')
+
+        self.assertEqual(self.session.request.call_count, 3)
+
+    def test_get_should_be_retried_after_connection_error(self, _):
+        self.session.request.side_effect = [
+            requests.ConnectionError('Connection reset'),
+            self.build_response(200, {'users': []}),
+        ]
+
+        result = self.build_client(User).search('kan@prontomarketing.com')
+
+        self.assertEqual(result, {'users': []})
+
+    def test_get_should_raise_after_retries_on_timeouts(self, _):
+        self.session.request.side_effect = requests.ReadTimeout('Timed out')
+
+        with self.assertRaises(ZendeskUnavailableError):
+            self.build_client(User).search('kan@prontomarketing.com')
+
+        self.assertEqual(self.session.request.call_count, 3)
+
+    def test_post_should_not_be_retried_after_server_error(self, _):
+        self.session.request.return_value = self.build_response(500)
+
+        with self.assertRaises(ZendeskUnavailableError):
+            self.build_client(Ticket).create({'ticket': {}})
+
+        self.assertEqual(self.session.request.call_count, 1)
+
+    def test_post_should_not_be_retried_after_read_timeout(self, _):
+        self.session.request.side_effect = requests.ReadTimeout('Timed out')
+
+        with self.assertRaises(ZendeskUnavailableError):
+            self.build_client(Ticket).create({'ticket': {}})
+
+        self.assertEqual(self.session.request.call_count, 1)
+
+    def test_post_should_be_retried_after_connect_timeout(self, _):
+        self.session.request.side_effect = [
+            requests.ConnectTimeout('Timed out'),
+            self.build_response(201, {'ticket': {'id': 1}}),
+        ]
+
+        result = self.build_client(Ticket).create({'ticket': {}})
+
+        self.assertEqual(result, {'ticket': {'id': 1}})
+
+    def test_post_should_be_retried_after_service_unavailable(self, _):
+        self.session.request.side_effect = [
+            self.build_response(503, headers={'Retry-After': '1'}),
+            self.build_response(201, {'ticket': {'id': 1}}),
+        ]
+
+        result = self.build_client(Ticket).create({'ticket': {}})
+
+        self.assertEqual(result, {'ticket': {'id': 1}})
+
+    def test_comment_should_not_be_retried_after_server_error(self, _):
+        self.session.request.return_value = self.build_response(500)
+
+        with self.assertRaises(ZendeskUnavailableError):
+            self.build_client(Ticket).create_comment({'ticket': {}}, 1)
+
+        self.assertEqual(self.session.request.call_count, 1)
+
+    def test_comment_should_not_be_retried_after_read_timeout(self, _):
+        self.session.request.side_effect = requests.ReadTimeout('Timed out')
+
+        with self.assertRaises(ZendeskUnavailableError):
+            self.build_client(Ticket).create_comment({'ticket': {}}, 1)
+
+        self.assertEqual(self.session.request.call_count, 1)
+
+    def test_comment_should_be_retried_after_service_unavailable(self, _):
+        self.session.request.side_effect = [
+            self.build_response(503, headers={'Retry-After': '1'}),
+            self.build_response(200, {'ticket': {'id': 1}}),
+        ]
+
+        result = self.build_client(Ticket).create_comment({'ticket': {}}, 1)
+
+        self.assertEqual(result, {'ticket': {'id': 1}})
+
+    def test_comments_in_bulk_should_not_be_retried_after_server_error(
+        self,
+        _
+    ):
+        self.session.request.return_value = self.build_response(500)
+
+        with self.assertRaises(ZendeskUnavailableError):
+            self.build_client(Ticket).add_comments([{'id': 1}])
+
+        self.assertEqual(self.session.request.call_count, 1)
+
+    def test_update_many_should_be_retried_after_server_error(self, _):
+        self.session.request.return_value = self.build_response(500)
+
+        with self.assertRaises(ZendeskUnavailableError):
+            self.build_client(Ticket).update_many([{'id': 1}])
+
+        self.assertEqual(self.session.request.call_count, 3)
+
+    def test_retry_after_should_be_left_to_rate_limiter(self, mock_sleep):
+        self.session.request.side_effect = [
+            self.build_response(429, headers={'Retry-After': '1'}),
+            self.build_response(200, {'users': []}),
+        ]
+
+        self.build_client(User).search('kan@prontomarketing.com')
+
+        self.assertEqual(mock_sleep.call_count, 0)
+
+    def test_response_without_json_object_should_return_error(self, _):
+        response = self.build_response(404)
+        response.json.side_effect = ValueError('No JSON')
+        self.session.request.return_value = response
+
+        result = self.build_client(Organization).show(1)
+
+        self.assertEqual(
+            result,
+            {
+                'error': 'HTTP 404',
+                'description': 'Zendesk did not return a JSON object',
+            }
+        )
+
+    def test_open_circuit_should_fail_without_sending_request(self, _):
+        self.circuit_breaker = CircuitBreaker(threshold=2)
+        self.session.request.return_value = self.build_response(500)
+
+        with self.assertRaises(ZendeskUnavailableError):
+            self.build_client(User).search('kan@prontomarketing.com')
+
+        with self.assertRaises(CircuitOpenError):
+            self.build_client(User).search('kan@prontomarketing.com')
+
+        self.assertEqual(self.session.request.call_count, 2)
+
+
 class TicketAPITest(TestCase):
     def setUp(self):
         self.zendesk_api_url = settings.ZENDESK_API_URL
         self.zendesk_api_user = settings.ZENDESK_API_USER
         self.zendesk_api_token = settings.ZENDESK_API_TOKEN
         self.headers = {'content-type': 'application/json'}
+        self.timeout = (
+            settings.ZENDESK_API_CONNECT_TIMEOUT,
+            settings.ZENDESK_API_READ_TIMEOUT,
+        )
 
-    @patch('zendesk.api.requests.post')
+    @patch('zendesk.api.get_session')
     def test_create_ticket_on_zendesk_should_send_data_to_zendesk_correctly(
         self,
         mock
@@ -38,27 +330,30 @@ class TicketAPITest(TestCase):
         ticket = Ticket()
         ticket.create(data)
 
-        mock.assert_called_once_with(
+        mock.return_value.request.assert_called_once_with(
+            'POST',
             url,
             auth=(self.zendesk_api_user, self.zendesk_api_token),
             headers=self.headers,
+            timeout=self.timeout,
             json=data
         )
 
-    @patch('zendesk.api.requests.post')
+    @patch('zendesk.api.get_session')
     def test_create_ticket_on_zendesk_should_return_json(
         self,
         mock
     ):
         data = {}
-        mock.return_value.json.return_value = {'key': 'value'}
+        response = mock.return_value.request.return_value
+        response.json.return_value = {'key': 'value'}
 
         ticket = Ticket()
         result = ticket.create(data)
 
         self.assertEqual(result, {'key': 'value'})
 
-    @patch('zendesk.api.requests.put')
+    @patch('zendesk.api.get_session')
     def test_create_comment_on_zendesk_should_send_data_to_zendesk_correctly(
         self,
         mock
@@ -77,57 +372,426 @@ class TicketAPITest(TestCase):
         ticket = Ticket()
         ticket.create_comment(data, 1)
 
-        mock.assert_called_once_with(
+        mock.return_value.request.assert_called_once_with(
+            'PUT',
             url,
             auth=(self.zendesk_api_user, self.zendesk_api_token),
             headers=self.headers,
+            timeout=self.timeout,
             json=data
         )
 
-    @patch('zendesk.api.requests.put')
+    @patch('zendesk.api.get_session')
     def test_create_comment_on_zendesk_should_return_json(
         self,
         mock
     ):
         data = {}
-        mock.return_value.json.return_value = {'key': 'value'}
+        response = mock.return_value.request.return_value
+        response.json.return_value = {'key': 'value'}
 
         ticket = Ticket()
         result = ticket.create_comment(data, 1)
 
         self.assertEqual(result, {'key': 'value'})
 
+    @patch('zendesk.api.get_session')
+    def test_search_by_external_ids_should_search_tickets_in_one_query(
+        self,
+        mock
+    ):
+        url = self.zendesk_api_url + '/api/v2/search.json'
+        response = mock.return_value.request.return_value
+        response.json.return_value = {
+            'results': [{'id': 1, 'external_id': 'ztm-1-1'}],
+            'next_page': None
+        }
 
-class UserAPITest(TestCase):
+        ticket = Ticket()
+        results = ticket.search_by_external_ids(['ztm-1-1', 'ztm-1-2'])
+
+        mock.return_value.request.assert_called_once_with(
+            'GET',
+            url,
+            auth=(self.zendesk_api_user, self.zendesk_api_token),
+            headers=self.headers,
+            timeout=self.timeout,
+            params={
+                'query': 'type:ticket external_id:"ztm-1-1" '
+                'external_id:"ztm-1-2"'
+            }
+        )
+        self.assertEqual(results, [{'id': 1, 'external_id': 'ztm-1-1'}])
+
+    @patch('zendesk.api.get_session')
+    def test_search_by_external_ids_should_follow_next_page(self, mock):
+        response = mock.return_value.request.return_value
+        response.json.side_effect = [
+            {'results': [{'id': 1}], 'next_page': 'https://next'},
+            {'results': [{'id': 2}], 'next_page': None},
+        ]
+
+        ticket = Ticket()
+        results = ticket.search_by_external_ids(['ztm-1-1'])
+
+        self.assertEqual(results, [{'id': 1}, {'id': 2}])
+        args, kwargs = mock.return_value.request.call_args
+        self.assertEqual(args, ('GET', 'https://next'))
+        self.assertIsNone(kwargs['params'])
+
+    @patch('zendesk.api.get_session')
+    def test_search_by_external_ids_should_search_50_ids_per_query(
+        self,
+        mock
+    ):
+        response = mock.return_value.request.return_value
+        response.json.return_value = {'results': [], 'next_page': None}
+
+        ticket = Ticket()
+        ticket.search_by_external_ids([f'ztm-1-{i}' for i in range(120)])
+
+        self.assertEqual(mock.return_value.request.call_count, 3)
+
+    @patch('zendesk.api.JobStatus.wait')
+    @patch('zendesk.api.get_session')
+    def test_update_many_should_send_tickets_to_zendesk_in_one_job(
+        self,
+        mock,
+        mock_wait
+    ):
+        url = self.zendesk_api_url + '/api/v2/tickets/update_many.json'
+        response = mock.return_value.request.return_value
+        response.json.return_value = {'job_status': {'id': 'job-1'}}
+        mock_wait.return_value = {
+            'status': 'completed',
+            'results': [
+                {
+                    'id': 1,
+                    'action': 'update',
+                    'status': 'Updated',
+                    'success': True,
+                },
+            ]
+        }
+        tickets = [
+            {'id': 1, 'comment': {'body': 'Private', 'public': False}},
+        ]
+
+        ticket = Ticket()
+        results = ticket.update_many(tickets)
+
+        mock.return_value.request.assert_called_once_with(
+            'PUT',
+            url,
+            auth=(self.zendesk_api_user, self.zendesk_api_token),
+            headers=self.headers,
+            timeout=self.timeout,
+            json={'tickets': tickets}
+        )
+        mock_wait.assert_called_once_with('job-1')
+        self.assertEqual(
+            results,
+            [{
+                'index': 0,
+                'id': 1,
+                'action': 'update',
+                'status': 'Updated',
+                'success': True,
+            }]
+        )
+
+    @patch('zendesk.api.JobStatus.wait')
+    @patch('zendesk.api.get_session')
+    def test_update_many_should_match_results_to_tickets_by_id(
+        self,
+        mock,
+        mock_wait
+    ):
+        response = mock.return_value.request.return_value
+        response.json.return_value = {'job_status': {'id': 'job-1'}}
+        mock_wait.return_value = {
+            'status': 'completed',
+            'results': [
+                {
+                    'id': 3,
+                    'action': 'update',
+                    'status': 'Updated',
+                    'success': True,
+                },
+                {
+                    'id': 1,
+                    'action': 'update',
+                    'status': 'Failed',
+                    'success': False,
+                },
+            ]
+        }
+        tickets = [{'id': '1'}, {'id': '2'}, {'id': '3'}]
+
+        results = Ticket().update_many(tickets)
+
+        self.assertEqual(
+            [(each['index'], each.get('id')) for each in results],
+            [(0, 1), (1, None), (2, 3)]
+        )
+        self.assertEqual(results[0]['error'], 'Failed')
+        self.assertEqual(results[1]['error'], 'completed')
+        self.assertNotIn('error', results[2])
+
+    @patch('zendesk.api.JobStatus.wait')
+    @patch('zendesk.api.get_session')
+    def test_create_many_should_send_tickets_to_zendesk_in_batches_of_100(
+        self,
+        mock,
+        mock_wait
+    ):
+        url = self.zendesk_api_url + '/api/v2/tickets/create_many.json'
+        response = mock.return_value.request.return_value
+        response.json.side_effect = [
+            {'job_status': {'id': 'job-1'}},
+            {'job_status': {'id': 'job-2'}},
+        ]
+        mock_wait.side_effect = [
+            {'status': 'completed', 'results': []},
+            {'status': 'completed', 'results': []},
+        ]
+        tickets = [{'subject': f'Ticket {i}'} for i in range(150)]
+
+        ticket = Ticket()
+        ticket.create_many(tickets)
+
+        calls = [
+            call(
+                'POST',
+                url,
+                auth=(self.zendesk_api_user, self.zendesk_api_token),
+                headers=self.headers,
+                timeout=self.timeout,
+                json={'tickets': tickets[:100]}
+            ),
+            call(
+                'POST',
+                url,
+                auth=(self.zendesk_api_user, self.zendesk_api_token),
+                headers=self.headers,
+                timeout=self.timeout,
+                json={'tickets': tickets[100:]}
+            ),
+        ]
+        self.assertEqual(mock.return_value.request.call_args_list, calls)
+        mock_wait.assert_has_calls([call('job-1'), call('job-2')])
+
+    @patch('zendesk.api.JobStatus.wait')
+    @patch('zendesk.api.get_session')
+    def test_create_many_should_return_results_indexed_across_batches(
+        self,
+        mock,
+        mock_wait
+    ):
+        response = mock.return_value.request.return_value
+        response.json.side_effect = [
+            {'job_status': {'id': 'job-1'}},
+            {'job_status': {'id': 'job-2'}},
+        ]
+        mock_wait.side_effect = [
+            {
+                'status': 'completed',
+                'results': [
+                    {'index': index, 'id': index + 1}
+                    for index in range(100)
+                ]
+            },
+            {
+                'status': 'completed',
+                'results': [
+                    {'index': 0, 'id': 101},
+                    {'index': 1, 'error': 'RecordInvalid', 'details': 'x'},
+                ]
+            },
+        ]
+        tickets = [{'subject': f'Ticket {i}'} for i in range(102)]
+
+        ticket = Ticket()
+        results = ticket.create_many(tickets)
+
+        self.assertEqual(len(results), 102)
+        self.assertEqual(results[0], {'index': 0, 'id': 1})
+        self.assertEqual(results[100], {'index': 100, 'id': 101})
+        self.assertEqual(
+            results[101],
+            {'index': 101, 'error': 'RecordInvalid', 'details': 'x'}
+        )
+
+    @patch('zendesk.api.JobStatus.wait')
+    @patch('zendesk.api.get_session')
+    def test_create_many_should_return_error_for_tickets_missing_in_job(
+        self,
+        mock,
+        mock_wait
+    ):
+        response = mock.return_value.request.return_value
+        response.json.return_value = {'job_status': {'id': 'job-1'}}
+        mock_wait.return_value = {
+            'status': 'failed',
+            'message': 'Job was killed',
+            'results': [{'index': 0, 'id': 1}],
+        }
+
+        ticket = Ticket()
+        results = ticket.create_many([{}, {}])
+
+        self.assertEqual(
+            results,
+            [
+                {'index': 0, 'id': 1},
+                {'index': 1, 'error': 'failed', 'details': 'Job was killed'},
+            ]
+        )
+
+    @patch('zendesk.api.get_session')
+    def test_create_many_should_return_errors_if_request_is_rejected(
+        self,
+        mock
+    ):
+        response = mock.return_value.request.return_value
+        response.json.return_value = {
+            'error': 'RecordInvalid',
+            'description': 'Record validation errors',
+        }
+
+        ticket = Ticket()
+        results = ticket.create_many([{}])
+
+        self.assertEqual(
+            results,
+            [{
+                'index': 0,
+                'error': 'RecordInvalid',
+                'details': 'Record validation errors',
+            }]
+        )
+
+
+class JobStatusAPITest(TestCase):
     def setUp(self):
         self.zendesk_api_url = settings.ZENDESK_API_URL
         self.zendesk_api_user = settings.ZENDESK_API_USER
         self.zendesk_api_token = settings.ZENDESK_API_TOKEN
         self.headers = {'content-type': 'application/json'}
+        self.timeout = (
+            settings.ZENDESK_API_CONNECT_TIMEOUT,
+            settings.ZENDESK_API_READ_TIMEOUT,
+        )
+
+    @patch('zendesk.api.get_session')
+    def test_show_job_status_should_send_data_to_zendesk_correctly(
+        self,
+        mock
+    ):
+        url = self.zendesk_api_url + '/api/v2/job_statuses/abc.json'
+
+        job_status = JobStatus()
+        job_status.show('abc')
+
+        mock.return_value.request.assert_called_once_with(
+            'GET',
+            url,
+            auth=(self.zendesk_api_user, self.zendesk_api_token),
+            headers=self.headers,
+            timeout=self.timeout,
+        )
+
+    @patch('zendesk.api.time.sleep')
+    @patch('zendesk.api.get_session')
+    def test_wait_should_poll_job_status_until_finished(self, mock, _):
+        response = mock.return_value.request.return_value
+        response.json.side_effect = [
+            {'job_status': {'id': 'abc', 'status': 'queued'}},
+            {'job_status': {'id': 'abc', 'status': 'working'}},
+            {'job_status': {'id': 'abc', 'status': 'completed'}},
+        ]
+
+        job_status = JobStatus()
+        result = job_status.wait('abc')
+
+        self.assertEqual(result, {'id': 'abc', 'status': 'completed'})
+        self.assertEqual(mock.return_value.request.call_count, 3)
+
+    @override_settings(ZENDESK_JOB_STATUS_TIMEOUT=0)
+    @patch('zendesk.api.get_session')
+    def test_wait_should_give_up_after_timeout(self, mock):
+        response = mock.return_value.request.return_value
+        response.json.return_value = {
+            'job_status': {'id': 'abc', 'status': 'queued'}
+        }
 
-        self.user = User()
+        job_status = JobStatus()
+        result = job_status.wait('abc')
 
-    @patch('zendesk.api.requests.get')
+        self.assertEqual(result['status'], 'queued')
+        self.assertEqual(result['message'], 'Job abc did not finish in time')
+
+
+class UserAPITest(TestCase):
+    def setUp(self):
+        self.zendesk_api_url = settings.ZENDESK_API_URL
+        self.zendesk_api_user = settings.ZENDESK_API_USER
+        self.zendesk_api_token = settings.ZENDESK_API_TOKEN
+        self.headers = {'content-type': 'application/json'}
+        self.timeout = (
+            settings.ZENDESK_API_CONNECT_TIMEOUT,
+            settings.ZENDESK_API_READ_TIMEOUT,
+        )
+
+    @patch('zendesk.api.get_session')
     def test_search_users_should_send_data_to_zendesk_correctly(self, mock):
         url = self.zendesk_api_url + '/api/v2/users/search.json'
         payload = {
             'query': 'kan@prontomarketing.com'
         }
 
-        self.user.search('kan@prontomarketing.com')
+        user = User()
+        user.search('kan@prontomarketing.com')
 
-        mock.assert_called_once_with(
+        mock.return_value.request.assert_called_once_with(
+            'GET',
             url,
             auth=(self.zendesk_api_user, self.zendesk_api_token),
             headers=self.headers,
+            timeout=self.timeout,
             params=payload
         )
 
-    @patch('zendesk.api.requests.get')
+    @patch('zendesk.api.get_session')
+    def test_search_users_should_sideload_organizations_if_included(
+        self,
+        mock
+    ):
+        url = self.zendesk_api_url + '/api/v2/users/search.json'
+        payload = {
+            'query': 'kan@prontomarketing.com',
+            'include': 'organizations'
+        }
+
+        user = User()
+        user.search('kan@prontomarketing.com', include='organizations')
+
+        mock.return_value.request.assert_called_once_with(
+            'GET',
+            url,
+            auth=(self.zendesk_api_user, self.zendesk_api_token),
+            headers=self.headers,
+            timeout=self.timeout,
+            params=payload
+        )
+
+    @patch('zendesk.api.get_session')
     def test_search_users_should_return_json(self, mock):
-        mock.return_value.json.return_value = {'key': 'value'}
+        response = mock.return_value.request.return_value
+        response.json.return_value = {'key': 'value'}
 
-        result = self.user.search('kan@prontomarketing.com')
+        user = User()
+        result = user.search('kan@prontomarketing.com')
 
         self.assertEqual(result, {'key': 'value'})
 
@@ -138,28 +802,35 @@ class OrganizationAPITest(TestCase):
         self.zendesk_api_user = settings.ZENDESK_API_USER
         self.zendesk_api_token = settings.ZENDESK_API_TOKEN
         self.headers = {'content-type': 'application/json'}
+        self.timeout = (
+            settings.ZENDESK_API_CONNECT_TIMEOUT,
+            settings.ZENDESK_API_READ_TIMEOUT,
+        )
 
-        self.organization = Organization()
-
-    @patch('zendesk.api.requests.get')
+    @patch('zendesk.api.get_session')
     def test_show_organization_should_send_data_to_zendesk_correctly(
         self,
         mock
     ):
         url = self.zendesk_api_url + '/api/v2/organizations/18.json'
 
-        self.organization.show('18')
+        organization = Organization()
+        organization.show('18')
 
-        mock.assert_called_once_with(
+        mock.return_value.request.assert_called_once_with(
+            'GET',
             url,
             auth=(self.zendesk_api_user, self.zendesk_api_token),
             headers=self.headers,
+            timeout=self.timeout,
         )
 
-    @patch('zendesk.api.requests.get')
+    @patch('zendesk.api.get_session')
     def test_show_organization_should_return_json(self, mock):
-        mock.return_value.json.return_value = {'key': 'value'}
+        response = mock.return_value.request.return_value
+        response.json.return_value = {'key': 'value'}
 
-        result = self.organization.show('18')
+        organization = Organization()
+        result = organization.show('18')
 
         self.assertEqual(result, {'key': 'value'})
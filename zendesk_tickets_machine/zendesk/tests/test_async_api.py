@@ -0,0 +1,258 @@
+import asyncio
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from ..async_api import (
+    JobStatus,
+    Organization,
+    Ticket,
+    User,
+    create_session,
+)
+from ..fake import FakeZendeskServer
+from ..resilience import CircuitBreaker, ZendeskUnavailableError
+
+
+class AsyncZendeskAPITest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(AsyncZendeskAPITest, cls).setUpClass()
+        cls.server = FakeZendeskServer().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+        super(AsyncZendeskAPITest, cls).tearDownClass()
+
+    def setUp(self):
+        self.server.reset()
+        self.rate_limiter = MagicMock()
+        self.rate_limiter.reserve.return_value = 0
+
+    def run_with_client(self, client_class, call, url=None):
+        async def run():
+            async with create_session() as session:
+                client = client_class(
+                    session,
+                    rate_limiter=self.rate_limiter,
+                    circuit_breaker=CircuitBreaker()
+                )
+                return await call(client)
+
+        loop = asyncio.new_event_loop()
+        try:
+            with override_settings(ZENDESK_API_URL=url or self.server.url):
+                return loop.run_until_complete(run())
+        finally:
+            loop.close()
+
+    def test_search_should_return_users(self):
+        result = self.run_with_client(
+            User,
+            lambda client: client.search('client@hisotech.com')
+        )
+
+        self.assertEqual(result['users'][0]['organization_id'], 1)
+        self.assertNotIn('organizations', result)
+
+    def test_search_should_sideload_organizations_if_included(self):
+        result = self.run_with_client(
+            User,
+            lambda client: client.search(
+                'client@hisotech.com',
+                include='organizations'
+            )
+        )
+
+        self.assertEqual(
+            result['organizations'],
+            [{'id': 1, 'name': 'Organization 1'}]
+        )
+
+    def test_show_organization_should_return_organization(self):
+        result = self.run_with_client(
+            Organization,
+            lambda client: client.show(1)
+        )
+
+        self.assertEqual(
+            result['organization'],
+            {'id': 1, 'name': 'Organization 1'}
+        )
+
+    def test_create_many_should_return_results_of_all_batches(self):
+        tickets = [{'subject': f'Ticket {each}'} for each in range(150)]
+
+        results = self.run_with_client(
+            Ticket,
+            lambda client: client.create_many(tickets)
+        )
+
+        self.assertEqual(
+            [each['index'] for each in results],
+            list(range(150))
+        )
+        self.assertTrue(all(each.get('id') for each in results))
+
+    def test_update_many_should_return_results_of_updated_tickets(self):
+        first = self.server.create_ticket({}, {'ticket': {}})[1]['ticket']
+        second = self.server.create_ticket({}, {'ticket': {}})[1]['ticket']
+        tickets = [
+            {
+                'id': first['id'],
+                'comment': {'body': 'Private', 'public': False},
+            },
+            {
+                'id': second['id'],
+                'comment': {'body': 'Private', 'public': False},
+            },
+        ]
+
+        results = self.run_with_client(
+            Ticket,
+            lambda client: client.update_many(tickets)
+        )
+
+        self.assertEqual(
+            [(each['index'], each['id']) for each in results],
+            [(0, first['id']), (1, second['id'])]
+        )
+        self.assertTrue(all(each['success'] for each in results))
+
+    def test_search_by_external_ids_should_return_matching_tickets(self):
+        self.server.create_ticket({}, {'ticket': {'external_id': 'ztm-1-1'}})
+        self.server.create_ticket({}, {'ticket': {'external_id': 'ztm-1-2'}})
+
+        results = self.run_with_client(
+            Ticket,
+            lambda client: client.search_by_external_ids(['ztm-1-2'])
+        )
+
+        self.assertEqual(
+            [each['external_id'] for each in results],
+            ['ztm-1-2']
+        )
+
+    def test_show_job_status_should_return_job_status(self):
+        job_id = self.server.create_job_status([])['id']
+
+        result = self.run_with_client(
+            JobStatus,
+            lambda client: client.show(job_id)
+        )
+
+        self.assertEqual(result['job_status']['status'], 'completed')
+
+    def test_request_should_take_from_rate_limiter(self):
+        self.run_with_client(
+            Ticket,
+            lambda client: client.create_comment({'ticket': {}}, 1)
+        )
+
+        self.rate_limiter.reserve.assert_called_once_with()
+        self.assertEqual(self.rate_limiter.update.call_count, 1)
+
+    @override_settings(ZENDESK_API_RETRIES=2)
+    def test_comment_should_not_be_retried_after_server_error(self):
+        self.server.fail_next(500)
+
+        with self.assertRaises(ZendeskUnavailableError):
+            self.run_with_client(
+                Ticket,
+                lambda client: client.add_comments([{'id': 1}])
+            )
+
+        self.assertEqual(self.server.requests, 1)
+
+    @override_settings(ZENDESK_API_RETRIES=2)
+    @patch('zendesk.resilience.get_backoff')
+    def test_update_many_should_be_retried_after_server_error(
+        self,
+        mock_backoff
+    ):
+        mock_backoff.return_value = 0
+        self.server.fail_next(500)
+
+        self.run_with_client(
+            Ticket,
+            lambda client: client.update_many([{'id': 1}])
+        )
+
+        self.assertEqual(self.server.requests, 3)
+
+    def run_with_semaphore(self, call):
+        async def run():
+            semaphore = asyncio.Semaphore(1)
+            async with create_session() as session:
+                client = Ticket(
+                    session,
+                    semaphore=semaphore,
+                    rate_limiter=self.rate_limiter,
+                    circuit_breaker=CircuitBreaker()
+                )
+                return await call(client, semaphore)
+
+        loop = asyncio.new_event_loop()
+        try:
+            with override_settings(ZENDESK_API_URL=self.server.url):
+                return loop.run_until_complete(run())
+        finally:
+            loop.close()
+
+    def test_request_should_take_token_only_once_it_holds_semaphore(self):
+        async def call(client, semaphore):
+            await semaphore.acquire()
+            task = asyncio.ensure_future(
+                client.create_comment({'ticket': {}}, 1)
+            )
+            await asyncio.sleep(0.05)
+            reserved_while_queued = self.rate_limiter.reserve.call_count
+            semaphore.release()
+            await task
+            return reserved_while_queued
+
+        reserved_while_queued = self.run_with_semaphore(call)
+
+        self.assertEqual(reserved_while_queued, 0)
+        self.rate_limiter.reserve.assert_called_once_with()
+
+    def test_request_should_release_token_when_cancelled_while_waiting(
+        self
+    ):
+        self.rate_limiter.reserve.return_value = 60
+
+        async def call(client, semaphore):
+            task = asyncio.ensure_future(
+                client.create_comment({'ticket': {}}, 1)
+            )
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        self.run_with_semaphore(call)
+
+        self.rate_limiter.release.assert_called_once_with()
+        self.assertEqual(self.rate_limiter.update.call_count, 0)
+
+    @override_settings(ZENDESK_API_RETRIES=2)
+    @patch('zendesk.resilience.get_backoff')
+    def test_request_should_raise_after_retries_if_connection_fails(
+        self,
+        mock_backoff
+    ):
+        mock_backoff.return_value = 0
+        server = FakeZendeskServer()
+        url = server.url
+        server.server_close()
+
+        with self.assertRaises(ZendeskUnavailableError):
+            self.run_with_client(
+                User,
+                lambda client: client.search('client@hisotech.com'),
+                url=url
+            )
+
+        self.assertEqual(self.rate_limiter.reserve.call_count, 3)
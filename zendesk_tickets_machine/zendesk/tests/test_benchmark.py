@@ -0,0 +1,34 @@
+from django.test import TestCase
+
+from ..benchmark import create_benchmark_board, create_unlimited_rate_limiter
+from tickets.models import Ticket
+
+
+class BenchmarkTest(TestCase):
+    def test_benchmark_board_should_have_pending_tickets(self):
+        board = create_benchmark_board('Benchmark', 5, 2)
+
+        tickets = Ticket.objects.filter(board=board)
+        self.assertEqual(tickets.count(), 5)
+        self.assertFalse(tickets.filter(zendesk_ticket_id__isnull=False))
+        self.assertEqual(
+            sorted(set(tickets.values_list('requester', flat=True))),
+            ['client0@hisotech.com', 'client1@hisotech.com']
+        )
+
+    def test_benchmark_board_should_have_one_requester_per_ticket(self):
+        board = create_benchmark_board('Benchmark', 3)
+
+        self.assertEqual(
+            Ticket.objects.filter(board=board).values(
+                'requester'
+            ).distinct().count(),
+            3
+        )
+
+    def test_unlimited_rate_limiter_should_not_pace_requests(self):
+        rate_limiter = create_unlimited_rate_limiter()
+
+        waits = [rate_limiter.reserve() for _ in range(1000)]
+
+        self.assertEqual(waits, [0] * 1000)
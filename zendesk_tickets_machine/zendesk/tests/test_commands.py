@@ -0,0 +1,40 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase
+
+
+class BenchmarkZendeskSessionCommandTest(TestCase):
+    def test_benchmark_should_reuse_one_connection_for_pooled_session(self):
+        out = StringIO()
+
+        call_command('benchmark_zendesk_session', tickets=5, stdout=out)
+
+        output = out.getvalue()
+        self.assertIn('per-call: 20 requests, 20 connections', output)
+        self.assertIn('pooled: 20 requests, 1 connections', output)
+
+
+class RunFakeZendeskCommandTest(TestCase):
+    @patch('zendesk.management.commands.run_fake_zendesk.FakeZendeskServer')
+    def test_command_should_serve_until_interrupted(self, mock):
+        mock.return_value.url = 'http://127.0.0.1:8765'
+        mock.return_value.serve_forever.side_effect = KeyboardInterrupt
+        out = StringIO()
+
+        call_command(
+            'run_fake_zendesk',
+            latency=0.1,
+            rate_limit=700,
+            error_rate=0.01,
+            stdout=out
+        )
+
+        self.assertEqual(mock.call_args[1]['rate_limit'], 700)
+        self.assertEqual(mock.call_args[1]['error_rate'], 0.01)
+        mock.return_value.server_close.assert_called_once_with()
+        self.assertIn(
+            'Fake Zendesk API listening on http://127.0.0.1:8765',
+            out.getvalue()
+        )
@@ -0,0 +1,172 @@
+import requests
+
+from django.test import TestCase
+
+from ..fake import FakeZendeskServer
+
+
+class FakeZendeskServerTest(TestCase):
+    def setUp(self):
+        self.server = FakeZendeskServer().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def request(self, method, path, **kwargs):
+        return requests.request(method, self.server.url + path, **kwargs)
+
+    def test_created_ticket_should_be_shown(self):
+        response = self.request(
+            'POST',
+            '/api/v2/tickets.json',
+            json={'ticket': {'subject': 'Welcome', 'comment': {'body': 'Hi'}}}
+        )
+        ticket_id = response.json()['ticket']['id']
+
+        response = self.request('GET', f'/api/v2/tickets/{ticket_id}.json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['ticket']['subject'], 'Welcome')
+        self.assertEqual(self.server.comments[ticket_id], [{'body': 'Hi'}])
+
+    def test_unknown_ticket_should_not_be_found(self):
+        response = self.request('GET', '/api/v2/tickets/69969.json')
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json()['error'], 'RecordNotFound')
+
+    def test_update_many_should_add_comments_to_tickets(self):
+        response = self.request(
+            'POST',
+            '/api/v2/tickets/create_many.json',
+            json={'tickets': [{'subject': 'First'}, {'subject': 'Second'}]}
+        )
+        job_id = response.json()['job_status']['id']
+        results = self.request(
+            'GET',
+            f'/api/v2/job_statuses/{job_id}.json'
+        ).json()['job_status']['results']
+        ticket_ids = [each['id'] for each in results]
+
+        response = self.request(
+            'PUT',
+            '/api/v2/tickets/update_many.json',
+            json={
+                'tickets': [
+                    {'id': ticket_ids[0], 'comment': {'body': 'Note'}},
+                    {'id': 69969, 'comment': {'body': 'Note'}},
+                ]
+            }
+        )
+        job_id = response.json()['job_status']['id']
+        results = self.request(
+            'GET',
+            f'/api/v2/job_statuses/{job_id}.json'
+        ).json()['job_status']['results']
+
+        results = {each['id']: each for each in results}
+        self.assertTrue(results[ticket_ids[0]]['success'])
+        self.assertFalse(results[69969]['success'])
+        self.assertEqual(results[69969]['error'], 'TicketNotFound')
+        self.assertTrue(
+            all('index' not in each for each in results.values())
+        )
+        self.assertEqual(
+            self.server.comments[ticket_ids[0]],
+            [{'body': 'Note'}]
+        )
+
+    def test_create_many_should_reject_more_than_100_tickets(self):
+        response = self.request(
+            'POST',
+            '/api/v2/tickets/create_many.json',
+            json={'tickets': [{}] * 101}
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.server.tickets, {})
+
+    def test_search_users_should_return_same_user_for_same_email(self):
+        first = self.request(
+            'GET',
+            '/api/v2/users/search.json',
+            params={'query': 'client@hisotech.com'}
+        ).json()['users']
+        second = self.request(
+            'GET',
+            '/api/v2/users/search.json',
+            params={'query': 'client@hisotech.com'}
+        ).json()['users']
+
+        self.assertEqual(first, second)
+        self.assertEqual(first[0]['email'], 'client@hisotech.com')
+
+    def test_users_should_be_spread_across_organizations(self):
+        self.server.stop()
+        self.server = FakeZendeskServer(organizations=2).start()
+
+        organization_ids = [
+            self.request(
+                'GET',
+                '/api/v2/users/search.json',
+                params={'query': f'client{each}@hisotech.com'}
+            ).json()['users'][0]['organization_id']
+            for each in range(3)
+        ]
+
+        self.assertEqual(organization_ids, [1, 2, 1])
+
+    def test_job_should_be_working_for_configured_polls(self):
+        self.server.job_polls = 1
+        job_id = self.server.create_job_status([])['id']
+
+        statuses = [
+            self.request(
+                'GET',
+                f'/api/v2/job_statuses/{job_id}.json'
+            ).json()['job_status']['status']
+            for _ in range(2)
+        ]
+
+        self.assertEqual(statuses, ['working', 'completed'])
+
+    def test_rate_limit_should_answer_429_once_used_up(self):
+        self.server.rate_limit = 2
+
+        responses = [
+            self.request('GET', '/api/v2/organizations/1.json')
+            for _ in range(3)
+        ]
+
+        self.assertEqual(
+            [each.status_code for each in responses],
+            [200, 200, 429]
+        )
+        self.assertEqual(
+            [each.headers['X-Rate-Limit-Remaining'] for each in responses],
+            ['1', '0', '0']
+        )
+        self.assertIn('Retry-After', responses[2].headers)
+
+    def test_fail_next_should_answer_with_given_status(self):
+        self.server.fail_next(503, count=2)
+
+        statuses = [
+            self.request('GET', '/api/v2/organizations/1.json').status_code
+            for _ in range(3)
+        ]
+
+        self.assertEqual(statuses, [503, 503, 200])
+
+    def test_error_rate_should_inject_server_errors(self):
+        self.server.stop()
+        self.server = FakeZendeskServer(error_rate=1, seed=1).start()
+
+        response = self.request('GET', '/api/v2/organizations/1.json')
+
+        self.assertIn(response.status_code, (500, 503))
+
+    def test_unknown_endpoint_should_not_be_found(self):
+        response = self.request('GET', '/api/v2/macros.json')
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,143 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from ..models import RateLimitBucket
+from ..rate_limit import DatabaseRateLimiter, RateLimiter
+
+
+@patch('zendesk.rate_limit.time.time', return_value=100.0)
+class RateLimiterTest(TestCase):
+    @override_settings(ZENDESK_API_RATE_LIMIT=400)
+    def test_rate_limiter_should_use_rate_limit_from_settings(self, _):
+        rate_limiter = RateLimiter()
+
+        self.assertEqual(rate_limiter.bucket.capacity, 400)
+        self.assertEqual(rate_limiter.bucket.tokens, 400)
+
+    def test_reserve_should_not_wait_if_there_is_budget_left(self, _):
+        rate_limiter = RateLimiter(limit=60)
+
+        waits = [rate_limiter.reserve() for _ in range(60)]
+
+        self.assertEqual(waits, [0] * 60)
+
+    def test_reserve_should_pace_requests_once_budget_is_used(self, _):
+        rate_limiter = RateLimiter(limit=60)
+        for _ in range(60):
+            rate_limiter.reserve()
+
+        self.assertEqual(rate_limiter.reserve(), 1)
+        self.assertEqual(rate_limiter.reserve(), 2)
+
+    def test_reserve_should_refill_budget_over_time(self, mock):
+        rate_limiter = RateLimiter(limit=60)
+        for _ in range(60):
+            rate_limiter.reserve()
+
+        mock.return_value = 105.0
+
+        waits = [rate_limiter.reserve() for _ in range(5)]
+        self.assertEqual(waits, [0] * 5)
+        self.assertEqual(rate_limiter.reserve(), 1)
+
+    def test_release_should_give_token_back(self, _):
+        rate_limiter = RateLimiter(limit=60)
+        for _ in range(61):
+            rate_limiter.reserve()
+
+        rate_limiter.release()
+        rate_limiter.release()
+
+        self.assertEqual(rate_limiter.reserve(), 0)
+        self.assertEqual(rate_limiter.reserve(), 1)
+
+    def test_release_should_not_go_over_capacity(self, _):
+        rate_limiter = RateLimiter(limit=60)
+
+        rate_limiter.release()
+
+        self.assertEqual(rate_limiter.bucket.tokens, 60)
+
+    def test_update_should_follow_rate_limit_headers(self, _):
+        rate_limiter = RateLimiter(limit=200)
+
+        rate_limiter.update({
+            'X-Rate-Limit': '700',
+            'X-Rate-Limit-Remaining': '1',
+        })
+
+        self.assertEqual(rate_limiter.bucket.capacity, 700)
+        self.assertEqual(rate_limiter.reserve(), 0)
+        self.assertAlmostEqual(rate_limiter.reserve(), 60 / 700)
+
+    def test_update_should_pause_requests_until_retry_after(self, _):
+        rate_limiter = RateLimiter(limit=200)
+
+        rate_limiter.update({'Retry-After': '30'})
+
+        self.assertEqual(rate_limiter.reserve(), 30)
+
+    def test_update_should_ignore_missing_or_invalid_headers(self, _):
+        rate_limiter = RateLimiter(limit=200)
+
+        rate_limiter.update({'X-Rate-Limit-Remaining': 'unknown'})
+
+        self.assertEqual(rate_limiter.bucket.capacity, 200)
+        self.assertEqual(rate_limiter.bucket.tokens, 200)
+
+    @patch('zendesk.rate_limit.time.sleep')
+    def test_acquire_should_sleep_only_when_it_has_to_wait(self, mock, _):
+        rate_limiter = RateLimiter(limit=1)
+
+        rate_limiter.acquire()
+        mock.assert_not_called()
+
+        rate_limiter.acquire()
+        mock.assert_called_once_with(60)
+
+
+@patch('zendesk.rate_limit.time.time', return_value=100.0)
+class DatabaseRateLimiterTest(TestCase):
+    def test_reserve_should_store_bucket_in_database(self, _):
+        rate_limiter = DatabaseRateLimiter(limit=60)
+
+        rate_limiter.reserve()
+
+        bucket = RateLimitBucket.objects.get(name='zendesk')
+        self.assertEqual(bucket.capacity, 60)
+        self.assertEqual(bucket.tokens, 59)
+        self.assertEqual(bucket.updated, 100.0)
+
+    def test_rate_limiters_in_different_processes_should_share_budget(
+        self,
+        _
+    ):
+        first_rate_limiter = DatabaseRateLimiter(limit=60)
+        second_rate_limiter = DatabaseRateLimiter(limit=60)
+
+        for _ in range(30):
+            self.assertEqual(first_rate_limiter.reserve(), 0)
+            self.assertEqual(second_rate_limiter.reserve(), 0)
+
+        self.assertEqual(first_rate_limiter.reserve(), 1)
+        self.assertEqual(second_rate_limiter.reserve(), 2)
+
+    def test_update_should_be_seen_by_other_processes(self, _):
+        first_rate_limiter = DatabaseRateLimiter(limit=200)
+        second_rate_limiter = DatabaseRateLimiter(limit=200)
+
+        first_rate_limiter.update({'Retry-After': '30'})
+
+        self.assertEqual(second_rate_limiter.reserve(), 30)
+
+    def test_rate_limiters_with_different_names_should_not_share_budget(
+        self,
+        _
+    ):
+        first_rate_limiter = DatabaseRateLimiter(name='first', limit=1)
+        second_rate_limiter = DatabaseRateLimiter(name='second', limit=1)
+
+        self.assertEqual(first_rate_limiter.reserve(), 0)
+        self.assertEqual(second_rate_limiter.reserve(), 0)
@@ -0,0 +1,153 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from ..resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    get_backoff,
+    get_retry_delay,
+    should_retry_status,
+)
+
+
+class ShouldRetryStatusTest(TestCase):
+    def test_rate_limited_and_unavailable_should_be_retried(self):
+        self.assertTrue(should_retry_status('POST', 429))
+        self.assertTrue(should_retry_status('POST', 503))
+
+    def test_server_error_should_be_retried_only_if_idempotent(self):
+        self.assertTrue(should_retry_status('GET', 500))
+        self.assertTrue(should_retry_status('PUT', 502))
+        self.assertFalse(should_retry_status('POST', 500))
+
+    def test_server_error_should_not_be_retried_if_marked_not_idempotent(
+        self
+    ):
+        self.assertFalse(should_retry_status('PUT', 500, idempotent=False))
+        self.assertTrue(should_retry_status('PUT', 503, idempotent=False))
+        self.assertTrue(should_retry_status('PUT', 429, idempotent=False))
+
+    def test_client_error_should_not_be_retried(self):
+        self.assertFalse(should_retry_status('GET', 404))
+        self.assertFalse(should_retry_status('GET', 200))
+
+
+@override_settings(ZENDESK_API_BACKOFF_BASE=0.5, ZENDESK_API_BACKOFF_MAX=3)
+class GetBackoffTest(TestCase):
+    @patch('zendesk.resilience.random.uniform')
+    def test_backoff_should_grow_exponentially_with_jitter(self, mock):
+        mock.side_effect = lambda low, high: high
+
+        self.assertEqual(get_backoff(0), 0.5)
+        self.assertEqual(get_backoff(1), 1)
+        self.assertEqual(get_backoff(2), 2)
+        mock.assert_called_with(0, 2)
+
+    @patch('zendesk.resilience.random.uniform')
+    def test_backoff_should_be_capped(self, mock):
+        mock.side_effect = lambda low, high: high
+
+        self.assertEqual(get_backoff(10), 3)
+
+
+@override_settings(ZENDESK_API_RETRIES=2)
+@patch('zendesk.resilience.get_backoff', return_value=1.5)
+class GetRetryDelayTest(TestCase):
+    def test_retried_status_should_back_off(self, _):
+        self.assertEqual(get_retry_delay(0, 'GET', status=500), 1.5)
+        self.assertEqual(get_retry_delay(1, 'POST', status=503), 1.5)
+
+    def test_status_with_retry_after_should_not_back_off(self, _):
+        delay = get_retry_delay(
+            0,
+            'POST',
+            status=429,
+            headers={'Retry-After': '10'}
+        )
+
+        self.assertEqual(delay, 0)
+
+    def test_request_should_not_be_retried_once_out_of_retries(self, _):
+        self.assertIsNone(get_retry_delay(2, 'GET', status=500))
+        self.assertIsNone(get_retry_delay(2, 'GET', connect_failed=True))
+
+    def test_status_not_retried_should_not_be_retried(self, _):
+        self.assertIsNone(get_retry_delay(0, 'GET', status=404))
+        self.assertIsNone(get_retry_delay(0, 'POST', status=500))
+
+    def test_failure_without_response_should_be_retried_if_safe(self, _):
+        self.assertEqual(get_retry_delay(0, 'GET'), 1.5)
+        self.assertEqual(get_retry_delay(0, 'POST', connect_failed=True), 1.5)
+        self.assertIsNone(get_retry_delay(0, 'POST'))
+        self.assertIsNone(get_retry_delay(0, 'PUT', idempotent=False))
+
+
+@patch('zendesk.resilience.time.monotonic')
+class CircuitBreakerTest(TestCase):
+    def test_circuit_should_open_after_threshold_failures(self, mock):
+        mock.return_value = 100.0
+        circuit_breaker = CircuitBreaker(threshold=2, reset_timeout=30)
+        circuit_breaker.record_failure()
+        circuit_breaker.before_request()
+
+        circuit_breaker.record_failure()
+
+        with self.assertRaises(CircuitOpenError):
+            circuit_breaker.before_request()
+
+    def test_status_should_count_only_server_errors_as_failures(self, mock):
+        mock.return_value = 100.0
+        circuit_breaker = CircuitBreaker(threshold=2, reset_timeout=30)
+        circuit_breaker.record_status(500)
+        circuit_breaker.record_status(429)
+        circuit_breaker.before_request()
+
+        circuit_breaker.record_status(503)
+
+        with self.assertRaises(CircuitOpenError):
+            circuit_breaker.before_request()
+
+    def test_successful_status_should_reset_failures(self, mock):
+        mock.return_value = 100.0
+        circuit_breaker = CircuitBreaker(threshold=2, reset_timeout=30)
+        circuit_breaker.record_status(500)
+        circuit_breaker.record_status(200)
+
+        circuit_breaker.record_status(500)
+
+        circuit_breaker.before_request()
+
+    def test_success_should_reset_failures(self, mock):
+        mock.return_value = 100.0
+        circuit_breaker = CircuitBreaker(threshold=2, reset_timeout=30)
+        circuit_breaker.record_failure()
+        circuit_breaker.record_success()
+
+        circuit_breaker.record_failure()
+
+        circuit_breaker.before_request()
+
+    def test_circuit_should_let_one_trial_through_after_timeout(self, mock):
+        mock.return_value = 100.0
+        circuit_breaker = CircuitBreaker(threshold=1, reset_timeout=30)
+        circuit_breaker.record_failure()
+
+        mock.return_value = 131.0
+        circuit_breaker.before_request()
+
+        with self.assertRaises(CircuitOpenError):
+            circuit_breaker.before_request()
+
+    def test_successful_trial_should_close_circuit(self, mock):
+        mock.return_value = 100.0
+        circuit_breaker = CircuitBreaker(threshold=1, reset_timeout=30)
+        circuit_breaker.record_failure()
+        mock.return_value = 131.0
+        circuit_breaker.before_request()
+
+        circuit_breaker.record_success()
+
+        circuit_breaker.before_request()
+        circuit_breaker.before_request()
@@ -45,6 +45,7 @@ INSTALLED_APPS = [
     'import_export',
     'requesters',
     'tickets',
+    'zendesk',
 ]
 
 LOGIN_URL = '/login/'
@@ -144,6 +145,59 @@ ZENDESK_URL = os.environ.get('ZENDESK_URL', '')
 ZENDESK_API_URL = os.environ.get('ZENDESK_API_URL', '')
 ZENDESK_API_USER = os.environ.get('ZENDESK_API_USER', '')
 ZENDESK_API_TOKEN = os.environ.get('ZENDESK_API_TOKEN', '')
+ZENDESK_API_POOL_SIZE = int(os.environ.get('ZENDESK_API_POOL_SIZE', 10))
+ZENDESK_API_KEEP_ALIVE = os.environ.get('ZENDESK_API_KEEP_ALIVE', 'on') == 'on'
+ZENDESK_API_CONNECT_TIMEOUT = float(
+    os.environ.get('ZENDESK_API_CONNECT_TIMEOUT', 3.05)
+)
+ZENDESK_API_READ_TIMEOUT = float(
+    os.environ.get('ZENDESK_API_READ_TIMEOUT', 30)
+)
+ZENDESK_API_CONCURRENCY = int(os.environ.get('ZENDESK_API_CONCURRENCY', 20))
+ZENDESK_API_RATE_LIMIT = int(os.environ.get('ZENDESK_API_RATE_LIMIT', 200))
+ZENDESK_API_RATE_LIMITER = os.environ.get(
+    'ZENDESK_API_RATE_LIMITER',
+    'database'
+)
+ZENDESK_API_RETRIES = int(os.environ.get('ZENDESK_API_RETRIES', 3))
+ZENDESK_API_BACKOFF_BASE = float(
+    os.environ.get('ZENDESK_API_BACKOFF_BASE', 0.5)
+)
+ZENDESK_API_BACKOFF_MAX = float(os.environ.get('ZENDESK_API_BACKOFF_MAX', 30))
+ZENDESK_API_CIRCUIT_BREAKER_THRESHOLD = int(
+    os.environ.get('ZENDESK_API_CIRCUIT_BREAKER_THRESHOLD', 5)
+)
+ZENDESK_API_CIRCUIT_BREAKER_TIMEOUT = float(
+    os.environ.get('ZENDESK_API_CIRCUIT_BREAKER_TIMEOUT', 30)
+)
+ZENDESK_REQUESTER_CACHE_SIZE = int(
+    os.environ.get('ZENDESK_REQUESTER_CACHE_SIZE', 10000)
+)
+ZENDESK_REQUESTER_CACHE_TTL = int(
+    os.environ.get('ZENDESK_REQUESTER_CACHE_TTL', 7 * 24 * 60 * 60)
+)
+ZENDESK_JOB_STATUS_POLL_INTERVAL = float(
+    os.environ.get('ZENDESK_JOB_STATUS_POLL_INTERVAL', 1)
+)
+ZENDESK_JOB_STATUS_TIMEOUT = float(
+    os.environ.get('ZENDESK_JOB_STATUS_TIMEOUT', 300)
+)
+
+# A running job whose worker has not reported for this many seconds is taken
+# back by the next worker, up to TICKETS_JOB_MAX_ATTEMPTS runs.
+TICKETS_JOB_STALE_AFTER = int(os.environ.get('TICKETS_JOB_STALE_AFTER', 900))
+TICKETS_JOB_MAX_ATTEMPTS = int(os.environ.get('TICKETS_JOB_MAX_ATTEMPTS', 3))
+# How often a worker reports that a job is still running, whether or not a
+# batch is done. Keep it well below TICKETS_JOB_STALE_AFTER.
+TICKETS_JOB_HEARTBEAT_INTERVAL = float(
+    os.environ.get('TICKETS_JOB_HEARTBEAT_INTERVAL', 60)
+)
+
+BOARD_TICKETS_PER_PAGE = int(os.environ.get('BOARD_TICKETS_PER_PAGE', 25))
+BOARD_TICKETS_MAX_PER_PAGE = int(
+    os.environ.get('BOARD_TICKETS_MAX_PER_PAGE', 500)
+)
+BOARD_RESET_CHUNK_SIZE = int(os.environ.get('BOARD_RESET_CHUNK_SIZE', 1000))
 
 FIREBASE_API_KEY = os.environ.get('FIREBASE_API_KEY', '')
 FIREBASE_AUTH_DOMAIN = os.environ.get('FIREBASE_AUTH_DOMAIN', '')